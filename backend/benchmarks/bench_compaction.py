@@ -0,0 +1,69 @@
+"""
+Compaction report: token counts and scores for the compaction test set, full
+text vs compacted. Rule-based scores are always shown; LLM scores are added
+when ZHIPU_API_KEY (and optionally ZHIPU_BASE_URL) is set.
+
+Run from backend/:
+    python -m benchmarks.bench_compaction
+"""
+import asyncio
+import os
+import time
+from datetime import datetime
+
+from jdcrawler.models.job import Job, JobSite
+from jdcrawler.services.analysis import AnalysisService
+from jdcrawler.services.compaction import compact_description
+from jdcrawler.services.scoring import ProfileScorer
+from tests.test_compaction import PROFILE, SAMPLES
+
+
+async def llm_scores(job: Job) -> tuple[int, float, int, float]:
+    compacted = AnalysisService(max_retries=0)
+    full = AnalysisService(max_retries=0)
+    # Baseline: send the description verbatim
+    full._compact = lambda job: None
+
+    start = time.perf_counter()
+    full_result = await full.analyze_job_suitability(job, PROFILE)
+    full_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    compacted_result = await compacted.analyze_job_suitability(job, PROFILE)
+    compacted_elapsed = time.perf_counter() - start
+    return full_result["score"], full_elapsed, compacted_result["score"], compacted_elapsed
+
+
+async def main() -> None:
+    scorer = ProfileScorer(PROFILE)
+    use_llm = bool(os.getenv("ZHIPU_API_KEY"))
+
+    header = f"{'sample':<20} {'tokens':>13} {'ratio':>6} {'rule full/compact':>18}"
+    if use_llm:
+        header += f" {'llm full/compact':>17} {'latency (s)':>12}"
+    print(header)
+
+    for i, sample in enumerate(SAMPLES):
+        result = compact_description(sample["description"])
+        full_rule = scorer.score(sample["title"], sample["description"])["score"]
+        compact_rule = scorer.score(sample["title"], result["text"])["score"]
+        line = (
+            f"{sample['name']:<20} {result['original_tokens']:>6}->{result['compacted_tokens']:<6}"
+            f" {result['ratio']:>6} {full_rule:>9}/{compact_rule:<8}"
+        )
+        if use_llm:
+            job = Job(
+                id=i,
+                title=sample["title"],
+                company="Benchmark",
+                url=f"https://example.com/{i}",
+                site=JobSite.JOBKOREA,
+                description=sample["description"],
+                created_at=datetime.now(),
+            )
+            full_llm, full_s, compact_llm, compact_s = await llm_scores(job)
+            line += f" {full_llm:>8}/{compact_llm:<8} {full_s:>5.1f}/{compact_s:<5.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Microbenchmark: phase 1 rule-based scoring, 10k postings x 100 terms.
+
+Compares the previous per-term substring loop against the single-pass
+KeywordMatcher used by ProfileScorer.
+
+Run from backend/:
+    python -m benchmarks.bench_matcher
+"""
+import random
+import time
+
+from jdcrawler.models.profile import TechSkill, UserProfile
+from jdcrawler.services.scoring import ProfileScorer
+
+NUM_POSTINGS = 10_000
+NUM_TERMS = 100
+WORDS_PER_POSTING = 400
+
+SKILLS = [
+    "Python", "Java", "Kotlin", "Spring", "React", "Docker", "Kafka", "AWS",
+    "C", "Go", "SQL", "Redis", "Vue", "Node.js", "C++", "C#", "TypeScript",
+    "Django", "FastAPI", "Kubernetes",
+]
+FILLER = [
+    "개발", "경험", "우대", "서비스", "백엔드", "설계", "운영", "자바를", "협업",
+    "database", "javascript", "google", "cargo", "platform", "team",
+]
+
+
+def build_profile() -> UserProfile:
+    extra = [f"skill{i}" for i in range(NUM_TERMS - len(SKILLS) - 20)]
+    return UserProfile(
+        tech_stack=[TechSkill(name=n, level="Intermediate") for n in SKILLS + extra],
+        interest_keywords=[f"interest{i}" for i in range(10)],
+        exclude_keywords=[f"exclude{i}" for i in range(10)],
+    )
+
+
+def build_postings(rng: random.Random) -> list[tuple[str, str]]:
+    vocab = FILLER + SKILLS
+    return [
+        (
+            f"{rng.choice(SKILLS)} 개발자",
+            " ".join(rng.choice(vocab) for _ in range(WORDS_PER_POSTING)),
+        )
+        for _ in range(NUM_POSTINGS)
+    ]
+
+
+def naive_score(profile: UserProfile, title: str, description: str) -> int:
+    # The loop previously inlined in CrawlerService.crawl_keyword
+    for ex_kw in profile.exclude_keywords:
+        if ex_kw.lower() in (title + description).lower():
+            return 0
+    match_count = 0
+    for skill in profile.tech_stack:
+        if skill.name.lower() in (title + description).lower():
+            match_count += 1
+    return int((match_count / len(profile.tech_stack)) * 100)
+
+
+def main() -> None:
+    rng = random.Random(42)
+    profile = build_profile()
+    postings = build_postings(rng)
+    print(f"{NUM_POSTINGS} postings x {NUM_TERMS} terms")
+
+    start = time.perf_counter()
+    for title, description in postings:
+        naive_score(profile, title, description)
+    naive_elapsed = time.perf_counter() - start
+    print(f"per-term substring loop: {naive_elapsed:.2f}s")
+
+    start = time.perf_counter()
+    scorer = ProfileScorer(profile)
+    compile_elapsed = time.perf_counter() - start
+    for title, description in postings:
+        scorer.score(title, description)
+    matcher_elapsed = time.perf_counter() - start
+    print(f"KeywordMatcher:          {matcher_elapsed:.2f}s (compile {compile_elapsed * 1000:.1f}ms)")
+    print(f"speedup:                 {naive_elapsed / matcher_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
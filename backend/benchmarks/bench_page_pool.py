@@ -0,0 +1,93 @@
+"""
+Per-fetch tab overhead: a new tab with its own stealth init script for every
+URL (before) vs tabs reused from a PagePool (after), against a local page so
+network time does not drown the difference. Needs a Playwright Chromium
+(`playwright install chromium`).
+
+Run from backend/:
+    python -m benchmarks.bench_page_pool
+"""
+import asyncio
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from playwright.async_api import async_playwright
+
+from jdcrawler.crawlers.base import STEALTH_SCRIPT
+from jdcrawler.crawlers.page_pool import PagePool
+
+FETCHES = 200
+HTML = ("<html><body>" + "<div class='item_recruit'>공고</div>" * 50 + "</body></html>").encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(HTML)
+
+    def log_message(self, *args):
+        pass
+
+
+async def fetch_with_new_tab(context, url: str) -> str:
+    page = await context.new_page()
+    await page.add_init_script(STEALTH_SCRIPT)
+    try:
+        await page.goto(url, wait_until="domcontentloaded")
+        return await page.content()
+    finally:
+        await page.close()
+
+
+async def fetch_with_pool(pool: PagePool, url: str) -> str:
+    async with pool.page() as page:
+        await page.goto(url, wait_until="domcontentloaded")
+        return await page.content()
+
+
+async def timed(fetch, url: str) -> list[float]:
+    timings = []
+    for _ in range(FETCHES):
+        start = time.perf_counter()
+        await fetch(url)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    p95 = statistics.quantiles(timings, n=20)[-1]
+    print(f"{label:<10} mean {statistics.mean(timings):6.1f} ms   p50 {statistics.median(timings):6.1f} ms   p95 {p95:6.1f} ms")
+
+
+async def main() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        context = await browser.new_context()
+        await context.add_init_script(STEALTH_SCRIPT)
+        # Warm up the browser process before measuring either side
+        await fetch_with_new_tab(context, url)
+
+        before = await timed(lambda url: fetch_with_new_tab(context, url), url)
+        pool = PagePool(context)
+        after = await timed(lambda url: fetch_with_pool(pool, url), url)
+        await pool.close()
+        await browser.close()
+    server.shutdown()
+
+    print(f"{FETCHES} fetches of a local page")
+    report("new tab", before)
+    report("pooled", after)
+    print(f"saved      {statistics.mean(before) - statistics.mean(after):6.1f} ms per fetch")
+    print(f"pool:      {pool.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
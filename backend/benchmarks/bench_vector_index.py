@@ -0,0 +1,88 @@
+"""
+Vector index benchmark at 100k synthetic postings: bulk build time, matrix
+memory, and latency of similar-job and profile queries.
+
+Run from backend/:
+    python -m benchmarks.bench_vector_index
+"""
+import random
+import statistics
+import time
+
+from jdcrawler.models.profile import TechSkill, UserProfile
+from jdcrawler.services.vector_index import JobVectorIndex
+
+NUM_POSTINGS = 100_000
+WORDS_PER_POSTING = 150
+NUM_QUERIES = 200
+BATCH_SIZE = 5000
+
+SKILLS = [
+    "Python", "Java", "Kotlin", "Spring", "React", "Docker", "Kafka", "AWS",
+    "Go", "SQL", "Redis", "Vue", "Node.js", "TypeScript", "Django", "FastAPI",
+    "Kubernetes", "Swift", "Spark", "Airflow",
+]
+ROLES = ["백엔드 개발자", "프론트엔드 개발자", "데이터 엔지니어", "iOS 개발자", "DevOps 엔지니어"]
+FILLER = [
+    "개발", "경험", "우대", "서비스", "설계", "운영", "협업", "플랫폼", "대용량",
+    "트래픽", "고객", "데이터", "파이프라인", "모바일", "인프라", "자동화",
+]
+
+
+def build_postings(rng: random.Random) -> list[tuple[int, str, str]]:
+    postings = []
+    for job_id in range(1, NUM_POSTINGS + 1):
+        skills = rng.sample(SKILLS, 4)
+        title = f"{rng.choice(ROLES)} ({skills[0]})"
+        words = rng.choices(FILLER, k=WORDS_PER_POSTING) + skills * 3
+        rng.shuffle(words)
+        postings.append((job_id, title, " ".join(words)))
+    return postings
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    return sorted(samples)[int(len(samples) * pct) - 1]
+
+
+def main() -> None:
+    rng = random.Random(42)
+    postings = build_postings(rng)
+
+    index = JobVectorIndex()
+    start = time.perf_counter()
+    for i in range(0, len(postings), BATCH_SIZE):
+        index.add_many(postings[i : i + BATCH_SIZE])
+    build_elapsed = time.perf_counter() - start
+
+    matrix_mb = index._matrix[: index.size].nbytes / 1024 / 1024
+    projection_mb = index.projection.nbytes / 1024 / 1024
+    print(f"postings:        {len(index):,}")
+    print(f"build:           {build_elapsed:.1f}s ({len(index) / build_elapsed:,.0f} postings/s)")
+    print(f"memory:          {matrix_mb:.1f} MB vectors + {projection_mb:.1f} MB projection")
+
+    similar_ms = []
+    for _ in range(NUM_QUERIES):
+        job_id = rng.randint(1, NUM_POSTINGS)
+        start = time.perf_counter()
+        index.similar(job_id, k=10)
+        similar_ms.append((time.perf_counter() - start) * 1000)
+
+    profile = UserProfile(
+        tech_stack=[TechSkill(name=name, level="Intermediate") for name in SKILLS[:5]],
+        interest_keywords=["대용량 트래픽", "플랫폼"],
+    )
+    profile_ms = []
+    for _ in range(NUM_QUERIES):
+        start = time.perf_counter()
+        index.top_k(index.profile_vector(profile), k=20)
+        profile_ms.append((time.perf_counter() - start) * 1000)
+
+    for name, samples in (("similar (k=10)", similar_ms), ("profile (k=20)", profile_ms)):
+        print(
+            f"{name:<16} p50 {statistics.median(samples):.2f} ms, "
+            f"p95 {percentile(samples, 0.95):.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,49 @@ import os
 import sys
 
 from jdcrawler.db.client import DatabaseClient
+from jdcrawler.services.backfill import (
+    backfill_clusters,
+    backfill_skills,
+    backfill_structured_fields,
+)
 from jdcrawler.services.crawler import CrawlerService
+from jdcrawler.services.lifecycle import LifecycleService
+
+
+async def run_worker(argv: list[str]):
+    from jdcrawler.services.crawl_worker import CrawlWorker
+
+    parser = argparse.ArgumentParser(prog="jdcrawler worker", description="Run crawl tasks from the shared work queue")
+    parser.add_argument("--concurrency", "-c", type=int, help="Tasks run at once by this worker")
+    parser.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+    parser.add_argument("--no-headless", action="store_true", help="Run browser in visible mode")
+    args = parser.parse_args(argv)
+
+    os.makedirs("data", exist_ok=True)
+    db = DatabaseClient()
+    db.create_tables()
+    try:
+        processed = await CrawlWorker(db, concurrency=args.concurrency, headless=not args.no_headless).run(drain=args.drain)
+        print(f"Worker processed {processed} tasks.")
+    finally:
+        db.close()
 
 
 async def main():
+    # `worker` is a subcommand of its own; the positional site below has fixed choices
+    if sys.argv[1:2] == ["worker"]:
+        await run_worker(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description="JDCrawler CLI")
     parser.add_argument("site", nargs="?", choices=["saramin", "jobkorea", "wanted"], help="Site to crawl (optional)")
     parser.add_argument("--keyword", "-k", help="Search keyword")
     parser.add_argument("--all-keywords", "-a", action="store_true", help="Crawl all active keywords from DB")
+    parser.add_argument("--resume", action="store_true", help="Resume the most recent interrupted crawl")
     parser.add_argument("--no-headless", action="store_true", help="Run browser in visible mode")
+    parser.add_argument("--refresh", action="store_true", help="Re-check detail pages of postings that are due and exit")
+    parser.add_argument("--sweep", action="store_true", help="Archive expired and vanished postings and exit")
+    parser.add_argument("--backfill", choices=["skills", "fields", "clusters"], help="Recompute derived data for stored jobs and exit")
     
     args = parser.parse_args()
     
@@ -26,7 +60,19 @@ async def main():
     headless = not args.no_headless
     
     try:
-        if args.all_keywords:
+        if args.refresh:
+            await service.refresh_details(headless=headless)
+        elif args.sweep:
+            LifecycleService(db).sweep()
+        elif args.backfill == "skills":
+            backfill_skills(db)
+        elif args.backfill == "fields":
+            backfill_structured_fields(db)
+        elif args.backfill == "clusters":
+            backfill_clusters(db)
+        elif args.resume:
+            await service.resume_crawl(headless=headless)
+        elif args.all_keywords:
             print("Crawling all active keywords from DB...")
             await service.crawl_all_active_keywords(headless=headless)
         elif args.keyword:
@@ -1,13 +1,86 @@
 from fastapi import APIRouter, Request, HTTPException
+from pydantic import BaseModel
 from jdcrawler.services.analysis import AnalysisService
+from jdcrawler.services.analysis_cache import AnalysisCache
+from jdcrawler.services.analysis_worker import AnalysisQueue, get_worker, start_worker
+from jdcrawler.services.vector_index import get_vector_index
 from jdcrawler.db.schema import JobTable
 from sqlalchemy import update
 
 router = APIRouter(prefix="/api/analysis", tags=["analysis"])
 
+
+class AnalysisBatchRequest(BaseModel):
+    job_ids: list[int] | None = None
+    min_score: int | None = None
+    limit: int | None = None
+
+
 def get_db(request: Request):
     return request.app.state.db
 
+@router.post("/batch")
+async def enqueue_analysis(request: Request, data: AnalysisBatchRequest):
+    """
+    Queue jobs for background AI analysis (explicit job_ids, or every unanalyzed
+    job with a rule-based score >= min_score) and make sure the worker is running.
+    """
+    db = get_db(request)
+    queue = AnalysisQueue(db)
+    queued = queue.enqueue(job_ids=data.job_ids, min_score=data.min_score, limit=data.limit)
+    if queued:
+        start_worker(db)
+    return {"queued": queued, **queue.stats()}
+
+@router.get("/queue")
+def get_queue_status(request: Request):
+    db = get_db(request)
+    worker = get_worker()
+    return {
+        **AnalysisQueue(db).stats(),
+        "worker_running": bool(worker and worker.running),
+        "processed": worker.processed if worker else 0,
+        "failed": worker.failed if worker else 0,
+    }
+
+@router.get("/tech-stacks")
+def get_tech_stacks(request: Request, limit: int | None = None):
+    """How many visible jobs mention each skill, from the job_skills table."""
+    db = get_db(request)
+    return db.get_skill_counts(limit=limit)
+
+@router.get("/semantic-matches")
+def get_semantic_matches(request: Request, limit: int = 20):
+    """
+    Jobs ranked by TF-IDF cosine similarity to the profile's tech stack and
+    interests, computed locally without calling the LLM.
+    """
+    db = get_db(request)
+    index = get_vector_index(db)
+    matches = []
+    for job_id, similarity in index.top_k(index.profile_vector(db.get_profile()), k=limit * 2):
+        job = db.get_job(job_id)
+        if job and not job.is_hidden:
+            matches.append({"job": job, "similarity": round(similarity, 4)})
+        if len(matches) == limit:
+            break
+    return matches
+
+@router.get("/cache")
+def get_cache_stats(request: Request):
+    db = get_db(request)
+    return AnalysisCache(db).stats()
+
+@router.delete("/cache")
+def invalidate_cache(request: Request, profile_version: int | None = None, stale_only: bool = False):
+    """
+    Drop cached analyses: everything by default, one profile version, or
+    (stale_only=true) every version except the current profile's.
+    """
+    db = get_db(request)
+    deleted = AnalysisCache(db).invalidate(profile_version=profile_version, stale_only=stale_only)
+    return {"deleted": deleted}
+
 @router.post("/{job_id}")
 async def analyze_job(job_id: int, request: Request):
     db = get_db(request)
@@ -19,22 +92,21 @@ async def analyze_job(job_id: int, request: Request):
         raise HTTPException(status_code=400, detail="Job description is required for AI analysis")
 
     profile = db.get_profile()
-    analysis_service = AnalysisService()
+    analysis_service = AnalysisService(cache=AnalysisCache(db))
     
     # Perform AI Analysis
     result = await analysis_service.analyze_job_suitability(job, profile)
     
     # Update DB with AI results
-    stmt = (
-        update(JobTable)
-        .where(JobTable.id == job_id)
-        .values(
-            ai_score=result["score"],
-            ai_summary=result["summary"],
-            ai_status=result["status"]
-        )
-    )
+    values = {
+        "ai_score": result["score"],
+        "ai_summary": result["summary"],
+        "ai_status": result["status"],
+    }
+    if result.get("compression_ratio") is not None:
+        values["prompt_compression_ratio"] = result["compression_ratio"]
+    stmt = update(JobTable).where(JobTable.id == job_id).values(**values)
     db.jobs_session.execute(stmt)
     db.jobs_session.commit()
     
-    return result
\ No newline at end of file
+    return result
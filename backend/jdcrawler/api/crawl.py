@@ -1,10 +1,21 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, field_validator
 
-from jdcrawler.services.crawler import CrawlerService
+from jdcrawler.models.job import JobSite
+from jdcrawler.services import crawl_runs, enrichment, retry_policy, throttle
+from jdcrawler.services.crawl_schedule import CrawlSchedule
+from jdcrawler.services.work_queue import get_work_queue
 
 router = APIRouter(prefix="/api/crawl", tags=["crawl"])
 
+SSE_POLL_SECONDS = 0.5
+SSE_KEEPALIVE_SECONDS = 15.0
+
 
 class CrawlRequest(BaseModel):
     site: str
@@ -20,9 +31,9 @@ class CrawlRequest(BaseModel):
 
 class CrawlResponse(BaseModel):
     status: str
-    site: str
-    keyword: str
-    jobs_crawled: int
+    run_id: str
+    site: str | None = None
+    keyword: str | None = None
     message: str
 
 
@@ -32,51 +43,117 @@ def get_db(request: Request):
 
 import os
 
-@router.post("")
+@router.post("", response_model=CrawlResponse, status_code=202)
 async def crawl_site(request: CrawlRequest, http_request: Request):
+    """
+    Start crawling one keyword on one site and return immediately; follow
+    the run at /api/crawl/runs/{run_id}.
+    """
     db = get_db(http_request)
-    service = CrawlerService(db)
-
-    import traceback
-    try:
-        headless = os.getenv("HEADLESS", "true").lower() == "true"
-        jobs_crawled = await service.crawl_keyword(request.keyword, sites=[request.site], headless=headless)
-    except Exception as e:
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+    headless = os.getenv("HEADLESS", "true").lower() == "true"
+    run = crawl_runs.runs.submit(db, keyword=request.keyword, sites=[request.site], headless=headless)
 
     return CrawlResponse(
-        status="completed",
+        status="accepted",
+        run_id=run.id,
         site=request.site,
         keyword=request.keyword,
-        jobs_crawled=jobs_crawled,
-        message=f"Successfully crawled {jobs_crawled} jobs from {request.site}",
+        message=f"Crawling {request.site} for '{request.keyword}' in background",
     )
 
 
-@router.post("/all")
-async def crawl_all(http_request: Request, background_tasks: BackgroundTasks):
+@router.post("/all", response_model=CrawlResponse, status_code=202)
+async def crawl_all(http_request: Request):
     """
     Trigger crawling for all active keywords in the background.
     """
     db = get_db(http_request)
-    
-    async def _run_crawl():
-        service = CrawlerService(db)
-        headless = os.getenv("HEADLESS", "true").lower() == "true"
-        await service.crawl_all_active_keywords(headless=headless)
+    headless = os.getenv("HEADLESS", "true").lower() == "true"
+    run = crawl_runs.runs.submit(db, headless=headless)
+
+    return CrawlResponse(status="accepted", run_id=run.id, message="Crawling started in background")
 
-    background_tasks.add_task(_run_crawl)
-    
-    return {"status": "accepted", "message": "Crawling started in background"}
+
+@router.get("/runs")
+def list_crawl_runs():
+    return [run.to_dict() for run in crawl_runs.runs.list()]
+
+
+def _get_run(run_id: str) -> crawl_runs.CrawlRun:
+    run = crawl_runs.runs.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Crawl run not found")
+    return run
+
+
+@router.get("/runs/{run_id}")
+def get_crawl_run(run_id: str):
+    return _get_run(run_id).to_dict()
+
+
+@router.get("/runs/{run_id}/events")
+async def stream_crawl_run(run_id: str, request: Request):
+    """
+    Server-Sent Events: a `progress` event with the run snapshot whenever it
+    changes, and a final `end` event once the run finished.
+    """
+    run = _get_run(run_id)
+
+    async def events():
+        sent_version = -1
+        idle = 0.0
+        while True:
+            if run.version != sent_version:
+                sent_version = run.version
+                idle = 0.0
+                data = json.dumps(jsonable_encoder(run.to_dict()), ensure_ascii=False)
+                yield f"event: {'end' if run.finished else 'progress'}\ndata: {data}\n\n"
+                if run.finished:
+                    return
+            elif idle >= SSE_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(SSE_POLL_SECONDS)
+            idle += SSE_POLL_SECONDS
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.post("/runs/{run_id}/cancel")
+def cancel_crawl_run(run_id: str):
+    run = _get_run(run_id)
+    if not crawl_runs.runs.cancel(run_id):
+        raise HTTPException(status_code=409, detail=f"Crawl run already {run.status}")
+    return {"status": "cancelling", "run_id": run_id}
 
 
 @router.get("/status")
-def get_crawl_status():
+def get_crawl_status(http_request: Request):
     from jdcrawler.scheduler import scheduler
+    db = get_db(http_request)
     jobs = scheduler.get_jobs()
+    recent = crawl_runs.runs.list()
+    sites = [site.value for site in JobSite]
     
     return {
         "status": "running" if scheduler.running else "stopped",
         "jobs": [{"id": j.id, "next_run_time": j.next_run_time} for j in jobs],
+        "active_runs": [run.to_dict() for run in recent if not run.finished],
+        "last_crawl": recent[0].to_dict() if recent else None,
+        "refresh": enrichment.last_run,
+        # Next run and interval reasoning per active (keyword, site)
+        "schedule": CrawlSchedule(db).status(sites),
+        # Units claimed by crawls in this or other processes
+        "leases": db.get_active_leases(),
+        # Adaptive request rate, latency and outcome counts per site
+        "throttle": throttle.metrics(),
+        # Circuit breaker state, failure kinds and retry budget per site
+        "breakers": retry_policy.status(),
+        # Browser sessions saved per site for the next crawl
+        "browser_states": db.get_browser_states(),
+        # local: crawled in this process; queue: by `python -m jdcrawler worker`
+        "execution": crawl_runs.runs.execution,
+        "queue": get_work_queue(db).stats() if crawl_runs.runs.execution == "queue" else None,
     }
@@ -1,6 +1,15 @@
+import asyncio
+from datetime import date
+from typing import Literal
+
 from fastapi import APIRouter, HTTPException, Request
 
-from jdcrawler.models.job import JobResponse
+from jdcrawler.models.job import ArchivedJob, JobResponse, SimilarJob
+from jdcrawler.services import lifecycle
+from jdcrawler.services.lifecycle import LifecycleService
+from jdcrawler.services.skills import skill_extractor
+from jdcrawler.services.vector_index import get_vector_index
+from jdcrawler.utils.regions import gazetteer
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
@@ -17,10 +26,59 @@ def get_jobs(
     bookmarked: bool | None = None,
     limit: int = 100,
     offset: int = 0,
+    collapse: bool = False,
+    skills: str | None = None,
+    experience_years: int | None = None,
+    salary_min: int | None = None,
+    salary_max: int | None = None,
+    deadline_from: date | None = None,
+    deadline_to: date | None = None,
+    region: str | None = None,
+    keyword: str | None = None,
+    include_closed: bool = True,
+    sort: Literal["created_at", "salary", "experience", "deadline"] = "created_at",
+    order: Literal["asc", "desc"] = "desc",
 ):
+    """
+    `skills` is a comma-separated list; jobs must mention all of them.
+    Salaries are annual KRW; `experience_years` matches jobs whose required
+    experience range includes it. `region` is a region name or code ("경기",
+    "성남시", "41130"); a 시/도 includes all of its 시/군/구.
+    `keyword` keeps postings found by that search keyword; `include_closed=false`
+    leaves out postings that are no longer listed.
+    """
     db = get_db(request)
+    region_code = None
+    if region:
+        region_code = gazetteer.resolve(region)
+        if region_code is None:
+            raise HTTPException(status_code=400, detail=f"Unknown region: {region}")
+    skill_names = None
+    if skills:
+        # Accept any known spelling ("자바,kafka") and unknown names as-is
+        skill_names = [
+            skill_extractor.canonicalize(name) or name.strip()
+            for name in skills.split(",")
+            if name.strip()
+        ]
     jobs = db.get_jobs(
-        search=q, site=site, bookmarked=bookmarked, limit=limit, offset=offset
+        search=q,
+        site=site,
+        bookmarked=bookmarked,
+        limit=limit,
+        offset=offset,
+        collapse_duplicates=collapse,
+        skills=skill_names,
+        experience_years=experience_years,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to,
+        region_code=region_code,
+        keyword=keyword,
+        include_closed=include_closed,
+        sort=sort,
+        order=order,
     )
     return jobs
 
@@ -31,6 +89,35 @@ def get_job_stats(request: Request):
     return db.get_job_stats()
 
 
+@router.get("/archived", response_model=list[ArchivedJob])
+def get_archived_jobs(request: Request, q: str | None = None, limit: int = 100, offset: int = 0):
+    """Expired and vanished postings moved out of the main listing, newest first."""
+    db = get_db(request)
+    return db.get_archived_jobs(search=q, limit=limit, offset=offset)
+
+
+@router.get("/archived/{job_id}", response_model=ArchivedJob)
+def get_archived_job(request: Request, job_id: int):
+    db = get_db(request)
+    job = db.get_archived_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/lifecycle")
+def get_lifecycle_status(request: Request):
+    db = get_db(request)
+    return {**LifecycleService(db).counts(), "last_sweep": lifecycle.last_sweep}
+
+
+@router.post("/lifecycle/sweep")
+async def run_lifecycle_sweep(request: Request):
+    """Archive expired / vanished postings now instead of waiting for the scheduler."""
+    db = get_db(request)
+    return await asyncio.to_thread(LifecycleService(db).sweep)
+
+
 @router.get("/{job_id}", response_model=JobResponse)
 def get_job(request: Request, job_id: int):
     db = get_db(request)
@@ -40,6 +127,32 @@ def get_job(request: Request, job_id: int):
     return job
 
 
+@router.get("/{job_id}/duplicates", response_model=list[JobResponse])
+def get_duplicate_jobs(request: Request, job_id: int):
+    """Every posting in the job's near-duplicate cluster, including itself."""
+    db = get_db(request)
+    if not db.get_job(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return db.get_cluster_jobs(job_id)
+
+
+@router.get("/{job_id}/similar", response_model=list[SimilarJob])
+def get_similar_jobs(request: Request, job_id: int, k: int = 10):
+    db = get_db(request)
+    if not db.get_job(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    index = get_vector_index(db)
+    # Over-fetch a little so hidden jobs can be dropped without returning fewer than k
+    results = []
+    for similar_id, similarity in index.similar(job_id, k=k * 2):
+        job = db.get_job(similar_id)
+        if job and not job.is_hidden:
+            results.append(SimilarJob(job=job, similarity=round(similarity, 4)))
+        if len(results) == k:
+            break
+    return results
+
+
 @router.patch("/{job_id}/bookmark", response_model=JobResponse)
 def toggle_bookmark(request: Request, job_id: int):
     db = get_db(request)
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, BackgroundTasks, Request
 from jdcrawler.models.profile import UserProfile, UserProfileUpdate
+from jdcrawler.services import rescoring
+from jdcrawler.services.rescoring import RescoringService
 
 router = APIRouter(prefix="/api/profile", tags=["profile"])
 
@@ -12,6 +14,26 @@ async def get_profile(request: Request):
     return db.get_profile()
 
 @router.post("", response_model=UserProfile)
-async def update_profile(request: Request, data: UserProfileUpdate):
+async def update_profile(request: Request, data: UserProfileUpdate, background_tasks: BackgroundTasks):
     db = get_db(request)
-    return db.update_profile(data)
+    profile = db.update_profile(data)
+    # Stored rule-based scores now refer to the old profile version
+    background_tasks.add_task(RescoringService(db).run)
+    return profile
+
+@router.get("/rescore")
+def get_rescore_status(request: Request):
+    db = get_db(request)
+    return {
+        **rescoring.progress.to_dict(),
+        "remaining": RescoringService(db).count_stale(),
+    }
+
+@router.post("/rescore")
+def start_rescore(request: Request, background_tasks: BackgroundTasks):
+    """
+    Start (or resume) re-scoring of jobs whose score is older than the current profile.
+    """
+    db = get_db(request)
+    background_tasks.add_task(RescoringService(db).run)
+    return {"status": "accepted"}
@@ -1,23 +1,100 @@
+import os
+import time
 from abc import ABC, abstractmethod
 
+from bs4 import BeautifulSoup
 from playwright.async_api import Browser, async_playwright
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-from jdcrawler.utils.rate_limiter import RateLimiter
-from jdcrawler.utils.retry import retry
+from jdcrawler.crawlers.page_pool import PagePool
+from jdcrawler.utils.rate_limiter import AdaptiveRateLimiter, RateLimiter
+from jdcrawler.utils.retry import RetryPolicy
 from jdcrawler.models.job import JobCreate
 
 
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    window.chrome = {
+        runtime: {}
+    };
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['ko-KR', 'ko', 'en-US', 'en']
+    });
+"""
+
+
+class BlockedError(Exception):
+    """The site answered with a block or captcha page instead of content."""
+
+
+class ServerError(Exception):
+    """The site answered 429 or 5xx; worth retrying later."""
+
+
+def classify_error(e: Exception) -> str:
+    """Failure kind of a fetch for RetryPolicy."""
+    if isinstance(e, BlockedError):
+        return "blocked"
+    if isinstance(e, ServerError):
+        return "server"
+    if isinstance(e, (PlaywrightTimeoutError, TimeoutError)):
+        return "timeout"
+    if isinstance(e, ConnectionError) or (isinstance(e, PlaywrightError) and "net::ERR_" in str(e)):
+        return "network"
+    return "permanent"
+
+
 class BaseCrawler(ABC):
+    # Text of block / captcha pages; sites may add their own. Matched in the
+    # page title, or in the text of a page too short to be a listing or a
+    # posting, so a posting that mentions "접근이 제한" is not a block
+    BLOCK_MARKERS = (
+        "비정상적인 접근",
+        "접근이 차단",
+        "접근이 제한",
+        "자동입력 방지",
+        "Access Denied",
+    )
+    # Markup only challenge pages carry, matched anywhere in the page
+    BLOCK_PAGE_MARKUP = (
+        "captcha-delivery",
+        "cf-chl-",
+    )
+    # Visible text longer than this is taken for real content
+    BLOCK_PAGE_MAX_TEXT = 1000
+
     def __init__(
         self,
         headless: bool = True,
         rate_limit_delay: float = 3.0,
         jitter: float = 2.0,
+        throttle: AdaptiveRateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        storage_state: dict | None = None,
     ):
         self.headless = headless
-        self.rate_limiter = RateLimiter(delay=rate_limit_delay, jitter=jitter)
+        # Cookies and localStorage of an earlier session on the site, if any
+        self.storage_state = storage_state
+        # Set once the site answered with a block page
+        self.blocked = False
+        # An adaptive throttle replaces the fixed delay and is told how each request went
+        self.throttle = throttle
+        self.rate_limiter = throttle or RateLimiter(delay=rate_limit_delay, jitter=jitter)
+        # Usually the site's shared policy, so its circuit breaker spans crawler instances
+        self.retry_policy = retry_policy or RetryPolicy()
         self.browser: Browser | None = None
         self.playwright = None
+        self.pages: PagePool | None = None
+        # ETag / Last-Modified of fetched pages by URL, for conditional re-fetches
+        self.validators: dict[str, dict[str, str]] = {}
+        # Pages loaded by this crawler, list pagination and detail frames included
+        self.pages_fetched = 0
 
     async def __aenter__(self):
         self.playwright = await async_playwright().start()
@@ -36,6 +113,7 @@ class BaseCrawler(ABC):
             ]
         )
         self.context = await self.browser.new_context(
+            storage_state=self.storage_state,
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
             viewport={"width": 1920, "height": 1080}, # Fixed large viewport
             device_scale_factor=1,
@@ -46,10 +124,18 @@ class BaseCrawler(ABC):
                 "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
             }
         )
-        await self.context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        # Once per context: every tab, pooled or not, runs it before page scripts
+        await self.context.add_init_script(STEALTH_SCRIPT)
+        self.pages = PagePool(
+            self.context,
+            size=int(os.getenv("CRAWL_PAGE_POOL_SIZE", "2")),
+            max_uses=int(os.getenv("CRAWL_PAGE_MAX_USES", "50")),
+        )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.pages is not None:
+            await self.pages.close()
         if self.browser:
             await self.browser.close()
         if self.playwright:
@@ -59,7 +145,6 @@ class BaseCrawler(ABC):
     async def crawl(self, keyword: str) -> list["JobCreate"]:
         pass
 
-    @retry(max_attempts=3, delay=2.0)
     async def fetch_page(
         self,
         url: str,
@@ -67,32 +152,31 @@ class BaseCrawler(ABC):
         wait_until: str = "domcontentloaded",
         wait_for_selector: str | None = None,
     ):
+        return await self.retry_policy.call(
+            lambda: self._fetch_page(url, timeout, wait_until, wait_for_selector), classify_error
+        )
+
+    async def _fetch_page(self, url: str, timeout: float, wait_until: str, wait_for_selector: str | None):
         await self.rate_limiter.acquire()
-        page = await self.context.new_page()
-        # Manual Stealth Scripts
-        await page.add_init_script("""
-            // Webdriver property
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-
-            // Chrome property
-            window.chrome = {
-                runtime: {}
-            };
-
-            // Plugins
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-
-            // Languages
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['ko-KR', 'ko', 'en-US', 'en']
-            });
-        """)
-        try:
-            await page.goto(url, timeout=timeout, wait_until=wait_until)
+        async with self.pages.page() as page:
+            started = time.monotonic()
+            try:
+                response = await page.goto(url, timeout=timeout, wait_until=wait_until)
+            except (PlaywrightTimeoutError, TimeoutError):
+                self._record("timeout")
+                raise
+            except Exception:
+                self._record("error")
+                raise
+            latency = time.monotonic() - started
+            if response is not None:
+                validators = {
+                    name: response.headers[header]
+                    for name, header in (("etag", "etag"), ("last_modified", "last-modified"))
+                    if header in response.headers
+                }
+                if validators:
+                    self.validators[url] = validators
             
             if wait_for_selector:
                 try:
@@ -108,6 +192,74 @@ class BaseCrawler(ABC):
                     pass
 
             content = await page.content()
-        finally:
-            await page.close()
+        self.pages_fetched += 1
+        outcome = self.classify_response(response.status if response is not None else None, content)
+        self._record(outcome, latency)
+        if outcome == "blocked":
+            raise BlockedError(f"Blocked by {url}")
+        if outcome in ("throttled", "error"):
+            raise ServerError(f"HTTP {response.status} from {url}")
         return content
+
+    def classify_response(self, status: int | None, content: str) -> str:
+        """Outcome of a fetched page for the throttle: ok, throttled, blocked or error."""
+        if status == 429:
+            return "throttled"
+        if status == 403 or self.is_block_page(content):
+            return "blocked"
+        if status is not None and status >= 500:
+            return "error"
+        return "ok"
+
+    def is_block_page(self, content: str) -> bool:
+        if any(marker in content for marker in self.BLOCK_PAGE_MARKUP):
+            return True
+        if not any(marker in content for marker in self.BLOCK_MARKERS):
+            return False
+        soup = BeautifulSoup(content, "html.parser")
+        title = soup.title.get_text() if soup.title else ""
+        if any(marker in title for marker in self.BLOCK_MARKERS):
+            return True
+        for tag in soup(["script", "style", "noscript"]):
+            tag.decompose()
+        text = soup.get_text(" ", strip=True)
+        return len(text) <= self.BLOCK_PAGE_MAX_TEXT and any(marker in text for marker in self.BLOCK_MARKERS)
+
+    async def current_storage_state(self) -> dict:
+        """Cookies and localStorage of this session, to start the next one warm."""
+        return await self.context.storage_state()
+
+    def _record(self, outcome: str, latency: float | None = None) -> None:
+        if outcome == "blocked":
+            self.blocked = True
+        if self.throttle is not None:
+            self.throttle.record(outcome, latency)
+
+    async def is_not_modified(self, url: str, etag: str | None, last_modified: str | None) -> bool:
+        """
+        Conditional GET with the validators of an earlier fetch. True only if
+        the server answers 304 Not Modified; without validators, or on any
+        error, the page has to be fetched normally.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        if not headers:
+            return False
+        await self.rate_limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = await self.context.request.get(url, headers=headers, timeout=10000)
+            not_modified = response.status == 304
+            if not_modified:
+                self._record("ok", time.monotonic() - started)
+            else:
+                self._record(self.classify_response(response.status, ""), time.monotonic() - started)
+            await response.dispose()
+            return not_modified
+        except Exception as e:
+            print(f"Conditional request failed for {url}: {e}")
+            self._record("timeout" if isinstance(e, PlaywrightTimeoutError) else "error")
+            return False
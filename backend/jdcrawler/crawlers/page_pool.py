@@ -0,0 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from playwright.async_api import BrowserContext, Page
+
+
+class PagePool:
+    """
+    Reusable tabs of one browser context. A released tab is reset (navigated
+    to about:blank) and handed to the next fetch instead of being closed; init scripts live on the context, so
+    a reused tab needs no setup. A tab is closed after max_uses fetches, or
+    after a fetch that failed, since it may be left mid-navigation.
+    At most `size` tabs are open at once.
+    """
+
+    def __init__(self, context: BrowserContext, size: int = 2, max_uses: int = 50):
+        self.context = context
+        self.size = size
+        self.max_uses = max_uses
+        self._idle: list[Page] = []
+        self._uses: dict[Page, int] = {}
+        self._slots = asyncio.Semaphore(size)
+        self.created = 0
+        self.reused = 0
+        self.retired = 0
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._slots:
+            if self._idle:
+                page = self._idle.pop()
+                self.reused += 1
+            else:
+                page = await self.context.new_page()
+                self._uses[page] = 0
+                self.created += 1
+            healthy = False
+            try:
+                yield page
+                healthy = True
+            finally:
+                await self._release(page, healthy)
+
+    async def _release(self, page: Page, healthy: bool) -> None:
+        self._uses[page] += 1
+        if healthy and self._uses[page] < self.max_uses and not page.is_closed():
+            try:
+                await page.goto("about:blank")
+                self._idle.append(page)
+                return
+            except Exception:
+                pass
+        await self._retire(page)
+
+    async def _retire(self, page: Page) -> None:
+        self._uses.pop(page, None)
+        self.retired += 1
+        with suppress(Exception):
+            await page.close()
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._retire(self._idle.pop())
+
+    def stats(self) -> dict[str, int]:
+        return {"created": self.created, "reused": self.reused, "retired": self.retired, "idle": len(self._idle)}
@@ -2,6 +2,7 @@ from bs4 import BeautifulSoup
 
 from jdcrawler.crawlers.base import BaseCrawler
 from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.utils.regions import gazetteer
 
 
 class SaraminCrawler(BaseCrawler):
@@ -39,7 +40,7 @@ class SaraminCrawler(BaseCrawler):
             # We iterate to find them by keywords or position
             for span in condition_spans:
                 text = span.get_text(strip=True)
-                if not location and ("서울" in text or "경기" in text or "인천" in text or "부산" in text or "대구" in text or "광주" in text or "대전" in text or "울산" in text or "세종" in text or "강원" in text or "충북" in text or "충남" in text or "전북" in text or "전남" in text or "경북" in text or "경남" in text or "제주" in text or "전국" in text):
+                if not location and gazetteer.contains_region(text):
                     location = text
                 elif not experience and ("신입" in text or "경력" in text or "무관" in text):
                     experience = text
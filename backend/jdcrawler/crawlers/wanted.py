@@ -6,6 +6,7 @@ from bs4 import BeautifulSoup
 
 from jdcrawler.crawlers.base import BaseCrawler
 from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.utils.regions import gazetteer
 
 
 class WantedCrawler(BaseCrawler):
@@ -69,7 +70,8 @@ class WantedCrawler(BaseCrawler):
             if loc_exp_text:
                 if any(x in loc_exp_text for x in ["경력", "신입", "년"]):
                     experience = loc_exp_text
-                else:
+                # The same span may carry both ("서울 강남구 · 경력 3-5년")
+                if not experience or gazetteer.contains_region(loc_exp_text):
                     location = loc_exp_text
 
             jobs.append(
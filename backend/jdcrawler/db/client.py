@@ -1,17 +1,36 @@
+import copy
 import json
-from datetime import datetime
+import os
+from datetime import date, datetime
 
 from rapidfuzz import fuzz
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import Session
+from sqlalchemy import Engine, and_, bindparam, create_engine, delete, exists, func, inspect, or_, select, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import DeclarativeBase, Session
 
-from jdcrawler.db.schema import Base, UserBase, JobTable, KeywordTable, ProfileTable, NotificationTable
-from jdcrawler.models.job import Job, JobCreate
+from jdcrawler.db.schema import Base, UserBase, BrowserStateTable, CrawlLeaseTable, CrawlScopeTable, JobTable, JobKeywordTable, JobLshBandTable, JobSkillTable, KeywordTable, ProfileTable, NotificationTable, job_archive_table
+from jdcrawler.models.job import ArchivedJob, Job, JobCreate
 from jdcrawler.models.keyword import Keyword
 from jdcrawler.models.profile import UserProfile, UserProfileUpdate
+from jdcrawler.utils.canonical import canonicalize
+from jdcrawler.utils.minhash import MinHasher
+from jdcrawler.utils.normalize import structured_fields
 
 
 class DatabaseClient:
+    minhasher = MinHasher()
+    # Estimated Jaccard similarity of descriptions above which jobs are clustered
+    near_duplicate_threshold = 0.7
+    # Consecutive runs of every (keyword, site) that listed a job it must be
+    # missing from before the job is flagged closed
+    close_after_missed_runs = int(os.getenv("JOBS_CLOSE_AFTER_MISSED_RUNS", "3"))
+    SORT_COLUMNS = {
+        "created_at": JobTable.created_at,
+        "salary": JobTable.salary_min,
+        "experience": JobTable.experience_min_years,
+        "deadline": JobTable.deadline_date,
+    }
+
     def __init__(
         self, 
         jobs_db_url: str = "sqlite:///./data/jobs.db",
@@ -25,12 +44,58 @@ class DatabaseClient:
     def create_tables(self):
         Base.metadata.create_all(self.jobs_engine)
         UserBase.metadata.create_all(self.user_engine)
-
-    def close(self):
+        self._add_missing_columns(self.jobs_engine, Base)
+        self._add_missing_columns(self.user_engine, UserBase)
+        self.merge_duplicate_postings()
+
+    @staticmethod
+    def _add_missing_columns(engine: Engine, base: type[DeclarativeBase]) -> None:
+        """
+        create_all() only creates missing tables, so columns and indexes added to
+        existing tables after a database file was created are added here.
+        """
+        inspector = inspect(engine)
+        with engine.begin() as conn:
+            for table in base.metadata.sorted_tables:
+                existing = {col["name"] for col in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+                    if isinstance(default, bool):
+                        ddl += f" DEFAULT {int(default)}"
+                    elif isinstance(default, int | float):
+                        ddl += f" DEFAULT {default}"
+                    elif isinstance(default, str):
+                        escaped = default.replace("'", "''")
+                        ddl += f" DEFAULT '{escaped}'"
+                    conn.execute(text(ddl))
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+
+    def scoped(self) -> "DatabaseClient":
+        """
+        A client on the same engines with sessions of its own, for work that
+        runs concurrently with other users of this client (e.g. parallel crawl
+        units): a commit on one never flushes the other's half-applied changes.
+        Release it with close_sessions(); the engines belong to this client.
+        """
+        client = copy.copy(self)
+        client._jobs_session = None
+        client._user_session = None
+        return client
+
+    def close_sessions(self):
         if self._jobs_session:
             self._jobs_session.close()
+            self._jobs_session = None
         if self._user_session:
             self._user_session.close()
+            self._user_session = None
+
+    def close(self):
+        self.close_sessions()
         self.jobs_engine.dispose()
         self.user_engine.dispose()
 
@@ -46,12 +111,17 @@ class DatabaseClient:
             self._user_session = Session(self.user_engine)
         return self._user_session
 
-    def create_job(self, job_data: JobCreate) -> Job:
-        # 1. Exact URL match
-        existing = self.jobs_session.execute(
-            select(JobTable).where(JobTable.url == str(job_data.url))
+    def find_posting(self, site: str, url: str) -> JobTable | None:
+        """Stored job for any link variant of a posting, by (site, external_id)."""
+        external_id, _ = canonicalize(site, url)
+        return self.jobs_session.execute(
+            select(JobTable).where(JobTable.site == site, JobTable.external_id == external_id)
         ).scalar_one_or_none()
 
+    def create_job(self, job_data: JobCreate) -> Job:
+        # 1. Same posting, whichever link variant was crawled
+        existing = self.find_posting(job_data.site, str(job_data.url))
+
         if existing:
             return self._job_table_to_model(existing)
 
@@ -75,11 +145,14 @@ class DatabaseClient:
                 print(f"Skipping duplicate job (Company: {company_sim}%, Title: {title_sim}%): '{job_data.company} - {job_data.title}'")
                 return self._job_table_to_model(r_job)
 
+        now = datetime.now()
+        external_id, url = canonicalize(job_data.site, str(job_data.url))
         job = JobTable(
             title=job_data.title,
             company=job_data.company,
-            url=str(job_data.url),
+            url=url,
             site=job_data.site,
+            external_id=external_id,
             location=job_data.location,
             salary=job_data.salary,
             experience=job_data.experience,
@@ -87,18 +160,430 @@ class DatabaseClient:
             deadline=job_data.deadline,
             is_bookmarked=False,
             is_hidden=False,
-            created_at=datetime.now(),
+            created_at=now,
+            last_seen_at=now,
             description=job_data.description,
             description_image_url=job_data.description_image_url,
             ai_score=job_data.ai_score,
             ai_summary=job_data.ai_summary,
             ai_status=job_data.ai_status,
+            scored_profile_version=job_data.scored_profile_version,
+            content_hash=job_data.content_hash,
+            card_hash=job_data.card_hash,
+            details_fetched_at=job_data.details_fetched_at,
+            etag=job_data.etag,
+            last_modified=job_data.last_modified,
+            skill_rows=[JobSkillTable(skill=skill) for skill in job_data.skills],
         )
+        self.apply_structured_fields(job)
         self.jobs_session.add(job)
+        self.jobs_session.flush()
+        self.assign_cluster(job)
         self.jobs_session.commit()
         self.jobs_session.refresh(job)
         return self._job_table_to_model(job)
 
+    def assign_cluster(self, job: JobTable) -> None:
+        """
+        Compute the job's MinHash signature, look up candidates through the LSH
+        band index and put the job into the cluster of its most similar
+        near-duplicate. Only the (band, key) index is probed, so the cost does
+        not grow with the size of the table. The caller commits.
+        """
+        session = self.jobs_session
+        session.execute(delete(JobLshBandTable).where(JobLshBandTable.job_id == job.id))
+        signature = self.minhasher.signature(job.description) if job.description else None
+        if signature is None:
+            job.minhash = None
+            return
+        job.minhash = self.minhasher.to_bytes(signature)
+        keys = self.minhasher.bands(signature)
+
+        candidate_ids = session.execute(
+            select(JobLshBandTable.job_id)
+            .where(
+                or_(*(and_(JobLshBandTable.band == band, JobLshBandTable.key == key) for band, key in enumerate(keys))),
+                JobLshBandTable.job_id != job.id,
+            )
+            .distinct()
+        ).scalars().all()
+
+        best, best_similarity = None, self.near_duplicate_threshold
+        if candidate_ids:
+            for candidate in session.execute(
+                select(JobTable).where(JobTable.id.in_(candidate_ids), JobTable.minhash.is_not(None))
+            ).scalars():
+                similarity = self.minhasher.similarity(signature, self.minhasher.from_bytes(candidate.minhash))
+                if similarity >= best_similarity:
+                    best, best_similarity = candidate, similarity
+        if best is not None:
+            if best.cluster_id is None:
+                best.cluster_id = best.id
+            job.cluster_id = best.cluster_id
+            print(f"Near-duplicate of job {best.id} ({best_similarity:.0%}): '{job.company} - {job.title}'")
+
+        session.add_all(JobLshBandTable(band=band, key=key, job_id=job.id) for band, key in enumerate(keys))
+
+    @staticmethod
+    def reassign_cluster_heads(session: Session, cluster_ids) -> None:
+        """After jobs were removed, point each cluster at its oldest remaining member."""
+        for cluster_id in cluster_ids:
+            new_id = session.execute(
+                select(func.min(JobTable.id)).where(JobTable.cluster_id == cluster_id)
+            ).scalar_one()
+            if new_id is not None and new_id != cluster_id:
+                session.execute(
+                    update(JobTable).where(JobTable.cluster_id == cluster_id).values(cluster_id=new_id)
+                )
+
+    def merge_duplicate_postings(self) -> int:
+        """
+        One-time migration for rows stored before external_id existed: derive
+        their (external_id, canonical url) and merge rows that turn out to be
+        the same posting into the oldest one. A no-op once every row has an
+        external_id. Returns the number of rows merged away.
+        """
+        session = self.jobs_session
+        pending = session.execute(
+            select(JobTable.id, JobTable.site, JobTable.url).where(JobTable.external_id.is_(None))
+        ).all()
+        if not pending:
+            return 0
+
+        known = {
+            (site, external_id): job_id
+            for job_id, site, external_id in session.execute(
+                select(JobTable.id, JobTable.site, JobTable.external_id).where(JobTable.external_id.is_not(None))
+            )
+        }
+        canonical: dict[int, tuple[str, str]] = {}
+        groups: dict[tuple, list[int]] = {}
+        for job_id, site, url in pending:
+            canonical[job_id] = canonicalize(site, url)
+            groups.setdefault((site, canonical[job_id][0]), []).append(job_id)
+
+        merged = 0
+        for key, ids in groups.items():
+            if key in known:
+                ids = [known[key], *ids]
+            if len(ids) > 1:
+                survivor, *duplicates = sorted(ids)
+                self._merge_jobs(survivor, duplicates)
+                merged += len(duplicates)
+                for job_id in duplicates:
+                    canonical.pop(job_id, None)
+        session.flush()
+
+        table = JobTable.__table__
+        session.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(external_id=bindparam("external_id"), url=bindparam("url"))
+            .execution_options(synchronize_session=False),
+            [
+                {"b_id": job_id, "external_id": external_id, "url": url}
+                for job_id, (external_id, url) in canonical.items()
+            ],
+        )
+        session.commit()
+        session.expire_all()
+        print(f"Assigned external ids to {len(canonical)} jobs, merged {merged} duplicates")
+        return merged
+
+    def _merge_jobs(self, survivor_id: int, duplicate_ids: list[int]) -> None:
+        """Fold duplicate rows of one posting into survivor_id. The caller commits."""
+        session = self.jobs_session
+        survivor = session.get(JobTable, survivor_id)
+        duplicates = [session.get(JobTable, job_id) for job_id in duplicate_ids]
+        rows = [survivor, *duplicates]
+
+        survivor.is_bookmarked = any(job.is_bookmarked for job in rows)
+        survivor.is_hidden = any(job.is_hidden for job in rows)
+        survivor.is_closed = all(job.is_closed for job in rows)
+        survivor.created_at = min(job.created_at for job in rows if job.created_at)
+        survivor.last_seen_at = max((job.last_seen_at for job in rows if job.last_seen_at), default=None)
+        survivor.seen_count = sum(job.seen_count or 0 for job in rows)
+
+        # Take over details (and their analysis) the survivor is missing
+        donor = None
+        if not survivor.description:
+            donor = next((job for job in duplicates if job.description), None)
+        elif survivor.ai_status != "completed":
+            donor = next(
+                (job for job in duplicates if job.ai_status == "completed" and job.description == survivor.description),
+                None,
+            )
+        if donor is not None:
+            for column in (
+                "description",
+                "description_image_url",
+                "content_hash",
+                "details_fetched_at",
+                "etag",
+                "last_modified",
+                "ai_score",
+                "ai_summary",
+                "ai_status",
+                "analysis_queued_at",
+                "analysis_claimed_at",
+                "prompt_compression_ratio",
+                "scored_profile_version",
+            ):
+                setattr(survivor, column, getattr(donor, column))
+            self.set_job_skills(survivor, [row.skill for row in donor.skill_rows])
+
+        listings = session.execute(
+            select(JobKeywordTable).where(JobKeywordTable.job_id.in_(duplicate_ids))
+        ).scalars().all()
+        if listings:
+            upsert = sqlite_insert(JobKeywordTable).values(
+                [
+                    {
+                        "job_id": survivor_id,
+                        "keyword": row.keyword,
+                        "site": row.site,
+                        "first_seen_at": row.first_seen_at,
+                        "last_seen_run": row.last_seen_run,
+                    }
+                    for row in listings
+                ]
+            )
+            session.execute(
+                upsert.on_conflict_do_update(
+                    index_elements=["job_id", "keyword", "site"],
+                    set_={"last_seen_run": func.max(JobKeywordTable.last_seen_run, upsert.excluded.last_seen_run)},
+                )
+            )
+        session.execute(delete(JobKeywordTable).where(JobKeywordTable.job_id.in_(duplicate_ids)))
+        session.execute(delete(JobLshBandTable).where(JobLshBandTable.job_id.in_(duplicate_ids)))
+        cluster_ids = {job.cluster_id for job in duplicates if job.cluster_id is not None}
+        for job in duplicates:
+            session.delete(job)
+        session.flush()
+        if donor is not None:
+            self.assign_cluster(survivor)
+        self.reassign_cluster_heads(session, cluster_ids)
+
+    @staticmethod
+    def apply_structured_fields(job: JobTable) -> None:
+        """Re-parse the raw experience / salary / deadline / location strings into their columns."""
+        fields = structured_fields(job.experience, job.salary, job.deadline, job.created_at, job.location)
+        for name, value in fields.items():
+            setattr(job, name, value)
+
+    def set_job_skills(self, job: JobTable, skills: list[str]) -> None:
+        """Replace the job's extracted skills. The caller commits."""
+        current = {row.skill: row for row in job.skill_rows}
+        job.skill_rows = [current.get(skill) or JobSkillTable(skill=skill) for skill in skills]
+
+    def begin_crawl_run(self, keyword: str, site: str) -> int:
+        """Number of the (keyword, site) run about to start."""
+        scope = self.jobs_session.get(CrawlScopeTable, (keyword, site))
+        return (scope.completed_runs if scope else 0) + 1
+
+    def mark_seen(self, keyword: str, site: str, run: int, job_ids: list[int], page_started_at: datetime) -> int:
+        """
+        Record that one crawl result page listed job_ids, with one UPDATE of
+        jobs (last_seen_at, seen_count, reopening closed postings) and one
+        upsert of their job_keywords rows. Jobs created since page_started_at
+        were counted as seen by create_job already. Returns how many of the
+        jobs this (keyword, site) had never listed before.
+        """
+        ids = sorted(set(job_ids))
+        if not ids:
+            return 0
+        now = datetime.now()
+        session = self.jobs_session
+        listed = session.execute(
+            select(func.count()).select_from(JobKeywordTable).where(
+                JobKeywordTable.keyword == keyword,
+                JobKeywordTable.site == site,
+                JobKeywordTable.job_id.in_(ids),
+            )
+        ).scalar_one()
+        session.execute(
+            update(JobTable)
+            .where(JobTable.id.in_(ids), JobTable.created_at < page_started_at)
+            .values(last_seen_at=now, seen_count=JobTable.seen_count + 1, is_closed=False, closed_at=None)
+        )
+        upsert = sqlite_insert(JobKeywordTable).values(
+            [
+                {"job_id": job_id, "keyword": keyword, "site": site, "first_seen_at": now, "last_seen_run": run}
+                for job_id in ids
+            ]
+        )
+        session.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["job_id", "keyword", "site"],
+                set_={"last_seen_run": upsert.excluded.last_seen_run},
+            )
+        )
+        session.commit()
+        return len(ids) - listed
+
+    def finish_crawl_run(self, keyword: str, site: str, run: int) -> int:
+        """
+        Count a completed (keyword, site) run and flag jobs closed that every
+        (keyword, site) listing them has missed close_after_missed_runs times
+        in a row, in one UPDATE. Returns the number of newly closed jobs.
+        """
+        session = self.jobs_session
+        now = datetime.now()
+        scope = session.get(CrawlScopeTable, (keyword, site))
+        if scope is None:
+            scope = CrawlScopeTable(keyword=keyword, site=site)
+            session.add(scope)
+        scope.completed_runs = run
+        scope.last_run_at = now
+        session.flush()
+
+        limit = self.close_after_missed_runs
+        missed_here = select(JobKeywordTable.job_id).where(
+            JobKeywordTable.keyword == keyword,
+            JobKeywordTable.site == site,
+            JobKeywordTable.last_seen_run <= run - limit,
+        )
+        listed_elsewhere = exists().where(
+            JobKeywordTable.job_id == JobTable.id,
+            CrawlScopeTable.keyword == JobKeywordTable.keyword,
+            CrawlScopeTable.site == JobKeywordTable.site,
+            CrawlScopeTable.completed_runs - JobKeywordTable.last_seen_run < limit,
+        )
+        closed = session.execute(
+            update(JobTable)
+            .where(JobTable.is_closed.is_(False), JobTable.id.in_(missed_here), ~listed_elsewhere)
+            .values(is_closed=True, closed_at=now)
+        ).rowcount
+        session.commit()
+        return closed
+
+    def acquire_lease(self, keyword: str, site: str, owner: str, expires_at: datetime, since: datetime) -> bool:
+        """
+        Claim the (keyword, site) lease for owner in one upsert. Fails while
+        another owner holds an unexpired lease, and when the unit was crawled
+        to completion at or after since (by this run's start, another process
+        already did this run's work).
+        """
+        now = datetime.now()
+        upsert = sqlite_insert(CrawlLeaseTable).values(
+            keyword=keyword, site=site, owner=owner, acquired_at=now, heartbeat_at=now, expires_at=expires_at
+        )
+        current = CrawlLeaseTable.__table__.c
+        claimed = self.jobs_session.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["keyword", "site"],
+                set_={"owner": owner, "acquired_at": now, "heartbeat_at": now, "expires_at": expires_at},
+                where=and_(
+                    or_(current.expires_at <= now, current.owner == owner),
+                    or_(current.completed_at.is_(None), current.completed_at < since),
+                ),
+            )
+        ).rowcount
+        self.jobs_session.commit()
+        return claimed == 1
+
+    def renew_lease(self, keyword: str, site: str, owner: str, expires_at: datetime) -> bool:
+        """Heartbeat: extend owner's lease. False if it expired and was taken over."""
+        renewed = self.jobs_session.execute(
+            update(CrawlLeaseTable)
+            .where(CrawlLeaseTable.keyword == keyword, CrawlLeaseTable.site == site, CrawlLeaseTable.owner == owner)
+            .values(heartbeat_at=datetime.now(), expires_at=expires_at)
+        ).rowcount
+        self.jobs_session.commit()
+        return renewed == 1
+
+    def release_lease(self, keyword: str, site: str, owner: str, completed: bool) -> None:
+        """Give up owner's lease, recording a completed crawl."""
+        now = datetime.now()
+        values = {"expires_at": now}
+        if completed:
+            values["completed_at"] = now
+        self.jobs_session.execute(
+            update(CrawlLeaseTable)
+            .where(CrawlLeaseTable.keyword == keyword, CrawlLeaseTable.site == site, CrawlLeaseTable.owner == owner)
+            .values(**values)
+        )
+        self.jobs_session.commit()
+
+    def get_active_leases(self) -> list[dict]:
+        rows = self.jobs_session.execute(
+            select(CrawlLeaseTable)
+            .where(CrawlLeaseTable.expires_at > datetime.now())
+            .order_by(CrawlLeaseTable.acquired_at)
+        ).scalars()
+        return [
+            {
+                "keyword": lease.keyword,
+                "site": lease.site,
+                "owner": lease.owner,
+                "acquired_at": lease.acquired_at,
+                "heartbeat_at": lease.heartbeat_at,
+                "expires_at": lease.expires_at,
+            }
+            for lease in rows
+        ]
+
+    def get_browser_state(self, site: str) -> dict | None:
+        """The site's saved storage_state, unless it expired."""
+        row = self.jobs_session.get(BrowserStateTable, site)
+        if row is None or row.expires_at <= datetime.now():
+            return None
+        return json.loads(row.state)
+
+    def save_browser_state(self, site: str, state: dict, expires_at: datetime) -> None:
+        upsert = sqlite_insert(BrowserStateTable).values(
+            site=site, state=json.dumps(state, ensure_ascii=False), saved_at=datetime.now(), expires_at=expires_at
+        )
+        self.jobs_session.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["site"],
+                set_={"state": upsert.excluded.state, "saved_at": upsert.excluded.saved_at, "expires_at": expires_at},
+            )
+        )
+        self.jobs_session.commit()
+
+    def invalidate_browser_state(self, site: str) -> bool:
+        deleted = self.jobs_session.execute(delete(BrowserStateTable).where(BrowserStateTable.site == site)).rowcount
+        self.jobs_session.commit()
+        return deleted == 1
+
+    def get_browser_states(self) -> list[dict]:
+        rows = self.jobs_session.execute(select(BrowserStateTable).order_by(BrowserStateTable.site)).scalars()
+        return [
+            {
+                "site": row.site,
+                "cookies": len(json.loads(row.state).get("cookies", [])),
+                "saved_at": row.saved_at,
+                "expires_at": row.expires_at,
+                "expired": row.expires_at <= datetime.now(),
+            }
+            for row in rows
+        ]
+
+    def get_skill_counts(self, limit: int | None = None) -> dict[str, int]:
+        """Number of visible jobs mentioning each skill, most common first."""
+        count = func.count(JobSkillTable.job_id)
+        query = (
+            select(JobSkillTable.skill, count)
+            .join(JobTable, JobTable.id == JobSkillTable.job_id)
+            .where(JobTable.is_hidden.is_(False))
+            .group_by(JobSkillTable.skill)
+            .order_by(count.desc(), JobSkillTable.skill)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return dict(self.jobs_session.execute(query).all())
+
+    def get_cluster_jobs(self, job_id: int) -> list[Job]:
+        """All jobs in the same near-duplicate cluster as job_id, oldest first."""
+        job = self.jobs_session.get(JobTable, job_id)
+        if not job or job.cluster_id is None:
+            return []
+        results = self.jobs_session.execute(
+            select(JobTable).where(JobTable.cluster_id == job.cluster_id).order_by(JobTable.id)
+        ).scalars().all()
+        return [self._job_table_to_model(j) for j in results]
+
     def get_jobs(
         self,
         search: str | None = None,
@@ -106,7 +591,27 @@ class DatabaseClient:
         bookmarked: bool | None = None,
         limit: int = 100,
         offset: int = 0,
+        collapse_duplicates: bool = False,
+        skills: list[str] | None = None,
+        experience_years: int | None = None,
+        salary_min: int | None = None,
+        salary_max: int | None = None,
+        deadline_from: date | None = None,
+        deadline_to: date | None = None,
+        region_code: str | None = None,
+        keyword: str | None = None,
+        include_closed: bool = True,
+        sort: str = "created_at",
+        order: str = "desc",
     ) -> list[Job]:
+        """
+        experience_years keeps jobs whose experience range includes it.
+        salary_min / salary_max keep jobs whose salary range reaches into
+        [salary_min, salary_max]. region_code is a prefix: "41" matches every
+        시/군/구 of 경기도. keyword keeps jobs listed by that search keyword.
+        sort is one of SORT_COLUMNS; jobs without a value for the sort column
+        come last.
+        """
         query = select(JobTable).where(JobTable.is_hidden == False)
 
         if search:
@@ -118,8 +623,58 @@ class DatabaseClient:
             query = query.where(JobTable.site == site)
         if bookmarked is not None:
             query = query.where(JobTable.is_bookmarked == bookmarked)
+        if skills:
+            # Jobs having every requested skill, resolved through the (skill, job_id) index
+            query = query.where(
+                JobTable.id.in_(
+                    select(JobSkillTable.job_id)
+                    .where(JobSkillTable.skill.in_(skills))
+                    .group_by(JobSkillTable.job_id)
+                    .having(func.count(JobSkillTable.skill) == len(set(skills)))
+                )
+            )
+        if experience_years is not None:
+            query = query.where(
+                JobTable.experience_min_years <= experience_years,
+                or_(JobTable.experience_max_years.is_(None), JobTable.experience_max_years >= experience_years),
+            )
+        if salary_min is not None:
+            query = query.where(func.coalesce(JobTable.salary_max, JobTable.salary_min) >= salary_min)
+        if salary_max is not None:
+            query = query.where(func.coalesce(JobTable.salary_min, JobTable.salary_max) <= salary_max)
+        if deadline_from is not None:
+            query = query.where(JobTable.deadline_date >= deadline_from)
+        if deadline_to is not None:
+            query = query.where(JobTable.deadline_date <= deadline_to)
+        if region_code:
+            # Prefix match as a range, so the region_code index is used
+            upper = region_code[:-1] + chr(ord(region_code[-1]) + 1)
+            query = query.where(JobTable.region_code >= region_code, JobTable.region_code < upper)
+        if keyword:
+            # Jobs listed by that search keyword on any site
+            query = query.where(
+                JobTable.id.in_(select(JobKeywordTable.job_id).where(JobKeywordTable.keyword == keyword))
+            )
+        if not include_closed:
+            query = query.where(JobTable.is_closed.is_(False))
+        if collapse_duplicates:
+            # One row per cluster: its first job among those matching the
+            # filters stands in for the others, so a hidden or filtered-out
+            # head does not take the whole cluster with it
+            matching = query.subquery()
+            query = query.where(
+                JobTable.id.in_(
+                    select(func.min(matching.c.id)).group_by(func.coalesce(matching.c.cluster_id, matching.c.id))
+                )
+            )
 
-        query = query.order_by(JobTable.created_at.desc()).limit(limit).offset(offset)
+        column = self.SORT_COLUMNS[sort]
+        query = query.order_by(
+            column.is_(None),
+            column.asc() if order == "asc" else column.desc(),
+            JobTable.id.desc(),
+        )
+        query = query.limit(limit).offset(offset)
         results = self.jobs_session.execute(query).scalars().all()
         return [self._job_table_to_model(j) for j in results]
 
@@ -129,6 +684,22 @@ class DatabaseClient:
             return self._job_table_to_model(job)
         return None
 
+    def get_archived_jobs(self, search: str | None = None, limit: int = 100, offset: int = 0) -> list[ArchivedJob]:
+        query = select(job_archive_table)
+        if search:
+            query = query.where(
+                job_archive_table.c.title.ilike(f"%{search}%")
+                | job_archive_table.c.company.ilike(f"%{search}%")
+            )
+        query = query.order_by(job_archive_table.c.archived_at.desc()).limit(limit).offset(offset)
+        return [ArchivedJob.model_validate(dict(row._mapping)) for row in self.jobs_session.execute(query)]
+
+    def get_archived_job(self, job_id: int) -> ArchivedJob | None:
+        row = self.jobs_session.execute(
+            select(job_archive_table).where(job_archive_table.c.id == job_id)
+        ).first()
+        return ArchivedJob.model_validate(dict(row._mapping)) if row else None
+
     def toggle_bookmark(self, job_id: int) -> Job:
         job = self.jobs_session.get(JobTable, job_id)
         if not job:
@@ -200,13 +771,18 @@ class DatabaseClient:
             self.user_session.commit()
             self.user_session.refresh(profile)
         
-        return UserProfile(
-            tech_stack=json.loads(profile.tech_stack),
-            experience_years=profile.experience_years,
-            interest_keywords=json.loads(profile.interest_keywords),
-            exclude_keywords=json.loads(profile.exclude_keywords),
-            updated_at=profile.updated_at
-        )
+        return self._profile_table_to_model(profile)
+
+    def get_profile_snapshot(self) -> UserProfile:
+        """
+        Read the profile with a short-lived session instead of the shared one,
+        so background threads can call it safely.
+        """
+        with Session(self.user_engine) as session:
+            profile = session.execute(select(ProfileTable)).scalar_one_or_none()
+            if not profile:
+                return UserProfile()
+            return self._profile_table_to_model(profile)
 
     def update_profile(self, data: UserProfileUpdate) -> UserProfile:
         profile = self.user_session.execute(select(ProfileTable)).scalar_one_or_none()
@@ -221,6 +797,8 @@ class DatabaseClient:
         profile.experience_years = data.experience_years
         profile.interest_keywords = json.dumps(data.interest_keywords)
         profile.exclude_keywords = json.dumps(data.exclude_keywords)
+        # Bump the version so stored rule-based scores are recognized as stale
+        profile.version = (profile.version or 0) + 1
         profile.updated_at = datetime.now()
         
         self.user_session.commit()
@@ -263,14 +841,38 @@ class DatabaseClient:
             experience=job.experience,
             posted_at=job.posted_at.date() if job.posted_at else None,
             deadline=job.deadline,
+            experience_min_years=job.experience_min_years,
+            experience_max_years=job.experience_max_years,
+            salary_min=job.salary_min,
+            salary_max=job.salary_max,
+            deadline_date=job.deadline_date,
+            region_code=job.region_code,
             is_bookmarked=job.is_bookmarked,
             is_hidden=job.is_hidden,
             created_at=job.created_at,
+            last_seen_at=job.last_seen_at,
+            seen_count=job.seen_count,
+            is_closed=job.is_closed,
+            closed_at=job.closed_at,
             description=job.description,
             description_image_url=job.description_image_url,
             ai_score=job.ai_score,
             ai_summary=job.ai_summary,
             ai_status=job.ai_status,
+            prompt_compression_ratio=job.prompt_compression_ratio,
+            cluster_id=job.cluster_id,
+            skills=[row.skill for row in job.skill_rows],
+            keywords=sorted({row.keyword for row in job.keyword_rows}),
+        )
+
+    def _profile_table_to_model(self, profile: ProfileTable) -> UserProfile:
+        return UserProfile(
+            tech_stack=json.loads(profile.tech_stack),
+            experience_years=profile.experience_years,
+            interest_keywords=json.loads(profile.interest_keywords),
+            exclude_keywords=json.loads(profile.exclude_keywords),
+            version=profile.version or 1,
+            updated_at=profile.updated_at
         )
 
     def _keyword_table_to_model(self, kw: KeywordTable) -> Keyword:
@@ -1,6 +1,6 @@
-from datetime import datetime
-from sqlalchemy import Boolean, DateTime, Enum, Integer, String
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from datetime import date, datetime
+from sqlalchemy import BigInteger, Boolean, Column, Date, DateTime, Enum, Float, ForeignKey, Index, Integer, LargeBinary, String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from jdcrawler.models.job import JobSite
 
 class Base(DeclarativeBase):
@@ -18,6 +18,9 @@ class JobTable(Base):
     company: Mapped[str] = mapped_column(String(200), nullable=False)
     url: Mapped[str] = mapped_column(String(1000), unique=True, nullable=False)
     site: Mapped[str] = mapped_column(Enum(JobSite), nullable=False)
+    # Stable posting ID on the site (see jdcrawler.utils.canonical); url is the
+    # canonical link built from it. (site, external_id) is the lookup key.
+    external_id: Mapped[str | None] = mapped_column(String(1000), nullable=True)
     location: Mapped[str | None] = mapped_column(String(200), nullable=True)
     salary: Mapped[str | None] = mapped_column(String(200), nullable=True)
     experience: Mapped[str | None] = mapped_column(String(100), nullable=True)
@@ -26,13 +29,218 @@ class JobTable(Base):
     is_bookmarked: Mapped[bool] = mapped_column(Boolean, default=False)
     is_hidden: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    # Last crawl whose results listed this posting, and how many result pages did
+    last_seen_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
+    seen_count: Mapped[int] = mapped_column(Integer, default=1)
+    # Set once every keyword/site that listed the posting has missed it in
+    # consecutive runs (see DatabaseClient.finish_crawl_run); cleared when it shows up again
+    is_closed: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Parsed from experience / salary / deadline (see jdcrawler.utils.normalize);
+    # salaries are annual KRW
+    experience_min_years: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    experience_max_years: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    salary_min: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    salary_max: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    deadline_date: Mapped[date | None] = mapped_column(Date, nullable=True, index=True)
+    # Hierarchical region code of location (see jdcrawler.utils.regions):
+    # 2-digit 시/도 or 5-digit 시/군/구 starting with its 시/도 code
+    region_code: Mapped[str | None] = mapped_column(String(5), nullable=True, index=True)
 
     # AI Analysis fields
     description: Mapped[str | None] = mapped_column(String, nullable=True)
     description_image_url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    # Change detection for re-enrichment (see jdcrawler.services.enrichment):
+    # hashes of the normalized detail content and list card, when the detail
+    # page was last fetched, and its HTTP validators
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    card_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    details_fetched_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
+    etag: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(100), nullable=True)
     ai_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
     ai_summary: Mapped[str | None] = mapped_column(String(2000), nullable=True)
     ai_status: Mapped[str] = mapped_column(String(20), default="pending")
+    # Analysis queue: pending rows with a queued_at are picked up by the
+    # analysis worker once queued_at has passed (retries push it forward)
+    analysis_queued_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
+    analysis_attempts: Mapped[int] = mapped_column(Integer, default=0)
+    # When a worker flipped the row to 'analyzing'; claims older than the
+    # claim timeout are presumed abandoned by a dead worker
+    analysis_claimed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Compacted / original description tokens of the last LLM prompt
+    prompt_compression_ratio: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Profile version the rule-based ai_score was computed against
+    scored_profile_version: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    # Near-duplicate detection: MinHash signature of the description, and the
+    # id of the cluster's first job (NULL while the job has no duplicates)
+    minhash: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    cluster_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+
+    skill_rows: Mapped[list["JobSkillTable"]] = relationship(
+        cascade="all, delete-orphan", lazy="selectin"
+    )
+    keyword_rows: Mapped[list["JobKeywordTable"]] = relationship(
+        primaryjoin="JobTable.id == foreign(JobKeywordTable.job_id)", lazy="selectin", viewonly=True
+    )
+
+# Expired and vanished postings moved out of the hot jobs table by
+# jdcrawler.services.lifecycle: the same columns plus when and why
+job_archive_table = JobTable.__table__.to_metadata(Base.metadata, name="jobs_archive")
+job_archive_table.append_column(Column("archived_at", DateTime, nullable=True, index=True))
+job_archive_table.append_column(Column("archive_reason", String(20), nullable=True))
+
+# Declared after the archive copy, which keeps the same posting under a new id
+Index("ux_jobs_site_external_id", JobTable.site, JobTable.external_id, unique=True)
+
+class JobSkillTable(Base):
+    __tablename__ = "job_skills"
+    # (skill, job_id) serves skill filters; the primary key serves per-job lookups
+    __table_args__ = (Index("ix_job_skills_skill_job_id", "skill", "job_id"),)
+
+    job_id: Mapped[int] = mapped_column(ForeignKey("jobs.id"), primary_key=True)
+    # Canonical name from jdcrawler.services.skills.SKILL_DICTIONARY
+    skill: Mapped[str] = mapped_column(String(50), primary_key=True)
+
+class JobKeywordTable(Base):
+    __tablename__ = "job_keywords"
+    # The primary key serves per-job lookups, this one the per-(keyword, site) close check
+    __table_args__ = (Index("ix_job_keywords_scope", "keyword", "site", "last_seen_run"),)
+
+    # Which keyword searches on which site listed the job, and in which of
+    # that (keyword, site)'s runs it was last listed
+    job_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    keyword: Mapped[str] = mapped_column(String(100), primary_key=True)
+    site: Mapped[str] = mapped_column(String(20), primary_key=True)
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    last_seen_run: Mapped[int] = mapped_column(Integer, default=0)
+
+class CrawlScopeTable(Base):
+    __tablename__ = "crawl_scopes"
+
+    # Completed crawl runs per (keyword, site); runs that failed or came back
+    # empty are not counted, so a broken parser does not close every posting
+    keyword: Mapped[str] = mapped_column(String(100), primary_key=True)
+    site: Mapped[str] = mapped_column(String(20), primary_key=True)
+    completed_runs: Mapped[int] = mapped_column(Integer, default=0)
+    last_run_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Adaptive schedule (see services/crawl_schedule.py): postings newly listed
+    # by the last run, their moving average, and when to crawl next
+    new_postings: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    yield_ewma: Mapped[float | None] = mapped_column(Float, nullable=True)
+    interval_minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    next_run_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
+    schedule_reason: Mapped[str | None] = mapped_column(String(200), nullable=True)
+
+class CrawlLeaseTable(Base):
+    __tablename__ = "crawl_leases"
+
+    # Which process is crawling a (keyword, site) right now. The holder renews
+    # expires_at with heartbeats; an expired lease may be taken over, so a
+    # crashed process only blocks its units for one TTL
+    keyword: Mapped[str] = mapped_column(String(100), primary_key=True)
+    site: Mapped[str] = mapped_column(String(20), primary_key=True)
+    owner: Mapped[str] = mapped_column(String(100))
+    acquired_at: Mapped[datetime] = mapped_column(DateTime)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime)
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
+    # Last successful crawl under a lease; runs that started before it skip the unit
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+class BrowserStateTable(Base):
+    __tablename__ = "browser_states"
+
+    # Cookies and localStorage of the last healthy crawl per site (Playwright
+    # storage_state as JSON), loaded into new browser contexts until expires_at.
+    # Deleted when a block page is seen, so a flagged session is not reused
+    site: Mapped[str] = mapped_column(String(20), primary_key=True)
+    state: Mapped[str] = mapped_column(String)
+    saved_at: Mapped[datetime] = mapped_column(DateTime)
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class CrawlTaskTable(Base):
+    __tablename__ = "crawl_tasks"
+    # Claims look for the oldest queued tasks
+    __table_args__ = (Index("ix_crawl_tasks_state", "state", "id"),)
+
+    # Shared work queue of crawl workers (see services/work_queue.py): a
+    # (keyword, site) unit or a batch of detail pages, claimed by one worker
+    # until claimed_until; expired claims are handed out again
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    run_id: Mapped[str] = mapped_column(String(40), index=True)
+    kind: Mapped[str] = mapped_column(String(20))
+    site: Mapped[str] = mapped_column(String(20))
+    payload: Mapped[str] = mapped_column(String)
+    state: Mapped[str] = mapped_column(String(20), default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    worker: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    claimed_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    result: Mapped[str | None] = mapped_column(String, nullable=True)
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+class FrontierRunTable(Base):
+    __tablename__ = "frontier_runs"
+
+    # One crawl's persisted work list (see services/frontier.py); "running"
+    # until every unit is done, so an interrupted crawl can be resumed
+    id: Mapped[str] = mapped_column(String(12), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), default="running", index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+class FrontierUnitTable(Base):
+    __tablename__ = "frontier_units"
+
+    # State of each (keyword, site) of a frontier run: queued, in_flight,
+    # done, incomplete (detail pages left to retry), skipped (held by another
+    # process) or failed
+    run_id: Mapped[str] = mapped_column(String(12), primary_key=True)
+    keyword: Mapped[str] = mapped_column(String(100), primary_key=True)
+    site: Mapped[str] = mapped_column(String(20), primary_key=True)
+    state: Mapped[str] = mapped_column(String(20), default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+class FrontierUrlTable(Base):
+    __tablename__ = "frontier_urls"
+
+    # Detail pages of a frontier run by posting ID: queued when the listing is
+    # fetched, then done (with the saved job) or failed
+    run_id: Mapped[str] = mapped_column(String(12), primary_key=True)
+    site: Mapped[str] = mapped_column(String(20), primary_key=True)
+    external_id: Mapped[str] = mapped_column(String(1000), primary_key=True)
+    url: Mapped[str] = mapped_column(String(1000))
+    state: Mapped[str] = mapped_column(String(20), default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    job_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+class JobLshBandTable(Base):
+    __tablename__ = "job_lsh_bands"
+
+    # LSH banding index over JobTable.minhash; the primary key doubles as the
+    # (band, key) lookup index
+    band: Mapped[int] = mapped_column(Integer, primary_key=True)
+    key: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    job_id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+class AnalysisCacheTable(Base):
+    __tablename__ = "analysis_cache"
+
+    # sha256 of normalized job content + profile version + model name
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    profile_version: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    score: Mapped[int] = mapped_column(Integer, nullable=False)
+    summary: Mapped[str] = mapped_column(String, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    last_hit_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
 # --- User Database Tables ---
 class KeywordTable(UserBase):
@@ -51,6 +259,7 @@ class ProfileTable(UserBase):
     experience_years: Mapped[int] = mapped_column(Integer, default=0)
     interest_keywords: Mapped[str] = mapped_column(String(1000), default="[]")
     exclude_keywords: Mapped[str] = mapped_column(String(1000), default="[]")
+    version: Mapped[int] = mapped_column(Integer, default=1)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
 
 class NotificationTable(UserBase):
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 import os
 from dotenv import load_dotenv
@@ -18,6 +19,8 @@ from jdcrawler.api.notifications import router as notifications_router
 from jdcrawler.api.profile import router as profile_router
 from jdcrawler.db.client import DatabaseClient
 from jdcrawler.scheduler import scheduler, start_scheduler
+from jdcrawler.services.analysis_worker import AnalysisQueue, start_worker
+from jdcrawler.services.rescoring import RescoringService
 
 
 @asynccontextmanager
@@ -29,6 +32,16 @@ async def lifespan(app: FastAPI):
     db = DatabaseClient()
     db.create_tables()
     app.state.db = db
+
+    # Resume re-scoring interrupted by a restart (no-op when scores are current)
+    rescorer = RescoringService(db)
+    if rescorer.count_stale():
+        app.state.rescore_task = asyncio.create_task(asyncio.to_thread(rescorer.run))
+
+    # Resume the persistent analysis queue
+    analysis_queue = AnalysisQueue(db)
+    if analysis_queue.recover() or analysis_queue.stats()["queued"]:
+        start_worker(db)
     
     # Start Scheduler
     start_scheduler()
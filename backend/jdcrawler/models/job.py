@@ -20,16 +20,32 @@ class JobBase(BaseModel):
     experience: str | None = None
     posted_at: datetime | None = None
     deadline: str | None = None
+    # Structured values parsed from experience / salary / deadline
+    experience_min_years: int | None = None
+    experience_max_years: int | None = None
+    salary_min: int | None = None
+    salary_max: int | None = None
+    deadline_date: date | None = None
+    region_code: str | None = None
     # AI Analysis
     description: str | None = None
     description_image_url: str | None = None
     ai_score: int | None = None
     ai_summary: str | None = None
     ai_status: str = "pending"
+    prompt_compression_ratio: float | None = None
+    # Canonical skill names extracted from the title and description
+    skills: list[str] = []
 
 
 class JobCreate(JobBase):
-    pass
+    scored_profile_version: int | None = None
+    # Set by the crawler for change detection on later crawls
+    content_hash: str | None = None
+    card_hash: str | None = None
+    details_fetched_at: datetime | None = None
+    etag: str | None = None
+    last_modified: str | None = None
 
 
 class Job(JobBase):
@@ -37,7 +53,25 @@ class Job(JobBase):
     is_bookmarked: bool = False
     is_hidden: bool = False
     created_at: datetime
+    # Search keywords whose results listed the job
+    keywords: list[str] = []
+    last_seen_at: datetime | None = None
+    seen_count: int = 1
+    is_closed: bool = False
+    closed_at: datetime | None = None
+    cluster_id: int | None = None
 
 
 class JobResponse(Job):
     pass
+
+
+class ArchivedJob(Job):
+    archived_at: datetime | None = None
+    # "expired", "vanished" or "capacity"
+    archive_reason: str | None = None
+
+
+class SimilarJob(BaseModel):
+    job: Job
+    similarity: float
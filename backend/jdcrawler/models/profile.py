@@ -12,6 +12,7 @@ class UserProfile(BaseModel):
     experience_years: int = 0
     interest_keywords: List[str] = Field(default_factory=list)
     exclude_keywords: List[str] = Field(default_factory=list)
+    version: int = 1
     updated_at: datetime | None = None
 
 class UserProfileUpdate(BaseModel):
@@ -2,36 +2,91 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from jdcrawler.db.client import DatabaseClient
+from jdcrawler.services import crawl_runs
+from jdcrawler.services.crawl_schedule import CrawlSchedule
+from jdcrawler.services.crawl_worker import dispatch_refresh
 from jdcrawler.services.crawler import CrawlerService
+from jdcrawler.services.frontier import CrawlFrontier
+from jdcrawler.services.lifecycle import LifecycleService
 
 scheduler = AsyncIOScheduler()
 
 
+import asyncio
 import os
 
 async def run_crawl_job():
-    print("Starting scheduled crawl...")
     db = DatabaseClient()
     try:
-        service = CrawlerService(db)
         # Use HEADLESS env var, default to True
         headless = os.getenv("HEADLESS", "true").lower() == "true"
-        await service.crawl_all_active_keywords(headless=headless)
+        if CrawlFrontier.resumable(db) is not None:
+            # A crawl was interrupted (crash, deploy): finish it before new work
+            print("Resuming interrupted crawl...")
+            run = crawl_runs.runs.submit(db, headless=headless, resume=True)
+        else:
+            units = CrawlSchedule(db).due_units(list(CrawlerService(db).crawlers))
+            if not units:
+                return
+            print(f"Starting scheduled crawl of {len(units)} due keyword/site units...")
+            # Submitted like API crawls, so scheduled runs show up under /api/crawl/runs
+            run = crawl_runs.runs.submit(db, headless=headless, units=units)
+        await crawl_runs.runs.wait(run.id)
+        print("Scheduled crawl finished.")
     except Exception as e:
         print(f"Scheduled crawl failed: {e}")
     finally:
         db.close()
-    print("Scheduled crawl finished.")
+
+
+async def run_refresh_job():
+    db = DatabaseClient()
+    try:
+        if crawl_runs.runs.execution == "queue":
+            # Detail pages are revisited by the crawl workers too
+            print(f"Queued {dispatch_refresh(db)} postings for a detail revisit")
+            return
+        headless = os.getenv("HEADLESS", "true").lower() == "true"
+        await CrawlerService(db).refresh_details(headless=headless)
+    except Exception as e:
+        print(f"Scheduled re-enrichment failed: {e}")
+    finally:
+        db.close()
+
+
+async def run_sweep_job():
+    db = DatabaseClient()
+    try:
+        await asyncio.to_thread(LifecycleService(db).sweep)
+    except Exception as e:
+        print(f"Scheduled lifecycle sweep failed: {e}")
+    finally:
+        db.close()
 
 
 def start_scheduler():
     if not scheduler.running:
-        # Run every 4 hours
+        # Crawl the keyword/site units that are due; each unit's interval
+        # adapts to how many new postings it yields (see CrawlSchedule)
         scheduler.add_job(
             run_crawl_job,
-            IntervalTrigger(hours=4),
+            IntervalTrigger(minutes=int(os.getenv("CRAWL_SCHEDULER_TICK_MINUTES", "15"))),
             id="crawl_all",
             replace_existing=True,
         )
+        # Revisit detail pages that are due for a change check
+        scheduler.add_job(
+            run_refresh_job,
+            IntervalTrigger(hours=6),
+            id="refresh_details",
+            replace_existing=True,
+        )
+        # Archive expired / vanished postings once a day
+        scheduler.add_job(
+            run_sweep_job,
+            IntervalTrigger(hours=24),
+            id="lifecycle_sweep",
+            replace_existing=True,
+        )
         scheduler.start()
-        print("Scheduler started. Crawling every 4 hours.")
+        print("Scheduler started. Crawling due keyword/site units on every tick.")
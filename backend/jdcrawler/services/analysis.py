@@ -1,23 +1,65 @@
+import asyncio
 import json
 import os
 from zai import ZaiClient
 from jdcrawler.models.job import Job
 from jdcrawler.models.profile import UserProfile
+from jdcrawler.services.analysis_cache import AnalysisCache
+from jdcrawler.services.compaction import compact_description, estimate_tokens
+
+# glm-4.7-flash is often free/cheap and bypasses "Coding Plan" restrictions
+DEFAULT_MODEL = "glm-4.7-flash"
+
+SYSTEM_PROMPT = "You are a professional technical recruiter and career advisor. Analyze job postings against a candidate's profile and return a JSON object with 'score' (0-100) and 'summary' (3-4 concise bullet points in Korean)."
+
 
 class AnalysisService:
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        model: str | None = None,
+        timeout: float | None = None,
+        max_retries: int = 3,
+        cache: AnalysisCache | None = None,
+        max_description_tokens: int | None = None,
+    ):
+        self.cache = cache
+        self.max_description_tokens = max_description_tokens
         self.api_key = api_key or os.getenv("ZHIPU_API_KEY")
+        self.model = model or os.getenv("ANALYSIS_MODEL", DEFAULT_MODEL)
+        self.timeout = timeout or float(os.getenv("ANALYSIS_TIMEOUT", "60"))
         if not self.api_key:
             print("Warning: ZHIPU_API_KEY not found. AI analysis will be disabled.")
             self.client = None
         else:
-            self.client = ZaiClient(api_key=self.api_key)
+            self.client = ZaiClient(
+                api_key=self.api_key,
+                # ZHIPU_BASE_URL lets tests and local setups point at an OpenAI-compatible mock server
+                base_url=base_url or os.getenv("ZHIPU_BASE_URL") or None,
+                timeout=self.timeout,
+                max_retries=max_retries,
+            )
 
-    async def analyze_job_suitability(self, job: Job, profile: UserProfile) -> dict:
+    def get_cached(self, job: Job, profile: UserProfile) -> dict | None:
+        if not self.cache:
+            return None
+        return self.cache.get(self.cache.make_key(job, profile, self.model))
+
+    async def analyze_job_suitability(
+        self, job: Job, profile: UserProfile, check_cache: bool = True
+    ) -> dict:
         """
         Analyze how well a job matches the user's profile using GLM-4-Flash.
         GLM-4-Flash often has a free tier or different quota limits.
+        Results are served from / stored in the cache when one is configured;
+        pass check_cache=False if get_cached() was already consulted.
         """
+        if check_cache:
+            cached = self.get_cached(job, profile)
+            if cached:
+                return cached
+
         if not self.client:
             return {
                 "score": 0,
@@ -25,49 +67,74 @@ class AnalysisService:
                 "status": "failed"
             }
 
-        prompt = self._build_analysis_prompt(job, profile)
+        compaction = self._compact(job)
+        prompt = self._build_analysis_prompt(job, profile, compaction["text"] if compaction else None)
 
         try:
-            # Using glm-4-flash which is often free/cheap and bypasses "Coding Plan" restrictions
-            response = self.client.chat.completions.create(
-                model="glm-4.7-flash",
-                messages=[
-                    {"role": "system", "content": "You are a professional technical recruiter and career advisor. Analyze job postings against a candidate's profile and return a JSON object with 'score' (0-100) and 'summary' (3-4 concise bullet points in Korean)."},
-                    {"role": "user", "content": prompt}
-                ],
-                # 'thinking' might not be supported on Flash, so we remove it for compatibility
+            # The SDK client is synchronous; run it in a worker thread so the
+            # event loop keeps serving requests during the LLM round trip
+            response = await asyncio.wait_for(
+                asyncio.to_thread(
+                    self.client.chat.completions.create,
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    # 'thinking' might not be supported on Flash, so we remove it for compatibility
+                ),
+                timeout=self.timeout,
             )
 
-            result_content = response.choices[0].message.content
-            
-            # Clean up potential markdown formatting
-            if "```json" in result_content:
-                result_content = result_content.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_content:
-                result_content = result_content.split("```")[1].split("```")[0].strip()
-            
-            # Ensure we only have the JSON part if there's trailing text
-            start_idx = result_content.find("{")
-            end_idx = result_content.rfind("}")
-            if start_idx != -1 and end_idx != -1:
-                result_content = result_content[start_idx:end_idx+1]
-
-            result = json.loads(result_content)
-            
-            return {
+            result = self._parse_response(response.choices[0].message.content)
+            usage = getattr(response, "usage", None)
+            analysis = {
                 "score": result.get("score", 0),
                 "summary": result.get("summary", ""),
-                "status": "completed"
+                "status": "completed",
+                "tokens": usage.total_tokens if usage else estimate_tokens(prompt),
+                "compression_ratio": compaction["ratio"] if compaction else None,
             }
+            if self.cache:
+                key = self.cache.make_key(job, profile, self.model)
+                self.cache.put(key, self.model, profile.version, analysis)
+            return analysis
         except Exception as e:
-            print(f"AI Analysis Error: {e}")
+            print(f"AI Analysis Error: {e!r}")
             return {
                 "score": 0,
-                "summary": f"Analysis failed: {str(e)}",
+                "summary": f"Analysis failed: {str(e) or type(e).__name__}",
                 "status": "failed"
             }
 
-    def _build_analysis_prompt(self, job: Job, profile: UserProfile) -> str:
+    def _parse_response(self, result_content: str) -> dict:
+        # Clean up potential markdown formatting
+        if "```json" in result_content:
+            result_content = result_content.split("```json")[1].split("```")[0].strip()
+        elif "```" in result_content:
+            result_content = result_content.split("```")[1].split("```")[0].strip()
+        
+        # Ensure we only have the JSON part if there's trailing text
+        start_idx = result_content.find("{")
+        end_idx = result_content.rfind("}")
+        if start_idx != -1 and end_idx != -1:
+            result_content = result_content[start_idx:end_idx+1]
+
+        return json.loads(result_content)
+
+    def _compact(self, job: Job) -> dict | None:
+        if not job.description:
+            return None
+        return compact_description(job.description, self.max_description_tokens)
+
+    def build_prompt(self, job: Job, profile: UserProfile) -> str:
+        """The prompt exactly as it would be sent, with the description compacted."""
+        compaction = self._compact(job)
+        return self._build_analysis_prompt(job, profile, compaction["text"] if compaction else None)
+
+    def _build_analysis_prompt(
+        self, job: Job, profile: UserProfile, description: str | None = None
+    ) -> str:
         # Build a detailed tech stack description including levels
         tech_details = []
         for skill in profile.tech_stack:
@@ -92,7 +159,7 @@ Job Details:
 - Title: {job.title}
 - Company: {job.company}
 - Experience Required: {job.experience}
-- Description: {job.description or "No detailed description available."}
+- Description: {description or job.description or "No detailed description available."}
 
 Task:
 You are a Senior Career Consultant. Analyze the fit between the candidate and this job posting with depth and insight.
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import re
+from datetime import datetime
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import AnalysisCacheTable
+from jdcrawler.models.job import Job
+from jdcrawler.models.profile import UserProfile
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Process-wide hit/miss counters (AnalysisCache instances are created per request)
+metrics = {"hits": 0, "misses": 0}
+
+
+def normalize_text(text: str | None) -> str:
+    return _WHITESPACE.sub(" ", text or "").strip().lower()
+
+
+class AnalysisCache:
+    """
+    Persistent cache of LLM analysis results.
+
+    The key covers everything the prompt depends on: the normalized title,
+    experience and description of the job, the profile version and the model
+    name. Company and site are deliberately left out so identical postings
+    cross-listed on Saramin, JobKorea and Wanted share one analysis.
+    """
+
+    def __init__(self, db: DatabaseClient):
+        self.db = db
+
+    @staticmethod
+    def make_key(job: Job, profile: UserProfile, model: str) -> str:
+        payload = json.dumps(
+            [
+                model,
+                profile.version,
+                normalize_text(job.title),
+                normalize_text(job.experience),
+                normalize_text(job.description),
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        with Session(self.db.jobs_engine) as session:
+            entry = session.get(AnalysisCacheTable, key)
+            if entry is None:
+                metrics["misses"] += 1
+                return None
+            entry.hit_count += 1
+            entry.last_hit_at = datetime.now()
+            result = {"score": entry.score, "summary": entry.summary}
+            session.commit()
+        metrics["hits"] += 1
+        return {**result, "status": "completed", "tokens": 0, "cached": True}
+
+    def put(self, key: str, model: str, profile_version: int, result: dict) -> None:
+        with Session(self.db.jobs_engine) as session:
+            session.merge(
+                AnalysisCacheTable(
+                    key=key,
+                    model=model,
+                    profile_version=profile_version,
+                    score=result["score"],
+                    summary=result["summary"],
+                    hit_count=0,
+                    created_at=datetime.now(),
+                )
+            )
+            session.commit()
+
+    def invalidate(self, profile_version: int | None = None, stale_only: bool = False) -> int:
+        """
+        Delete cached results: all of them, those of one profile version, or
+        (stale_only) those computed for any profile version but the current one.
+        """
+        stmt = delete(AnalysisCacheTable)
+        if profile_version is not None:
+            stmt = stmt.where(AnalysisCacheTable.profile_version == profile_version)
+        elif stale_only:
+            current = self.db.get_profile_snapshot().version
+            stmt = stmt.where(AnalysisCacheTable.profile_version != current)
+        with Session(self.db.jobs_engine) as session:
+            result = session.execute(stmt)
+            session.commit()
+            return result.rowcount
+
+    def stats(self) -> dict:
+        with Session(self.db.jobs_engine) as session:
+            entries, stored_hits = session.execute(
+                select(func.count(AnalysisCacheTable.key), func.coalesce(func.sum(AnalysisCacheTable.hit_count), 0))
+            ).one()
+        lookups = metrics["hits"] + metrics["misses"]
+        return {
+            "entries": entries,
+            "total_hits": stored_hits,
+            "hits": metrics["hits"],
+            "misses": metrics["misses"],
+            "hit_rate": round(metrics["hits"] / lookups, 3) if lookups else 0.0,
+        }
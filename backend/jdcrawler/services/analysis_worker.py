@@ -0,0 +1,319 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobTable
+from jdcrawler.models.job import Job
+from jdcrawler.models.profile import UserProfile
+from jdcrawler.services.analysis import AnalysisService, estimate_tokens
+from jdcrawler.services.analysis_cache import AnalysisCache
+from jdcrawler.utils.rate_limiter import TokenBucket
+
+
+class AnalysisQueue:
+    """
+    Persistent LLM analysis queue stored on the jobs table itself.
+
+    A job is queued when ai_status='pending' and analysis_queued_at is set.
+    Workers claim jobs by flipping ai_status to 'analyzing' with a conditional
+    UPDATE, so several workers (or processes) never analyze the same job.
+    A claim records analysis_claimed_at and is only recovered by another
+    worker once it is older than claim_timeout seconds.
+    Jobs are claimed in order of their rule-based ai_score, best matches first.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseClient,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+        claim_timeout: float | None = None,
+    ):
+        self.db = db
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        if claim_timeout is None:
+            claim_timeout = float(os.getenv("ANALYSIS_CLAIM_TIMEOUT_SECONDS", "600"))
+        self.claim_timeout = claim_timeout
+
+    def enqueue(
+        self,
+        job_ids: list[int] | None = None,
+        min_score: int | None = None,
+        limit: int | None = None,
+    ) -> int:
+        """
+        Queue jobs for analysis. Explicit job_ids are (re-)queued regardless of
+        their previous result; otherwise unanalyzed pending jobs with a rule-based
+        score of at least min_score are queued, best scores first. Near-duplicates
+        are skipped in that case: only the first job of each cluster is analyzed.
+        """
+        conditions = [
+            JobTable.description.is_not(None),
+            JobTable.ai_status != "analyzing",
+        ]
+        if job_ids is not None:
+            conditions.append(JobTable.id.in_(job_ids))
+        else:
+            conditions += [
+                JobTable.ai_status == "pending",
+                JobTable.analysis_queued_at.is_(None),
+                or_(JobTable.cluster_id.is_(None), JobTable.cluster_id == JobTable.id),
+            ]
+            if min_score is not None:
+                conditions.append(JobTable.ai_score >= min_score)
+
+        with Session(self.db.jobs_engine) as session:
+            ids_query = select(JobTable.id).where(*conditions).order_by(JobTable.ai_score.desc())
+            if limit is not None:
+                ids_query = ids_query.limit(limit)
+            ids = session.execute(ids_query).scalars().all()
+            if not ids:
+                return 0
+            session.execute(
+                update(JobTable)
+                .where(JobTable.id.in_(ids))
+                .values(ai_status="pending", analysis_queued_at=datetime.now(), analysis_attempts=0)
+            )
+            session.commit()
+        return len(ids)
+
+    def claim(self) -> JobTable | None:
+        now = datetime.now()
+        with Session(self.db.jobs_engine, expire_on_commit=False) as session:
+            # A few candidates in priority order; another worker may win the race for some
+            candidates = session.execute(
+                select(JobTable.id)
+                .where(
+                    JobTable.ai_status == "pending",
+                    JobTable.analysis_queued_at.is_not(None),
+                    JobTable.analysis_queued_at <= now,
+                )
+                .order_by(JobTable.ai_score.desc(), JobTable.analysis_queued_at)
+                .limit(5)
+            ).scalars().all()
+            for job_id in candidates:
+                claimed = session.execute(
+                    update(JobTable)
+                    .where(JobTable.id == job_id, JobTable.ai_status == "pending")
+                    .values(
+                        ai_status="analyzing",
+                        analysis_claimed_at=datetime.now(),
+                        analysis_attempts=JobTable.analysis_attempts + 1,
+                    )
+                )
+                session.commit()
+                if claimed.rowcount == 1:
+                    return session.get(JobTable, job_id)
+        return None
+
+    def complete(self, job_id: int, result: dict) -> None:
+        values = {
+            "ai_score": result["score"],
+            "ai_summary": result["summary"],
+            "ai_status": "completed",
+            "analysis_queued_at": None,
+            "analysis_claimed_at": None,
+        }
+        if result.get("compression_ratio") is not None:
+            values["prompt_compression_ratio"] = result["compression_ratio"]
+        with Session(self.db.jobs_engine) as session:
+            session.execute(update(JobTable).where(JobTable.id == job_id).values(**values))
+            # Near-duplicates of the job waiting for analysis share its result
+            cluster_id = session.execute(
+                select(JobTable.cluster_id).where(JobTable.id == job_id)
+            ).scalar_one_or_none()
+            if cluster_id is not None:
+                session.execute(
+                    update(JobTable)
+                    .where(
+                        JobTable.cluster_id == cluster_id,
+                        JobTable.id != job_id,
+                        JobTable.ai_status == "pending",
+                    )
+                    .values(**values)
+                )
+            session.commit()
+
+    def fail(self, job_id: int, attempts: int, summary: str) -> None:
+        """Requeue with exponential backoff, or give up after max_attempts."""
+        if attempts < self.max_attempts:
+            values = {
+                "ai_status": "pending",
+                "analysis_queued_at": datetime.now()
+                + timedelta(seconds=self.retry_delay * (2 ** (attempts - 1))),
+                "analysis_claimed_at": None,
+            }
+        else:
+            values = {
+                "ai_status": "failed",
+                "ai_summary": summary,
+                "analysis_queued_at": None,
+                "analysis_claimed_at": None,
+            }
+        with Session(self.db.jobs_engine) as session:
+            session.execute(update(JobTable).where(JobTable.id == job_id).values(**values))
+            session.commit()
+
+    def next_ready_at(self) -> datetime | None:
+        """When the earliest queued job (e.g. a retry in backoff) becomes claimable."""
+        with Session(self.db.jobs_engine) as session:
+            return session.execute(
+                select(func.min(JobTable.analysis_queued_at)).where(
+                    JobTable.ai_status == "pending", JobTable.analysis_queued_at.is_not(None)
+                )
+            ).scalar_one()
+
+    def recover(self) -> int:
+        """
+        Requeue jobs left in 'analyzing' by a worker that died mid-request:
+        claims older than claim_timeout (or made before claims were timed).
+        Fresh claims belong to a live worker, possibly in another process.
+        """
+        now = datetime.now()
+        with Session(self.db.jobs_engine) as session:
+            result = session.execute(
+                update(JobTable)
+                .where(
+                    JobTable.ai_status == "analyzing",
+                    or_(
+                        JobTable.analysis_claimed_at.is_(None),
+                        JobTable.analysis_claimed_at < now - timedelta(seconds=self.claim_timeout),
+                    ),
+                )
+                .values(ai_status="pending", analysis_queued_at=now, analysis_claimed_at=None)
+            )
+            session.commit()
+            return result.rowcount
+
+    def stats(self) -> dict[str, int]:
+        with Session(self.db.jobs_engine) as session:
+            queued = session.execute(
+                select(func.count(JobTable.id)).where(
+                    JobTable.ai_status == "pending", JobTable.analysis_queued_at.is_not(None)
+                )
+            ).scalar_one()
+            analyzing = session.execute(
+                select(func.count(JobTable.id)).where(JobTable.ai_status == "analyzing")
+            ).scalar_one()
+        return {"queued": queued, "analyzing": analyzing}
+
+
+class AnalysisWorker:
+    """
+    Drains the AnalysisQueue with `concurrency` worker tasks, under a
+    request-per-minute and (optional) token-per-minute budget.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseClient,
+        analysis_service: AnalysisService | None = None,
+        concurrency: int | None = None,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_attempts: int | None = None,
+        retry_delay: float = 30.0,
+    ):
+        self.db = db
+        # Retries are handled by the queue, not inside the SDK client
+        self.analysis_service = analysis_service or AnalysisService(
+            max_retries=0, cache=AnalysisCache(db)
+        )
+        self.concurrency = concurrency or int(os.getenv("ANALYSIS_CONCURRENCY", "4"))
+        self.queue = AnalysisQueue(
+            db,
+            max_attempts=max_attempts or int(os.getenv("ANALYSIS_MAX_ATTEMPTS", "3")),
+            retry_delay=retry_delay,
+        )
+
+        rpm = requests_per_minute or float(os.getenv("REQUESTS_PER_MINUTE", "10"))
+        self.request_bucket = TokenBucket(rate=rpm / 60, capacity=max(1.0, rpm / 6))
+        tpm = tokens_per_minute or float(os.getenv("ANALYSIS_TOKENS_PER_MINUTE", "0"))
+        self.token_bucket = TokenBucket(rate=tpm / 60, capacity=tpm) if tpm else None
+
+        self.processed = 0
+        self.failed = 0
+        self._stopping = False
+        self._tasks_running = 0
+
+    @property
+    def running(self) -> bool:
+        return self._tasks_running > 0
+
+    def stop(self) -> None:
+        """Let in-flight analyses finish, but claim nothing new."""
+        self._stopping = True
+
+    async def run_until_empty(self) -> None:
+        if not self.analysis_service.client:
+            print("Analysis worker not started: AI analysis is disabled.")
+            return
+        self.queue.recover()
+        profile = self.db.get_profile_snapshot()
+        await asyncio.gather(*(self._work(profile) for _ in range(self.concurrency)))
+
+    async def _work(self, profile: UserProfile) -> None:
+        self._tasks_running += 1
+        try:
+            while not self._stopping:
+                job_row = self.queue.claim()
+                if job_row is None:
+                    ready_at = self.queue.next_ready_at()
+                    if ready_at is None:
+                        return
+                    # Only retries in backoff are left; wait for the earliest one
+                    await asyncio.sleep(max(0.1, (ready_at - datetime.now()).total_seconds()))
+                    continue
+                await self._analyze(job_row, profile)
+        finally:
+            self._tasks_running -= 1
+
+    async def _analyze(self, job_row: JobTable, profile: UserProfile) -> None:
+        job = Job.model_validate(job_row, from_attributes=True)
+        # Cache hits cost nothing, so they bypass the request and token budgets
+        cached = self.analysis_service.get_cached(job, profile)
+        if cached:
+            self.queue.complete(job_row.id, cached)
+            self.processed += 1
+            return
+
+        await self.request_bucket.acquire()
+        estimated = 0
+        if self.token_bucket:
+            estimated = estimate_tokens(self.analysis_service.build_prompt(job, profile))
+            await self.token_bucket.acquire(estimated)
+
+        result = await self.analysis_service.analyze_job_suitability(job, profile, check_cache=False)
+
+        if self.token_bucket and "tokens" in result:
+            self.token_bucket.consume(result["tokens"] - estimated)
+
+        if result["status"] == "completed":
+            self.queue.complete(job_row.id, result)
+            self.processed += 1
+        else:
+            self.queue.fail(job_row.id, job_row.analysis_attempts, result["summary"])
+            self.failed += 1
+
+
+# One worker per process, started on demand by the API and on app startup
+_worker: AnalysisWorker | None = None
+_worker_task: asyncio.Task | None = None
+
+
+def start_worker(db: DatabaseClient) -> AnalysisWorker:
+    """Start draining the queue unless a worker is already running."""
+    global _worker, _worker_task
+    if _worker is None or _worker_task is None or _worker_task.done():
+        _worker = AnalysisWorker(db)
+        _worker_task = asyncio.create_task(_worker.run_until_empty())
+    return _worker
+
+
+def get_worker() -> AnalysisWorker | None:
+    return _worker
@@ -0,0 +1,127 @@
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobSkillTable, JobTable
+from jdcrawler.services.skills import SkillExtractor, skill_extractor
+from jdcrawler.utils.normalize import structured_fields
+
+
+def backfill_skills(
+    db: DatabaseClient, extractor: SkillExtractor | None = None, chunk_size: int = 1000
+) -> int:
+    """
+    (Re-)extract skills for every stored job, e.g. after the skill dictionary
+    changed. Jobs are processed in primary-key chunks; each chunk replaces its
+    job_skills rows in one transaction. Returns the number of jobs processed.
+    """
+    extractor = extractor or skill_extractor
+    processed = 0
+    last_id = 0
+    while True:
+        with Session(db.jobs_engine) as session:
+            rows = session.execute(
+                select(JobTable.id, JobTable.title, JobTable.description)
+                .where(JobTable.id > last_id)
+                .order_by(JobTable.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                return processed
+
+            job_ids = [row.id for row in rows]
+            params = [
+                {"job_id": job_id, "skill": skill}
+                for job_id, title, description in rows
+                for skill in extractor.extract(title, description)
+            ]
+            session.execute(delete(JobSkillTable).where(JobSkillTable.job_id.in_(job_ids)))
+            if params:
+                session.execute(insert(JobSkillTable), params)
+            session.commit()
+
+        last_id = job_ids[-1]
+        processed += len(rows)
+        print(f"Backfilled skills for {processed} jobs (last id {last_id})")
+
+
+def backfill_structured_fields(db: DatabaseClient, chunk_size: int = 1000) -> int:
+    """
+    Re-parse experience / salary / deadline / location of every stored job into the
+    structured columns, e.g. after the parsers changed. Deadlines without a
+    year are resolved against each job's created_at. Returns the number of
+    jobs processed.
+    """
+    table = JobTable.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            experience_min_years=bindparam("experience_min_years"),
+            experience_max_years=bindparam("experience_max_years"),
+            salary_min=bindparam("salary_min"),
+            salary_max=bindparam("salary_max"),
+            deadline_date=bindparam("deadline_date"),
+            region_code=bindparam("region_code"),
+        )
+    )
+    processed = 0
+    last_id = 0
+    while True:
+        with Session(db.jobs_engine) as session:
+            rows = session.execute(
+                select(
+                    JobTable.id,
+                    JobTable.experience,
+                    JobTable.salary,
+                    JobTable.deadline,
+                    JobTable.created_at,
+                    JobTable.location,
+                )
+                .where(JobTable.id > last_id)
+                .order_by(JobTable.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                return processed
+            params = [
+                {"b_id": job_id, **structured_fields(experience, salary, deadline, created_at, location)}
+                for job_id, experience, salary, deadline, created_at, location in rows
+            ]
+            session.execute(stmt, params)
+            session.commit()
+
+        last_id = rows[-1].id
+        processed += len(rows)
+        print(f"Backfilled structured fields for {processed} jobs (last id {last_id})")
+
+
+def backfill_clusters(db: DatabaseClient, chunk_size: int = 1000) -> int:
+    """
+    Compute MinHash signatures and near-duplicate clusters for jobs stored
+    before clustering existed (minhash is NULL). Jobs are clustered in id
+    order, then every touched cluster is pointed at its oldest member, as for
+    postings clustered on arrival. Returns the number of jobs processed.
+    """
+    session = db.jobs_session
+    processed = 0
+    last_id = 0
+    while True:
+        jobs = session.execute(
+            select(JobTable)
+            .where(JobTable.id > last_id, JobTable.minhash.is_(None), JobTable.description.is_not(None))
+            .order_by(JobTable.id)
+            .limit(chunk_size)
+        ).scalars().all()
+        if not jobs:
+            return processed
+        for job in jobs:
+            db.assign_cluster(job)
+            # The next job's band lookup must see this one's bands
+            session.flush()
+        db.reassign_cluster_heads(session, {job.cluster_id for job in jobs if job.cluster_id is not None})
+        session.commit()
+
+        last_id = jobs[-1].id
+        processed += len(jobs)
+        print(f"Backfilled near-duplicate clusters for {processed} jobs (last id {last_id})")
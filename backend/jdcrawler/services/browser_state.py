@@ -0,0 +1,36 @@
+import os
+from datetime import datetime, timedelta
+
+from jdcrawler.db.client import DatabaseClient
+
+
+class BrowserStates:
+    """
+    Per-site browser sessions carried from one crawl to the next. A crawl
+    that saw no block page saves its storage_state (cookies, localStorage)
+    and the next crawler of the site starts with it, skipping first-visit
+    redirects and consent banners. Saved states expire after ttl and are
+    dropped as soon as a crawl detects a block, so a flagged session is
+    never reused.
+    """
+
+    def __init__(self, db: DatabaseClient, ttl: timedelta | None = None):
+        self.db = db
+        self.ttl = ttl or timedelta(hours=int(os.getenv("CRAWL_STORAGE_STATE_TTL_HOURS", "24")))
+
+    def load(self, site: str) -> dict | None:
+        return self.db.get_browser_state(site)
+
+    async def save(self, site: str, crawler) -> None:
+        """Keep the crawler's session, unless it was blocked (then drop the saved one)."""
+        if getattr(crawler, "blocked", False):
+            self.invalidate(site)
+            return
+        if not hasattr(crawler, "current_storage_state"):
+            return
+        state = await crawler.current_storage_state()
+        self.db.save_browser_state(site, state, datetime.now() + self.ttl)
+
+    def invalidate(self, site: str) -> None:
+        if self.db.invalidate_browser_state(site):
+            print(f"Dropped saved {site} browser session after a block")
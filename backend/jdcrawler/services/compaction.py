@@ -0,0 +1,121 @@
+import os
+import re
+
+# Section headers whose content matters for fit analysis
+KEEP_SECTIONS = [
+    "자격요건", "자격 요건", "지원자격", "지원 자격", "필수", "요구사항", "요구 사항",
+    "우대사항", "우대 사항", "우대조건", "우대", "주요업무", "주요 업무", "담당업무",
+    "담당 업무", "업무내용", "업무 내용", "모집부문", "기술스택", "기술 스택", "사용기술",
+    "requirements", "qualifications", "preferred", "responsibilities", "what you'll do",
+    "tech stack",
+]
+# Section headers for boilerplate that rarely changes the assessment
+DROP_SECTIONS = [
+    "복리후생", "복지", "혜택", "회사소개", "회사 소개", "기업소개", "기업 소개", "연혁",
+    "채용절차", "채용 절차", "전형절차", "전형 절차", "접수방법", "접수 방법", "제출서류",
+    "제출 서류", "유의사항", "유의 사항", "기타사항", "기타 사항", "개인정보", "근무조건",
+    "근무 조건", "근무환경", "benefits", "perks", "about us", "hiring process",
+]
+# Lines that are boilerplate wherever they appear
+BOILERPLATE_LINES = re.compile(
+    r"개인정보|허위\s*사실|채용\s*시\s*마감|입사지원서|이력서\s*양식|국가보훈|장애인\s*우대|"
+    r"공고\s*문의|문의\s*사항|홈페이지\s*참조|copyright",
+    re.IGNORECASE,
+)
+_HEADER_DECORATION = re.compile(r"^[\s\[\]【】<>()■□●○◆◇▶▷►•·\-*#:|0-9.]+|[\s\[\]【】<>()■□●○◆◇▶▷►•·\-*#:|]+$")
+MAX_HEADER_LENGTH = 30
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token estimate used for budgeting before the real usage is known.
+    Korean text tokenizes at roughly 2 characters per token.
+    """
+    return len(text) // 2 + 1
+
+
+def _classify_header(line: str) -> str | None:
+    """Return 'keep' / 'drop' if the line looks like a section header."""
+    stripped = _HEADER_DECORATION.sub("", line).lower()
+    if not stripped or len(stripped) > MAX_HEADER_LENGTH:
+        return None
+    for header in KEEP_SECTIONS:
+        if stripped.startswith(header):
+            return "keep"
+    for header in DROP_SECTIONS:
+        if stripped.startswith(header):
+            return "drop"
+    return None
+
+
+def segment_description(description: str) -> list[tuple[str, list[str]]]:
+    """
+    Split a description into (kind, lines) sections, where kind is 'keep',
+    'drop' or 'other' (text before the first recognized header).
+    """
+    sections: list[tuple[str, list[str]]] = [("other", [])]
+    for raw_line in description.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        kind = _classify_header(line)
+        if kind:
+            sections.append((kind, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(kind, lines) for kind, lines in sections if lines]
+
+
+def compact_description(description: str, max_tokens: int | None = None) -> dict:
+    """
+    Compact a job description for the LLM prompt.
+
+    Requirement, qualification, responsibility and preferred sections are kept,
+    boilerplate sections and lines are dropped, and the result is cut at line
+    boundaries to fit the token budget (ANALYSIS_MAX_DESCRIPTION_TOKENS).
+    Returns a dict with 'text', 'original_tokens', 'compacted_tokens' and 'ratio'
+    (compacted / original).
+    """
+    if max_tokens is None:
+        max_tokens = int(os.getenv("ANALYSIS_MAX_DESCRIPTION_TOKENS", "1500"))
+
+    original_tokens = estimate_tokens(description)
+    sections = segment_description(description)
+
+    indexed = list(enumerate(sections))
+    if any(kind == "keep" for kind, _ in sections):
+        # Unlabelled intro text is kept only as a lower priority filler
+        prioritized = [s for s in indexed if s[1][0] == "keep"] + [
+            s for s in indexed if s[1][0] == "other"
+        ]
+    else:
+        # Unstructured posting: everything except explicit boilerplate sections
+        prioritized = [s for s in indexed if s[1][0] != "drop"]
+
+    selected: set[tuple[int, int]] = set()
+    budget = max_tokens
+    for section_idx, (_, lines) in prioritized:
+        for line_idx, line in enumerate(lines):
+            if BOILERPLATE_LINES.search(line):
+                continue
+            cost = estimate_tokens(line)
+            if cost > budget:
+                break
+            budget -= cost
+            selected.add((section_idx, line_idx))
+
+    # Preserve the original order of the surviving lines
+    kept_lines = [
+        line
+        for section_idx, (_, lines) in enumerate(sections)
+        for line_idx, line in enumerate(lines)
+        if (section_idx, line_idx) in selected
+    ]
+    text = "\n".join(kept_lines)
+    compacted_tokens = estimate_tokens(text)
+    return {
+        "text": text,
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "ratio": round(compacted_tokens / original_tokens, 3) if original_tokens else 1.0,
+    }
@@ -0,0 +1,257 @@
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime
+
+from jdcrawler.crawlers.base import BaseCrawler
+from jdcrawler.db.client import DatabaseClient
+
+# Finished runs kept for status polling
+MAX_FINISHED_RUNS = 50
+MAX_ERRORS = 20
+
+
+class CrawlRun:
+    """State and progress counters of one submitted crawl."""
+
+    COUNTERS = ("pages_fetched", "postings_found", "enriched", "saved", "errors")
+
+    def __init__(
+        self,
+        keyword: str | None,
+        sites: list[str] | None,
+        units: list[tuple[str, str]] | None = None,
+        resume: bool = False,
+    ):
+        self.id = uuid.uuid4().hex[:12]
+        # None keyword: all active keywords, the given (keyword, site) units,
+        # or the rest of an interrupted crawl
+        self.keyword = keyword
+        self.sites = sites
+        self.units = units
+        self.resume = resume
+        # Persisted work list of this run (see CrawlFrontier)
+        self.frontier_id: str | None = None
+        self.cancel_requested = False
+        self.status = "queued"
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+        self.errors: list[str] = []
+        self.created_at = datetime.now()
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        # Per-unit results and durations, see CrawlOrchestrator.summarize
+        self.summary: dict | None = None
+        # Bumped on every change, so streams only send new snapshots
+        self.version = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def add(self, counter: str, n: int = 1) -> None:
+        self.counts[counter] += n
+        self.version += 1
+
+    def error(self, message: str) -> None:
+        self.errors = [*self.errors, message][-MAX_ERRORS:]
+        self.add("errors")
+
+    def set_summary(self, summary: dict) -> None:
+        self.summary = summary
+        self.version += 1
+
+    def set_status(self, status: str) -> None:
+        self.status = status
+        if status == "running":
+            self.started_at = datetime.now()
+        elif self.finished:
+            self.finished_at = datetime.now()
+        self.version += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "keyword": self.keyword,
+            "sites": self.sites,
+            "units": self.units,
+            "resume": self.resume,
+            "frontier_id": self.frontier_id,
+            "status": self.status,
+            **self.counts,
+            "recent_errors": self.errors,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "summary": self.summary,
+        }
+
+
+class CrawlRunManager:
+    """
+    Runs submitted crawls as asyncio tasks and keeps their state for polling,
+    streaming and cancellation. Each run gets its own DatabaseClient on the
+    same databases, so a long crawl does not share a session with requests.
+
+    With execution "queue" (CRAWL_EXECUTION) runs are not crawled here: their
+    units are put on the shared WorkQueue for `python -m jdcrawler worker`
+    processes, and the run collects the results the workers report.
+    """
+
+    def __init__(self, execution: str | None = None, poll_interval: float | None = None):
+        self.runs: dict[str, CrawlRun] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.execution = execution or os.getenv("CRAWL_EXECUTION", "local")
+        self.poll_interval = poll_interval or float(os.getenv("CRAWL_WORKER_POLL_SECONDS", "2"))
+
+    def submit(
+        self,
+        db: DatabaseClient,
+        keyword: str | None = None,
+        sites: list[str] | None = None,
+        headless: bool = True,
+        crawlers: dict[str, type[BaseCrawler]] | None = None,
+        units: list[tuple[str, str]] | None = None,
+        resume: bool = False,
+    ) -> CrawlRun:
+        """
+        Start a crawl of one keyword, of the given (keyword, site) units, of
+        all active keywords, or resume an interrupted crawl, and return its run.
+        """
+        run = CrawlRun(keyword, sites, units, resume)
+        self.runs[run.id] = run
+        self._prune()
+        self._tasks[run.id] = asyncio.create_task(self._execute(run, db, headless, crawlers))
+        return run
+
+    async def _execute(
+        self,
+        run: CrawlRun,
+        db: DatabaseClient,
+        headless: bool,
+        crawlers: dict[str, type[BaseCrawler]] | None,
+    ) -> None:
+        from jdcrawler.services.crawler import CrawlerService
+        from jdcrawler.services.frontier import CrawlFrontier
+        from jdcrawler.services.orchestrator import CrawlUnit
+
+        run_db = DatabaseClient(
+            db.jobs_engine.url.render_as_string(hide_password=False),
+            db.user_engine.url.render_as_string(hide_password=False),
+        )
+        run.set_status("running")
+        try:
+            service = CrawlerService(run_db, run=run)
+            if crawlers is not None:
+                service.crawlers = crawlers
+            if self.execution == "queue":
+                await self._dispatch(run, run_db, service)
+            elif run.resume:
+                await service.resume_crawl(headless=headless)
+            elif run.units is not None:
+                units = [CrawlUnit(keyword, site) for keyword, site in run.units if site in service.crawlers]
+                await service.crawl_units(units, headless=headless)
+            elif run.keyword is None:
+                await service.crawl_all_active_keywords(headless=headless)
+            else:
+                await service.crawl_keyword(run.keyword, sites=run.sites, headless=headless)
+            run.set_status("completed")
+        except asyncio.CancelledError:
+            run_db.jobs_session.rollback()
+            # Cancelled by a user, not interrupted by a shutdown: do not resume it
+            if run.cancel_requested and run.frontier_id:
+                CrawlFrontier.set_status(run_db, run.frontier_id, "cancelled")
+            run.set_status("cancelled")
+        except Exception as e:
+            run.error(str(e))
+            run.set_status("failed")
+        finally:
+            run_db.close()
+            self._tasks.pop(run.id, None)
+
+    async def _dispatch(self, run: CrawlRun, db: DatabaseClient, service) -> None:
+        """Enqueue the run's units for crawl workers and fold in their results."""
+        from jdcrawler.services.frontier import CrawlFrontier
+        from jdcrawler.services.orchestrator import CrawlOrchestrator
+        from jdcrawler.services.work_queue import get_work_queue
+
+        if run.resume:
+            frontier = CrawlFrontier.resumable(db)
+            if frontier is None:
+                return
+            units = frontier.pending_units()
+        else:
+            if run.units is not None:
+                units = run.units
+            elif run.keyword is None:
+                units = [(kw.keyword, site) for kw in db.get_keywords(only_active=True) for site in service.crawlers]
+            else:
+                units = [(run.keyword, site) for site in run.sites or service.crawlers]
+            units = [(keyword, site) for keyword, site in units if site in service.crawlers]
+            frontier = CrawlFrontier.start(db, units)
+        run.frontier_id = frontier.id
+        queue = get_work_queue(db)
+        queue.put(run.id, "unit", [{"keyword": keyword, "site": site, "frontier_id": frontier.id} for keyword, site in units])
+
+        started = time.monotonic()
+        # Queued units are not stale: keep the frontier from being resumed meanwhile
+        heartbeat = asyncio.create_task(frontier.heartbeat(service.leases.ttl.total_seconds() / 3))
+        reported = set()
+        try:
+            while True:
+                tasks = queue.tasks(run.id)
+                for task in tasks:
+                    if task.finished and task.id not in reported:
+                        reported.add(task.id)
+                        self._report(run, task)
+                if all(task.finished for task in tasks):
+                    break
+                await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            queue.cancel(run.id)
+            raise
+        finally:
+            heartbeat.cancel()
+        summaries = [task.result["summary"] for task in tasks if task.result]
+        run.set_summary(CrawlOrchestrator.merge(summaries, time.monotonic() - started))
+        frontier.finish()
+
+    @staticmethod
+    def _report(run: CrawlRun, task) -> None:
+        if task.result is not None:
+            for counter, n in task.result["counts"].items():
+                if counter != "errors" and n:
+                    run.add(counter, n)
+            for message in task.result["errors"]:
+                run.error(message)
+        elif task.state == "failed":
+            run.error(f"{task.payload['site']} '{task.payload['keyword']}': {task.error}")
+
+    def get(self, run_id: str) -> CrawlRun | None:
+        return self.runs.get(run_id)
+
+    def list(self) -> list[CrawlRun]:
+        return sorted(self.runs.values(), key=lambda run: run.created_at, reverse=True)
+
+    def cancel(self, run_id: str) -> bool:
+        """Cancel a queued or running crawl. False if it already finished."""
+        task = self._tasks.get(run_id)
+        if task is None or task.done():
+            return False
+        self.runs[run_id].cancel_requested = True
+        task.cancel()
+        return True
+
+    async def wait(self, run_id: str) -> None:
+        task = self._tasks.get(run_id)
+        if task is not None:
+            await asyncio.wait([task])
+
+    def _prune(self) -> None:
+        finished = [run for run in self.list() if run.finished]
+        for run in finished[MAX_FINISHED_RUNS:]:
+            del self.runs[run.id]
+
+
+# Shared across requests, like the analysis worker
+runs = CrawlRunManager()
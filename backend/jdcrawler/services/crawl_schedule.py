@@ -0,0 +1,176 @@
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import CrawlScopeTable
+
+
+def _hours(minutes: int) -> str:
+    return f"{minutes / 60:g}h"
+
+
+class CrawlSchedule:
+    """
+    Adaptive crawl schedule per (keyword, site). Each run records how many
+    postings the scope listed for the first time; their exponentially
+    weighted moving average (EWMA) is compared to a target per run. A scope
+    yielding more than the target is crawled more often, one yielding less
+    backs off, within [min_interval, max_interval] and by at most a factor
+    of two per run so a single odd run does not swing the schedule.
+
+    Next runs are placed on scheduler ticks: among the ticks within 10% of
+    the ideal time, the one with the fewest scopes already booked is taken,
+    so runs spread out instead of piling up after a restart. Each tick
+    starts at most slot_capacity due scopes; the rest wait for the next one.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseClient,
+        min_interval: timedelta | None = None,
+        max_interval: timedelta | None = None,
+        base_interval: timedelta | None = None,
+        target_new_postings: float | None = None,
+        alpha: float | None = None,
+        tick: timedelta | None = None,
+        slot_capacity: int | None = None,
+    ):
+        self.db = db
+        self.min_interval = min_interval or timedelta(hours=float(os.getenv("CRAWL_MIN_INTERVAL_HOURS", "1")))
+        self.max_interval = max_interval or timedelta(hours=float(os.getenv("CRAWL_MAX_INTERVAL_HOURS", "24")))
+        self.base_interval = base_interval or timedelta(hours=float(os.getenv("CRAWL_BASE_INTERVAL_HOURS", "4")))
+        self.target_new_postings = target_new_postings or float(os.getenv("CRAWL_TARGET_NEW_POSTINGS", "3"))
+        self.alpha = alpha or float(os.getenv("CRAWL_YIELD_ALPHA", "0.3"))
+        self.tick = tick or timedelta(minutes=int(os.getenv("CRAWL_SCHEDULER_TICK_MINUTES", "15")))
+        self.slot_capacity = slot_capacity or int(os.getenv("CRAWL_SLOT_CAPACITY", "6"))
+
+    def next_interval(self, interval: timedelta, ewma: float) -> tuple[timedelta, str]:
+        """Interval after a run with the given average yield, and why."""
+        # New postings accumulate roughly in proportion to the interval, so
+        # target/ewma scales it to the length that yields the target
+        factor = self.target_new_postings / ewma if ewma > 0 else 2.0
+        factor = max(0.5, min(2.0, factor))
+        minutes = interval.total_seconds() / 60 * factor
+        lower, upper = self.min_interval.total_seconds() / 60, self.max_interval.total_seconds() / 60
+        bounded = round(max(lower, min(upper, minutes)))
+        old = round(interval.total_seconds() / 60)
+        if ewma > self.target_new_postings:
+            trend = "above"
+        elif ewma < self.target_new_postings:
+            trend = "below"
+        else:
+            trend = "at"
+        reason = (
+            f"avg {ewma:.1f} new postings/run {trend} target {self.target_new_postings:g}: "
+            f"every {_hours(old)} -> {_hours(bounded)}"
+        )
+        if bounded != round(minutes):
+            reason += " (max)" if bounded == round(upper) else " (min)"
+        return timedelta(minutes=bounded), reason
+
+    def _slot(self, moment: datetime) -> datetime:
+        """Start of the scheduler tick containing moment."""
+        step = self.tick.total_seconds()
+        return datetime.fromtimestamp(moment.timestamp() // step * step)
+
+    def pick_slot(self, keyword: str, site: str, ideal: datetime, interval: timedelta, now: datetime) -> datetime:
+        """The least booked tick near ideal, preferring the closest one."""
+        window = max(self.tick, interval / 10)
+        first = max(self._slot(ideal - window), self._slot(now) + self.tick)
+        last = max(self._slot(ideal + window), first)
+        booked = self.db.jobs_session.execute(
+            select(CrawlScopeTable.next_run_at).where(
+                CrawlScopeTable.next_run_at >= first,
+                CrawlScopeTable.next_run_at < last + self.tick,
+                ~((CrawlScopeTable.keyword == keyword) & (CrawlScopeTable.site == site)),
+            )
+        ).scalars()
+        load: dict[datetime, int] = {}
+        for moment in booked:
+            slot = self._slot(moment)
+            load[slot] = load.get(slot, 0) + 1
+        candidates = []
+        slot = first
+        while slot <= last:
+            candidates.append(slot)
+            slot += self.tick
+        return min(candidates, key=lambda slot: (load.get(slot, 0), abs(slot - ideal)))
+
+    def _scope(self, keyword: str, site: str) -> CrawlScopeTable:
+        scope = self.db.jobs_session.get(CrawlScopeTable, (keyword, site))
+        if scope is None:
+            scope = CrawlScopeTable(keyword=keyword, site=site, completed_runs=0)
+            self.db.jobs_session.add(scope)
+        return scope
+
+    def record(self, keyword: str, site: str, new_postings: int, now: datetime | None = None) -> CrawlScopeTable:
+        """Fold one run's yield into the scope's average and book its next run."""
+        now = now or datetime.now()
+        scope = self._scope(keyword, site)
+        if scope.yield_ewma is None:
+            ewma = float(new_postings)
+        else:
+            ewma = self.alpha * new_postings + (1 - self.alpha) * scope.yield_ewma
+        interval = timedelta(minutes=scope.interval_minutes) if scope.interval_minutes else self.base_interval
+        interval, reason = self.next_interval(interval, ewma)
+        scope.new_postings = new_postings
+        scope.yield_ewma = ewma
+        scope.interval_minutes = round(interval.total_seconds() / 60)
+        scope.next_run_at = self.pick_slot(keyword, site, now + interval, interval, now)
+        scope.schedule_reason = f"{new_postings} new last run, {reason}"
+        self.db.jobs_session.commit()
+        return scope
+
+    def record_failure(self, keyword: str, site: str, now: datetime | None = None) -> CrawlScopeTable:
+        """Retry a failed scope after min_interval, keeping its average and interval."""
+        now = now or datetime.now()
+        scope = self._scope(keyword, site)
+        scope.next_run_at = self.pick_slot(keyword, site, now + self.min_interval, self.min_interval, now)
+        scope.schedule_reason = f"last run failed, retry in {_hours(round(self.min_interval.total_seconds() / 60))}"
+        self.db.jobs_session.commit()
+        return scope
+
+    def _scopes(self) -> dict[tuple[str, str], CrawlScopeTable]:
+        rows = self.db.jobs_session.execute(select(CrawlScopeTable)).scalars()
+        return {(scope.keyword, scope.site): scope for scope in rows}
+
+    def due_units(self, sites: list[str], now: datetime | None = None) -> list[tuple[str, str]]:
+        """
+        (keyword, site) pairs of active keywords due by now: never crawled
+        ones first, then the most overdue, at most slot_capacity of them.
+        """
+        now = now or datetime.now()
+        scopes = self._scopes()
+        due = []
+        for kw in self.db.get_keywords(only_active=True):
+            for site in sites:
+                scope = scopes.get((kw.keyword, site))
+                next_run_at = scope.next_run_at if scope else None
+                if next_run_at is None or next_run_at <= now:
+                    due.append((next_run_at or datetime.min, kw.keyword, site))
+        due.sort()
+        return [(keyword, site) for _, keyword, site in due[: self.slot_capacity]]
+
+    def status(self, sites: list[str]) -> list[dict]:
+        """Schedule of every active (keyword, site), soonest first."""
+        scopes = self._scopes()
+        units = []
+        for kw in self.db.get_keywords(only_active=True):
+            for site in sites:
+                scope = scopes.get((kw.keyword, site))
+                units.append(
+                    {
+                        "keyword": kw.keyword,
+                        "site": site,
+                        "next_run_at": scope.next_run_at if scope else None,
+                        "interval_minutes": scope.interval_minutes if scope else None,
+                        "last_run_at": scope.last_run_at if scope else None,
+                        "new_postings": scope.new_postings if scope else None,
+                        "yield_ewma": round(scope.yield_ewma, 2) if scope and scope.yield_ewma is not None else None,
+                        "reason": (scope.schedule_reason if scope else None) or "never crawled, due now",
+                    }
+                )
+        units.sort(key=lambda unit: unit["next_run_at"] or datetime.min)
+        return units
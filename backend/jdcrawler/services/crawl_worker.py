@@ -0,0 +1,129 @@
+import asyncio
+import os
+import socket
+import uuid
+
+from sqlalchemy import select
+
+from jdcrawler.crawlers.base import BaseCrawler
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobTable
+from jdcrawler.models.job import JobSite
+from jdcrawler.services.crawl_runs import CrawlRun
+from jdcrawler.services.crawler import CrawlerService
+from jdcrawler.services.enrichment import ReEnrichmentService
+from jdcrawler.services.frontier import CrawlFrontier
+from jdcrawler.services.orchestrator import CrawlUnit
+from jdcrawler.services.work_queue import QueueTask, WorkQueue, get_work_queue
+
+
+class CrawlWorker:
+    """
+    `python -m jdcrawler worker`: claims tasks from the shared WorkQueue and
+    runs them with `concurrency` loops, reporting each task's counts and unit
+    summary back as its result. Workers write postings to the shared
+    database themselves; the API process only enqueues tasks and collects
+    results (CRAWL_EXECUTION=queue). The queue's per-site limit keeps the
+    cluster polite however many workers run.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseClient,
+        queue: WorkQueue | None = None,
+        crawlers: dict[str, type[BaseCrawler]] | None = None,
+        concurrency: int | None = None,
+        poll_interval: float | None = None,
+        headless: bool = True,
+        name: str | None = None,
+    ):
+        self.db = db
+        self.queue = queue or get_work_queue(db)
+        self.crawlers = crawlers
+        self.concurrency = concurrency or int(os.getenv("CRAWL_WORKER_CONCURRENCY", "1"))
+        self.poll_interval = poll_interval or float(os.getenv("CRAWL_WORKER_POLL_SECONDS", "2"))
+        self.headless = headless
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.processed = 0
+
+    def _service(self, run: CrawlRun) -> CrawlerService:
+        service = CrawlerService(self.db, run=run)
+        if self.crawlers is not None:
+            service.crawlers = self.crawlers
+        return service
+
+    async def execute(self, task: QueueTask) -> dict:
+        payload = task.payload
+        if task.kind == "unit":
+            run = CrawlRun(payload["keyword"], [payload["site"]])
+            frontier = CrawlFrontier.load(self.db, payload["frontier_id"]) if payload.get("frontier_id") else None
+            summary = await self._service(run).crawl_units(
+                [CrawlUnit(payload["keyword"], payload["site"])], headless=self.headless, frontier=frontier
+            )
+            return {"counts": run.counts, "errors": run.errors, "summary": summary}
+        if task.kind == "details":
+            crawlers = self.crawlers or self._service(CrawlRun(None, None)).crawlers
+            counts = await ReEnrichmentService(self.db, crawlers).run(headless=self.headless, job_ids=payload["job_ids"])
+            return {"counts": counts}
+        raise ValueError(f"Unknown task kind: {task.kind}")
+
+    async def _keep_claim(self, task: QueueTask) -> None:
+        while True:
+            await asyncio.sleep(self.queue.visibility.total_seconds() / 3)
+            if not self.queue.extend(task.id, self.name):
+                print(f"Worker {self.name} lost its claim on task {task.id}")
+                return
+
+    async def process(self, task: QueueTask) -> None:
+        print(f"Worker {self.name} running {task.kind} task {task.id}: {task.payload}")
+        keep_claim = asyncio.create_task(self._keep_claim(task))
+        try:
+            result = await self.execute(task)
+        except Exception as e:
+            print(f"Task {task.id} failed: {e}")
+            if not self.queue.fail(task.id, self.name, str(e)):
+                print(f"Worker {self.name} no longer holds task {task.id}; its failure is dropped")
+        else:
+            if not self.queue.complete(task.id, self.name, result):
+                print(f"Worker {self.name} no longer holds task {task.id}; its result is dropped")
+        finally:
+            keep_claim.cancel()
+            self.processed += 1
+
+    async def _loop(self, drain: bool) -> None:
+        while True:
+            task = self.queue.claim(self.name)
+            if task is not None:
+                await self.process(task)
+                continue
+            if drain:
+                stats = self.queue.stats()
+                if not stats["queued"] and not stats["claimed"]:
+                    return
+            await asyncio.sleep(self.poll_interval)
+
+    async def run(self, drain: bool = False) -> int:
+        """Work until cancelled, or with drain until the queue is empty; returns tasks processed."""
+        print(f"Crawl worker {self.name} started with {self.concurrency} slots")
+        await asyncio.gather(*(self._loop(drain) for _ in range(self.concurrency)))
+        return self.processed
+
+
+def dispatch_refresh(db: DatabaseClient, queue: WorkQueue | None = None, batch_size: int | None = None) -> int:
+    """Queue the postings due for a detail revisit as per-site "details" tasks."""
+    queue = queue or get_work_queue(db)
+    batch_size = batch_size or int(os.getenv("CRAWL_DETAIL_TASK_SIZE", "10"))
+    ids = ReEnrichmentService(db, dict.fromkeys(site.value for site in JobSite)).due_job_ids()
+    if not ids:
+        return 0
+    rows = db.jobs_session.execute(select(JobTable.id, JobTable.site).where(JobTable.id.in_(ids))).all()
+    by_site: dict[str, list[int]] = {}
+    for job_id, site in rows:
+        by_site.setdefault(site.value, []).append(job_id)
+    payloads = [
+        {"site": site, "job_ids": job_ids[i : i + batch_size]}
+        for site, job_ids in by_site.items()
+        for i in range(0, len(job_ids), batch_size)
+    ]
+    queue.put(f"refresh-{uuid.uuid4().hex[:8]}", "details", payloads)
+    return len(ids)
@@ -1,141 +1,373 @@
 import asyncio
-from typing import List, Type
+from datetime import datetime
 
 from jdcrawler.crawlers.base import BaseCrawler
 from jdcrawler.crawlers.jobkorea import JobkoreaCrawler
 from jdcrawler.crawlers.saramin import SaraminCrawler
 from jdcrawler.crawlers.wanted import WantedCrawler
 from jdcrawler.db.client import DatabaseClient
-from jdcrawler.db.schema import JobTable
 from jdcrawler.models.job import JobCreate
 from jdcrawler.services.analysis import AnalysisService
+from jdcrawler.services.browser_state import BrowserStates
+from jdcrawler.services.crawl_runs import CrawlRun
+from jdcrawler.services.crawl_schedule import CrawlSchedule
+from jdcrawler.services.enrichment import (
+    CARD_FIELDS,
+    ReEnrichmentService,
+    card_hash,
+    content_hash,
+    store_details,
+)
+from jdcrawler.services.frontier import CrawlFrontier
+from jdcrawler.services.leases import CrawlLeases, LeaseUnavailable
+from jdcrawler.services.orchestrator import CrawlOrchestrator, CrawlUnit, UnitSkipped
+from jdcrawler.services.retry_policy import get_retry_policy
+from jdcrawler.services.scoring import ProfileScorer
+from jdcrawler.services.skills import skill_extractor
+from jdcrawler.services.throttle import get_throttle
+from jdcrawler.services.vector_index import get_vector_index, save_vector_index
+from jdcrawler.utils.canonical import canonicalize
+from jdcrawler.utils.retry import CircuitOpen
+
+
+class CrawlRunCache:
+    """
+    Postings already handled in one crawl run, keyed by (site, external_id).
+    Overlapping keywords ("백엔드", "Python 백엔드") list many of the same
+    postings; the first keyword looks them up and enriches them, later ones
+    only record that they matched too.
+    """
+
+    def __init__(self):
+        self.job_ids: dict[tuple[str, str], int] = {}
+        self.hits = 0
+
+    def get(self, site: str, external_id: str) -> int | None:
+        job_id = self.job_ids.get((site, external_id))
+        if job_id is not None:
+            self.hits += 1
+        return job_id
+
+    def put(self, site: str, external_id: str, job_id: int) -> None:
+        self.job_ids[(site, external_id)] = job_id
 
 
 class CrawlerService:
-    def __init__(self, db: DatabaseClient):
+    def __init__(self, db: DatabaseClient, run: CrawlRun | None = None):
         self.db = db
+        # Progress of the submitted crawl this service works for, if any
+        self.run = run
         self.analysis_service = AnalysisService()
-        self.crawlers: dict[str, Type[BaseCrawler]] = {
+        self.schedule = CrawlSchedule(db)
+        # Keeps other processes off the units this service is crawling
+        self.leases = CrawlLeases(db)
+        self.browser_states = BrowserStates(db)
+        self.crawlers: dict[str, type[BaseCrawler]] = {
             "saramin": SaraminCrawler,
             "jobkorea": JobkoreaCrawler,
             "wanted": WantedCrawler,
         }
 
+    def _progress(self, counter: str, n: int = 1) -> None:
+        if self.run is not None:
+            self.run.add(counter, n)
+
     async def crawl_keyword(
-        self, keyword: str, sites: List[str] | None = None, headless: bool = True
+        self,
+        keyword: str,
+        sites: list[str] | None = None,
+        headless: bool = True,
+        run_cache: CrawlRunCache | None = None,
     ) -> int:
         if sites is None:
             sites = list(self.crawlers.keys())
+        units = [CrawlUnit(keyword, site) for site in sites if site in self.crawlers]
+        summary = await self.crawl_units(units, headless=headless, run_cache=run_cache)
+        return summary["crawled"]
+
+    async def crawl_units(
+        self,
+        units: list[CrawlUnit],
+        headless: bool = True,
+        run_cache: CrawlRunCache | None = None,
+        orchestrator: CrawlOrchestrator | None = None,
+        frontier: CrawlFrontier | None = None,
+    ) -> dict:
+        """
+        Crawl (keyword, site) units concurrently within the orchestrator's
+        global and per-site limits. A failing unit is recorded and the others
+        carry on. Progress is persisted in a frontier (a new one unless an
+        interrupted one is passed in to resume). Returns the run summary with
+        per-unit durations.
+        """
+        if run_cache is None:
+            run_cache = CrawlRunCache()
+        if orchestrator is None:
+            orchestrator = CrawlOrchestrator()
+        if frontier is None:
+            frontier = CrawlFrontier.start(self.db, [(unit.keyword, unit.site) for unit in units])
+        run_cache.job_ids.update(frontier.done_postings())
+        if self.run is not None:
+            self.run.frontier_id = frontier.id
 
         # Get user profile once for analysis
         profile = self.db.get_profile()
+        scorer = ProfileScorer(profile)
+        vector_index = get_vector_index(self.db)
 
-        total_crawled = 0
+        async def work(unit: CrawlUnit) -> int:
+            # Postings are written through a session of the unit's own, so the
+            # commits of other units and of lease/frontier heartbeats never
+            # flush its half-applied changes
+            unit_db = self.db.scoped()
+            try:
+                # Units finished by another process since the frontier started are skipped
+                async with self.leases.hold(unit.keyword, unit.site, since=frontier.created_at) as lease:
+                    frontier.start_unit(unit.keyword, unit.site)
+                    crawled = await self.crawl_unit(
+                        unit.keyword, unit.site, headless, run_cache, profile, scorer, vector_index, frontier, unit_db
+                    )
+                    # Detail pages to retry keep the unit open for the resumed run
+                    lease.completed = not frontier.unresolved(unit.keyword, unit.site)
+                frontier.finish_unit(unit.keyword, unit.site, "done")
+                return crawled
+            except LeaseUnavailable as e:
+                print(f"Skipping {unit.site} for {unit.keyword}: {e}")
+                frontier.finish_unit(unit.keyword, unit.site, "skipped", str(e))
+                raise UnitSkipped(str(e)) from e
+            except Exception as e:
+                print(f"Error crawling {unit.site} for {unit.keyword}: {e}")
+                frontier.finish_unit(unit.keyword, unit.site, "failed", str(e))
+                self.schedule.record_failure(unit.keyword, unit.site)
+                if self.run is not None:
+                    self.run.error(f"{unit.site} '{unit.keyword}': {e}")
+                import traceback
+                traceback.print_exc()
+                raise
+            finally:
+                unit_db.close_sessions()
 
-        for site in sites:
-            crawler_cls = self.crawlers.get(site)
-            if not crawler_cls:
-                continue
+        heartbeat = asyncio.create_task(frontier.heartbeat(self.leases.ttl.total_seconds() / 3))
+        try:
+            summary = await orchestrator.run(units, work)
+        finally:
+            heartbeat.cancel()
+        frontier.finish()
+        save_vector_index(self.db)
+        if self.run is not None:
+            self.run.set_summary(summary)
+        return summary
 
-            print(f"Crawling {site} for '{keyword}'...")
-            # Use 10-15s jittered delay to avoid temporary bans
-            crawler = crawler_cls(headless=headless, rate_limit_delay=10.0, jitter=5.0)
-            try:
-                async with crawler as cr:
-                    jobs_data = await cr.crawl(keyword)
-                    
-                    # For each job, we need to enrich and analyze
-                    # To speed up, we can do this in chunks or after initial save
-                    for job_create in jobs_data:
-                        # 1. Check if job already exists
-                        existing_job = self.db.jobs_session.query(JobTable).filter(JobTable.url == job_create.url).first()
-                        
-                        # 2. Enrich if new job OR if existing job has no description
-                        if not existing_job or not existing_job.description:
-                            if hasattr(cr, 'extract_details'):
-                                print(f"  Enriching details for: {job_create.title[:30]}...")
-                                details = await cr.extract_details(job_create.url)
-                                job_create.description = details.get("description")
-                                job_create.description_image_url = details.get("description_image_url")
-                                
-                                # Enrich missing fields if they were N/A or empty
-                                if not job_create.experience or job_create.experience == "N/A":
-                                    job_create.experience = details.get("experience")
-                                if not job_create.salary:
-                                    job_create.salary = details.get("salary")
-                                if not job_create.location:
-                                    job_create.location = details.get("location")
-                                if not job_create.deadline:
-                                    job_create.deadline = details.get("deadline")
-                        
-                        # 3. Phase 1: Rule-based filtering (If it's a new job or was updated)
-                        if job_create.description:
-                             # Initialize score to 0 instead of None
-                             job_create.ai_score = 0
-                             job_create.ai_status = "pending"
-                             
-                             # Check for exclude keywords
-                             is_filtered = False
-                             for ex_kw in profile.exclude_keywords:
-                                 if ex_kw.lower() in (job_create.title + (job_create.description or "")).lower():
-                                     job_create.ai_score = 0
-                                     job_create.ai_summary = f"제외 키워드 '{ex_kw}' 포함됨"
-                                     job_create.ai_status = "filtered"
-                                     is_filtered = True
-                                     break
-                             
-                             if not is_filtered:
-                                 match_count = 0
-                                 if profile.tech_stack:
-                                     for skill in profile.tech_stack:
-                                         if skill.name.lower() in (job_create.title + (job_create.description or "")).lower():
-                                             match_count += 1
-                                     
-                                     total_tech = len(profile.tech_stack)
-                                     job_create.ai_score = int((match_count / total_tech) * 100)
-                                 else:
-                                     job_create.ai_score = 0
+    async def crawl_unit(
+        self,
+        keyword: str,
+        site: str,
+        headless: bool,
+        run_cache: CrawlRunCache,
+        profile,
+        scorer: ProfileScorer,
+        vector_index,
+        frontier: CrawlFrontier,
+        db: DatabaseClient | None = None,
+    ) -> int:
+        """
+        Crawl one site for one keyword; returns the number of postings listed.
+        Postings are stored through db (the service's client by default).
+        Every write is committed before the next await, so concurrent units
+        on their own sessions never wait on each other's SQLite write lock.
+        """
+        db = db or self.db
+        crawler_cls = self.crawlers[site]
+
+        print(f"Crawling {site} for '{keyword}'...")
+        policy = get_retry_policy(site)
+        if policy.breaker.retry_in() > 0:
+            # The site is down: fail fast instead of every keyword burning its retries
+            raise CircuitOpen(f"{site} circuit open, next probe in {policy.breaker.retry_in():.0f}s")
+        # The site's adaptive rate (see services/throttle.py) instead of a fixed delay
+        throttle = get_throttle(site)
+        crawler = crawler_cls(
+            headless=headless, throttle=throttle, retry_policy=policy, storage_state=self.browser_states.load(site)
+        )
+        run = db.begin_crawl_run(keyword, site)
+        async with crawler as cr:
+            jobs_data = await cr.crawl(keyword)
+            # Listed postings before: an empty page now is most likely a soft block
+            soft_block = not jobs_data and run > 1
+            if soft_block or getattr(cr, "blocked", False):
+                self.browser_states.invalidate(site)
+            if not jobs_data and policy.breaker.state == "open":
+                # Site crawlers swallow fetch errors; an empty result from a failing site is no result
+                raise CircuitOpen(f"{site} circuit opened while crawling '{keyword}'")
+            if soft_block:
+                print(f"  {site} returned no postings for '{keyword}', backing off")
+                throttle.record("blocked")
+            # A listing may span several result pages
+            self._progress("pages_fetched", cr.pages_fetched)
+            self._progress("postings_found", len(jobs_data))
+            page_started_at = datetime.now()
+            seen_ids = []
+            frontier.queue_postings(site, [canonicalize(site, job.url) for job in jobs_data])
+            
+            # For each job, we need to enrich and analyze
+            # To speed up, we can do this in chunks or after initial save
+            for job_create in jobs_data:
+                # 1. Check if job already exists (by site posting ID, so link variants
+                # with tracking parameters don't trigger another detail fetch)
+                external_id, job_create.url = canonicalize(site, job_create.url)
+                cached_id = run_cache.get(site, external_id)
+                if cached_id is not None:
+                    # Handled for an earlier keyword in this run
+                    seen_ids.append(cached_id)
+                    continue
+                existing_job = db.find_posting(site, job_create.url)
+                
+                card = card_hash(job_create)
+                job_create.card_hash = card
+
+                # 2. Enrich new jobs, jobs without a description, and jobs whose list
+                # card changed since the last crawl (a cheap sign the posting was edited).
+                # Other postings are revisited by ReEnrichmentService.
+                card_changed = existing_job is not None and existing_job.card_hash not in (None, card)
+                details = None
+                # Detail pages that failed on every attempt are left to the next crawl
+                needs_details = not existing_job or not existing_job.description or card_changed
+                if needs_details and not frontier.gave_up(site, external_id):
+                    if hasattr(cr, 'extract_details'):
+                        print(f"  Enriching details for: {job_create.title[:30]}...")
+                        fetched_before = cr.pages_fetched
+                        error = None
+                        try:
+                            details = await cr.extract_details(job_create.url)
+                            if not (details.get("description") or details.get("description_image_url")):
+                                # Site crawlers swallow fetch errors and return no description
+                                error = "no description"
+                        except Exception as e:
+                            error = str(e)
+                        self._progress("pages_fetched", cr.pages_fetched - fetched_before)
+                        if error:
+                            # One broken detail page does not fail the unit; it is retried on resume
+                            print(f"  Failed to fetch details for {job_create.url}: {error}")
+                            frontier.posting_failed(site, external_id, error, keyword)
+                            if self.run is not None:
+                                self.run.error(f"{site} {job_create.url}: {error}")
+                            if not frontier.gave_up(site, external_id):
+                                if existing_job:
+                                    seen_ids.append(existing_job.id)
+                                continue
+                            # Out of attempts: saved with the list card's data alone
+                            details = None
+                    if details is not None:
+                        self._progress("enriched")
+                        job_create.description = details.get("description")
+                        job_create.description_image_url = details.get("description_image_url")
+                        job_create.content_hash = content_hash(job_create.description, job_create.description_image_url)
+                        job_create.details_fetched_at = datetime.now()
+                        validators = cr.validators.get(job_create.url, {})
+                        job_create.etag = validators.get("etag")
+                        job_create.last_modified = validators.get("last_modified")
                         
-                        # 4. Save/Update in DB
-                        if existing_job:
-                            # Update missing fields
-                            did_update = False
-                            if not existing_job.description and job_create.description:
-                                existing_job.description = job_create.description
-                                existing_job.description_image_url = job_create.description_image_url
-                                existing_job.ai_score = job_create.ai_score
-                                existing_job.ai_status = job_create.ai_status
-                                existing_job.ai_summary = job_create.ai_summary
-                                did_update = True
-                            
-                            # Also update metadata if missing
-                            if (not existing_job.experience or existing_job.experience == "N/A") and job_create.experience:
-                                existing_job.experience = job_create.experience
-                                did_update = True
-                            if not existing_job.salary and job_create.salary:
-                                existing_job.salary = job_create.salary
-                                did_update = True
-                            if not existing_job.location and job_create.location:
-                                existing_job.location = job_create.location
-                                did_update = True
-                            if not existing_job.deadline and job_create.deadline:
-                                existing_job.deadline = job_create.deadline
+                        # Enrich missing fields if they were N/A or empty
+                        if not job_create.experience or job_create.experience == "N/A":
+                            job_create.experience = details.get("experience")
+                        if not job_create.salary:
+                            job_create.salary = details.get("salary")
+                        if not job_create.location:
+                            job_create.location = details.get("location")
+                        if not job_create.deadline:
+                            job_create.deadline = details.get("deadline")
+                
+                # 3. Phase 1: Rule-based filtering of new jobs (existing jobs are
+                # re-scored by store_details only if their content changed)
+                if not existing_job and job_create.description:
+                    job_create.skills = skill_extractor.extract(job_create.title, job_create.description)
+                    result = scorer.score(job_create.title, job_create.description)
+                    job_create.ai_score = result["score"]
+                    job_create.ai_summary = result["summary"]
+                    job_create.ai_status = result["status"]
+                    job_create.scored_profile_version = profile.version
+                
+                # 4. Save/Update in DB
+                if existing_job:
+                    did_update = False
+                    if details is not None:
+                        did_update = store_details(
+                            db,
+                            existing_job,
+                            details,
+                            scorer,
+                            profile.version,
+                            vector_index,
+                            cr.validators.get(job_create.url, {}),
+                        )
+                    if card_changed:
+                        for field in CARD_FIELDS:
+                            value = getattr(job_create, field)
+                            if value and value != getattr(existing_job, field):
+                                setattr(existing_job, field, value)
                                 did_update = True
-                                
-                            if did_update:
-                                self.db.jobs_session.commit()
-                        else:
-                            self.db.create_job(job_create)
+                    existing_job.card_hash = card
+                    
+                    # Also update metadata if missing
+                    if (not existing_job.experience or existing_job.experience == "N/A") and job_create.experience:
+                        existing_job.experience = job_create.experience
+                        did_update = True
+                    if not existing_job.salary and job_create.salary:
+                        existing_job.salary = job_create.salary
+                        did_update = True
+                    if not existing_job.location and job_create.location:
+                        existing_job.location = job_create.location
+                        did_update = True
+                    if not existing_job.deadline and job_create.deadline:
+                        existing_job.deadline = job_create.deadline
+                        did_update = True
                         
-                    count = len(jobs_data)
-                    print(f"Saved and analyzed {count} jobs from {site}")
-                    total_crawled += count
-            except Exception as e:
-                print(f"Error crawling {site} for {keyword}: {e}")
-                import traceback
-                traceback.print_exc()
+                    if did_update:
+                        db.apply_structured_fields(existing_job)
+                        vector_index.add(existing_job.id, existing_job.title, existing_job.description, existing_job.content_hash)
+                        self._progress("saved")
+                    # card_hash and fetch times change even when nothing else did
+                    db.jobs_session.commit()
+                    seen_ids.append(existing_job.id)
+                    run_cache.put(site, external_id, existing_job.id)
+                    frontier.posting_done(site, external_id, existing_job.id)
+                else:
+                    job = db.create_job(job_create)
+                    vector_index.add(job.id, job.title, job.description, job_create.content_hash)
+                    self._progress("saved")
+                    seen_ids.append(job.id)
+                    run_cache.put(site, external_id, job.id)
+                    frontier.posting_done(site, external_id, job.id)
+
+            # Liveness for the whole result page in one bulk update
+            new_postings = db.mark_seen(keyword, site, run, seen_ids, page_started_at)
+            if jobs_data:
+                # An empty result is more likely a block or a broken
+                # parser than every posting closing at once
+                closed = db.finish_crawl_run(keyword, site, run)
+                if closed:
+                    print(f"Closed {closed} {site} postings no longer listed for '{keyword}'")
+
+            if not soft_block:
+                # Warm session for the next crawl of the site (dropped instead if blocked meanwhile)
+                await self.browser_states.save(site, cr)
+            scope = self.schedule.record(keyword, site, new_postings)
+            print(f"Saved and analyzed {len(jobs_data)} jobs from {site}; {scope.schedule_reason}")
+            return len(jobs_data)
+
+    async def resume_crawl(self, headless: bool = True) -> dict | None:
+        """Finish the most recent interrupted crawl; None if there is none."""
+        frontier = CrawlFrontier.resumable(self.db)
+        if frontier is None:
+            print("No interrupted crawl to resume.")
+            return None
+        units = [CrawlUnit(keyword, site) for keyword, site in frontier.pending_units() if site in self.crawlers]
+        print(f"Resuming crawl {frontier.id}: {len(units)} keyword/site units left")
+        return await self.crawl_units(units, headless=headless, frontier=frontier)
 
-        return total_crawled
+    async def refresh_details(self, headless: bool = True) -> dict[str, int]:
+        """Revisit the detail pages of postings that are due (see ReEnrichmentService)."""
+        return await ReEnrichmentService(self.db, self.crawlers).run(headless=headless)
 
     async def crawl_all_active_keywords(self, headless: bool = True):
         keywords = self.db.get_keywords(only_active=True)
@@ -145,5 +377,13 @@ class CrawlerService:
             print("No active keywords to crawl.")
             return
 
-        for kw in keywords:
-            await self.crawl_keyword(kw.keyword, headless=headless)
+        run_cache = CrawlRunCache()
+        sites = list(self.crawlers.keys())
+        units = [CrawlUnit(kw.keyword, site) for kw in keywords for site in sites]
+        summary = await self.crawl_units(units, headless=headless, run_cache=run_cache)
+        print(f"Skipped {run_cache.hits} postings already handled for another keyword in this run")
+        print(
+            f"Crawled {len(units)} keyword/site units in {summary['elapsed_seconds']}s "
+            f"({summary['unit_seconds']}s of unit time, critical path: {summary['critical_site']})"
+        )
+        return summary
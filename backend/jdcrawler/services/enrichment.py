@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from jdcrawler.crawlers.base import BaseCrawler
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobTable
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.services.analysis_cache import normalize_text
+from jdcrawler.services.browser_state import BrowserStates
+from jdcrawler.services.retry_policy import get_retry_policy
+from jdcrawler.services.scoring import ProfileScorer
+from jdcrawler.services.skills import skill_extractor
+from jdcrawler.services.throttle import get_throttle
+from jdcrawler.services.vector_index import (
+    JobVectorIndex,
+    get_vector_index,
+    save_vector_index,
+)
+
+# List card fields sites update along with the posting itself
+CARD_FIELDS = ("title", "company", "location", "salary", "experience", "deadline")
+
+# Result of the most recent re-enrichment run in this process, for the status endpoint
+last_run: dict | None = None
+
+
+def content_hash(description: str | None, image_url: str | None) -> str | None:
+    """sha256 of the normalized detail content, or None when nothing was extracted."""
+    if not description and not image_url:
+        return None
+    payload = json.dumps([normalize_text(description), image_url or ""], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def card_hash(job: JobCreate) -> str:
+    """sha256 of the normalized list card fields."""
+    payload = json.dumps([normalize_text(getattr(job, field)) for field in CARD_FIELDS], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def store_details(
+    db: DatabaseClient,
+    job: JobTable,
+    details: dict,
+    scorer: ProfileScorer,
+    profile_version: int,
+    vector_index: JobVectorIndex,
+    validators: dict[str, str] | None = None,
+) -> bool:
+    """
+    Store a fresh detail fetch on an existing job. The fetch time and HTTP
+    validators are updated whenever something was extracted; description,
+    skills, cluster, vector and rule-based score only when the content hash
+    changed. Returns whether it did. The caller commits.
+
+    Rows stored before content hashes existed are compared against a hash of
+    their stored description. A changed job that is being analyzed is left
+    untouched (and still due), so the worker's claim and result stay valid.
+    """
+    description = details.get("description")
+    image_url = details.get("description_image_url")
+    new_hash = content_hash(description, image_url)
+    if new_hash is None:
+        # Nothing extracted: keep what we have and try again next time
+        return False
+    stored_hash = job.content_hash or content_hash(job.description, job.description_image_url)
+    changed = new_hash != stored_hash
+    if changed and job.ai_status == "analyzing":
+        return False
+    job.details_fetched_at = datetime.now()
+    if validators is not None:
+        job.etag = validators.get("etag")
+        job.last_modified = validators.get("last_modified")
+    if not changed:
+        job.content_hash = new_hash
+        return False
+
+    job.description = description
+    job.description_image_url = image_url
+    job.content_hash = new_hash
+    result = scorer.score(job.title, description or "")
+    job.ai_score = result["score"]
+    job.ai_summary = result["summary"]
+    # An LLM analysis of the old text no longer applies
+    job.ai_status = result["status"]
+    job.analysis_queued_at = None
+    job.scored_profile_version = profile_version
+    db.set_job_skills(job, skill_extractor.extract(job.title, description))
+    db.assign_cluster(job)
+    vector_index.add(job.id, job.title, description, new_hash)
+    return True
+
+
+class ReEnrichmentService:
+    """
+    Revisits the detail pages of open postings on an age-based cadence:
+    a posting is due once the time since its last detail fetch exceeds half
+    its age, clamped to [min_interval, max_interval]. Fresh postings are
+    edited most often, so they are checked daily; old ones back off.
+
+    Due postings with stored HTTP validators are first asked with a
+    conditional request, and a 304 only bumps the fetch time. Everything
+    else is re-fetched, and scoring only re-runs if the content hash changed.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseClient,
+        crawlers: dict[str, type[BaseCrawler]],
+        batch_size: int | None = None,
+        min_interval: timedelta = timedelta(days=1),
+        max_interval: timedelta | None = None,
+    ):
+        self.db = db
+        self.crawlers = crawlers
+        self.batch_size = batch_size or int(os.getenv("JOBS_REFRESH_BATCH_SIZE", "50"))
+        self.min_interval = min_interval
+        self.max_interval = max_interval or timedelta(days=int(os.getenv("JOBS_REFRESH_MAX_DAYS", "14")))
+
+    def refresh_interval(self, age: timedelta) -> timedelta:
+        return max(self.min_interval, min(self.max_interval, age / 2))
+
+    def due_job_ids(self, now: datetime | None = None) -> list[int]:
+        """Open postings whose details are due for a revisit, stalest first."""
+        now = now or datetime.now()
+        with Session(self.db.jobs_engine) as session:
+            rows = session.execute(
+                select(JobTable.id, JobTable.created_at, JobTable.details_fetched_at)
+                .where(
+                    JobTable.is_closed.is_(False),
+                    JobTable.description.is_not(None),
+                    JobTable.site.in_([JobSite(site) for site in self.crawlers]),
+                    # Nothing fetched within min_interval is ever due
+                    (JobTable.details_fetched_at.is_(None))
+                    | (JobTable.details_fetched_at <= now - self.min_interval),
+                )
+                .order_by(JobTable.details_fetched_at.is_not(None), JobTable.details_fetched_at)
+            ).all()
+        due = []
+        for job_id, created_at, fetched_at in rows:
+            if fetched_at is None or now - fetched_at >= self.refresh_interval(now - created_at):
+                due.append(job_id)
+                if len(due) >= self.batch_size:
+                    break
+        return due
+
+    async def run(self, headless: bool = True, job_ids: list[int] | None = None) -> dict[str, int]:
+        """Revisit the due postings, or the given ones (a crawl worker's detail task)."""
+        global last_run
+        started_at = datetime.now()
+        counts = {"checked": 0, "not_modified": 0, "unchanged": 0, "changed": 0, "failed": 0}
+        ids = self.due_job_ids() if job_ids is None else job_ids
+        if ids:
+            profile = self.db.get_profile()
+            scorer = ProfileScorer(profile)
+            vector_index = get_vector_index(self.db)
+            session = self.db.jobs_session
+            jobs = session.execute(select(JobTable).where(JobTable.id.in_(ids))).scalars().all()
+            by_site: dict[str, list[JobTable]] = {}
+            for job in jobs:
+                by_site.setdefault(job.site.value, []).append(job)
+
+            browser_states = BrowserStates(self.db)
+            for site, site_jobs in by_site.items():
+                policy = get_retry_policy(site)
+                if policy.breaker.retry_in() > 0:
+                    print(f"Skipping re-enrichment of {site}: circuit open")
+                    continue
+                crawler = self.crawlers[site](
+                    headless=headless,
+                    throttle=get_throttle(site),
+                    retry_policy=policy,
+                    storage_state=browser_states.load(site),
+                )
+                try:
+                    async with crawler as cr:
+                        for job in site_jobs:
+                            if policy.breaker.state == "open":
+                                # The site went down mid-batch; the rest stay due
+                                break
+                            counts["checked"] += 1
+                            if await cr.is_not_modified(job.url, job.etag, job.last_modified):
+                                job.details_fetched_at = datetime.now()
+                                counts["not_modified"] += 1
+                                continue
+                            details = await cr.extract_details(job.url)
+                            if not details.get("description") and not details.get("description_image_url"):
+                                counts["failed"] += 1
+                                continue
+                            changed = store_details(
+                                self.db, job, details, scorer, profile.version, vector_index, cr.validators.get(job.url)
+                            )
+                            counts["changed" if changed else "unchanged"] += 1
+                            session.commit()
+                        await browser_states.save(site, cr)
+                except Exception as e:
+                    print(f"Re-enrichment of {site} failed: {e}")
+                session.commit()
+            save_vector_index(self.db)
+
+        last_run = {**counts, "started_at": started_at, "finished_at": datetime.now()}
+        print(f"Re-enrichment checked {counts['checked']} postings: {counts}")
+        return counts
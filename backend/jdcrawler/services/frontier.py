@@ -0,0 +1,278 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, bindparam, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import FrontierRunTable, FrontierUnitTable, FrontierUrlTable
+
+
+class CrawlFrontier:
+    """
+    Persisted work list of one crawl, so a crawl interrupted by a crash or a
+    deploy can resume where it stopped. Units move queued -> in_flight ->
+    done / incomplete / failed / skipped; detail pages are queued when their
+    listing is fetched and marked done or failed in batches of batch_size, so
+    progress costs one write per batch. On resume, done postings seed the run
+    cache (their details are not fetched again) and units not done are crawled.
+
+    Failed units and detail pages are retried on resume until they reach
+    max_attempts. A unit crawled with detail pages that failed and have
+    attempts left is incomplete, and crawled again for them. A running frontier touches updated_at periodically; one
+    not touched for stale_after is considered interrupted.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseClient,
+        run_id: str,
+        created_at: datetime,
+        batch_size: int | None = None,
+        max_attempts: int | None = None,
+    ):
+        self.db = db
+        self.id = run_id
+        self.created_at = created_at
+        self.batch_size = batch_size or int(os.getenv("CRAWL_FRONTIER_BATCH_SIZE", "20"))
+        self.max_attempts = max_attempts or int(os.getenv("CRAWL_FRONTIER_MAX_ATTEMPTS", "3"))
+        # Detail page results buffered until the next checkpoint, by (site, external_id)
+        self._done: dict[tuple[str, str], int] = {}
+        self._failed: dict[tuple[str, str], str] = {}
+        self._exhausted: set[tuple[str, str]] = set()
+        self._attempts: dict[tuple[str, str], int] = {}
+        # Failed detail pages with attempts left, by (keyword, site) unit
+        self._unresolved: dict[tuple[str, str], set[str]] = {}
+
+    @classmethod
+    def start(cls, db: DatabaseClient, units: list[tuple[str, str]], **options) -> "CrawlFrontier":
+        now = datetime.now()
+        run_id = uuid.uuid4().hex[:12]
+        session = db.jobs_session
+        session.add(FrontierRunTable(id=run_id, status="running", created_at=now, updated_at=now))
+        session.flush()
+        if units:
+            session.execute(
+                sqlite_insert(FrontierUnitTable).on_conflict_do_nothing(),
+                [
+                    {"run_id": run_id, "keyword": keyword, "site": site, "state": "queued", "updated_at": now}
+                    for keyword, site in units
+                ],
+            )
+        session.commit()
+        return cls(db, run_id, now, **options)
+
+    @classmethod
+    def load(cls, db: DatabaseClient, run_id: str, **options) -> "CrawlFrontier | None":
+        run = db.jobs_session.get(FrontierRunTable, run_id)
+        if run is None:
+            return None
+        return cls(db, run.id, run.created_at, **options)
+
+    @classmethod
+    def resumable(
+        cls,
+        db: DatabaseClient,
+        stale_after: timedelta | None = None,
+        max_age: timedelta | None = None,
+        **options,
+    ) -> "CrawlFrontier | None":
+        """
+        The most recent interrupted frontier. Frontiers older than max_age are
+        abandoned instead: their postings are due for a fresh crawl anyway.
+        """
+        now = datetime.now()
+        stale_after = stale_after or timedelta(seconds=int(os.getenv("CRAWL_LEASE_TTL_SECONDS", "120")))
+        max_age = max_age or timedelta(hours=int(os.getenv("CRAWL_FRONTIER_MAX_AGE_HOURS", "24")))
+        session = db.jobs_session
+        session.execute(
+            update(FrontierRunTable)
+            .where(FrontierRunTable.status == "running", FrontierRunTable.created_at < now - max_age)
+            .values(status="abandoned", updated_at=now)
+        )
+        session.commit()
+        run = session.execute(
+            select(FrontierRunTable)
+            .where(FrontierRunTable.status == "running", FrontierRunTable.updated_at < now - stale_after)
+            .order_by(FrontierRunTable.created_at.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+        if run is None:
+            return None
+        return cls(db, run.id, run.created_at, **options)
+
+    @staticmethod
+    def set_status(db: DatabaseClient, run_id: str, status: str) -> None:
+        db.jobs_session.execute(
+            update(FrontierRunTable)
+            .where(FrontierRunTable.id == run_id)
+            .values(status=status, updated_at=datetime.now())
+        )
+        db.jobs_session.commit()
+
+    def touch(self) -> None:
+        self.db.jobs_session.execute(
+            update(FrontierRunTable).where(FrontierRunTable.id == self.id).values(updated_at=datetime.now())
+        )
+        self.db.jobs_session.commit()
+
+    async def heartbeat(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.touch()
+
+    def pending_units(self) -> list[tuple[str, str]]:
+        """Units still to crawl: not started, interrupted, or failed or incomplete with attempts left."""
+        rows = self.db.jobs_session.execute(
+            select(FrontierUnitTable.keyword, FrontierUnitTable.site).where(
+                FrontierUnitTable.run_id == self.id,
+                or_(
+                    FrontierUnitTable.state.in_(["queued", "in_flight"]),
+                    and_(
+                        FrontierUnitTable.state.in_(["failed", "incomplete"]),
+                        FrontierUnitTable.attempts < self.max_attempts,
+                    ),
+                ),
+            )
+        ).all()
+        return [(keyword, site) for keyword, site in rows]
+
+    def done_postings(self) -> dict[tuple[str, str], int]:
+        """(site, external_id) -> job id of postings this frontier already saved."""
+        rows = self.db.jobs_session.execute(
+            select(FrontierUrlTable.site, FrontierUrlTable.external_id, FrontierUrlTable.job_id).where(
+                FrontierUrlTable.run_id == self.id, FrontierUrlTable.state == "done"
+            )
+        ).all()
+        return {(site, external_id): job_id for site, external_id, job_id in rows}
+
+    def start_unit(self, keyword: str, site: str) -> None:
+        self._set_unit(keyword, site, state="in_flight", attempts=FrontierUnitTable.attempts + 1, error=None)
+
+    def finish_unit(self, keyword: str, site: str, state: str, error: str | None = None) -> None:
+        self.flush()
+        unresolved = len(self._unresolved.pop((keyword, site), ()))
+        if state == "done" and unresolved:
+            state, error = "incomplete", f"{unresolved} detail pages failed"
+        self._set_unit(keyword, site, state=state, error=error[:500] if error else None)
+
+    def _set_unit(self, keyword: str, site: str, **values) -> None:
+        now = datetime.now()
+        session = self.db.jobs_session
+        session.execute(
+            sqlite_insert(FrontierUnitTable)
+            .values(run_id=self.id, keyword=keyword, site=site, state="queued", updated_at=now)
+            .on_conflict_do_nothing()
+        )
+        session.execute(
+            update(FrontierUnitTable)
+            .where(FrontierUnitTable.run_id == self.id, FrontierUnitTable.keyword == keyword, FrontierUnitTable.site == site)
+            .values(updated_at=now, **values)
+        )
+        session.execute(update(FrontierRunTable).where(FrontierRunTable.id == self.id).values(updated_at=now))
+        session.commit()
+
+    def queue_postings(self, site: str, postings: list[tuple[str, str]]) -> None:
+        """Queue a listing's (external_id, url) pairs; known ones keep their state."""
+        if not postings:
+            return
+        now = datetime.now()
+        session = self.db.jobs_session
+        session.execute(
+            sqlite_insert(FrontierUrlTable).on_conflict_do_nothing(),
+            [
+                {"run_id": self.id, "site": site, "external_id": external_id, "url": url, "state": "queued", "updated_at": now}
+                for external_id, url in postings
+            ],
+        )
+        failed = session.execute(
+            select(FrontierUrlTable.external_id, FrontierUrlTable.attempts).where(
+                FrontierUrlTable.run_id == self.id,
+                FrontierUrlTable.site == site,
+                FrontierUrlTable.state == "failed",
+            )
+        ).all()
+        for external_id, attempts in failed:
+            self._attempts[(site, external_id)] = attempts
+            if attempts >= self.max_attempts:
+                self._exhausted.add((site, external_id))
+        session.commit()
+
+    def unresolved(self, keyword: str, site: str) -> int:
+        """The unit's failed detail pages that have attempts left."""
+        return len(self._unresolved.get((keyword, site), ()))
+
+    def gave_up(self, site: str, external_id: str) -> bool:
+        """Whether the posting's detail page failed max_attempts times."""
+        return (site, external_id) in self._exhausted
+
+    def posting_done(self, site: str, external_id: str, job_id: int) -> None:
+        self._failed.pop((site, external_id), None)
+        self._done[(site, external_id)] = job_id
+        for (_, unit_site), unresolved in self._unresolved.items():
+            if unit_site == site:
+                unresolved.discard(external_id)
+        self._maybe_flush()
+
+    def posting_failed(self, site: str, external_id: str, error: str, keyword: str | None = None) -> None:
+        """
+        Record a failed detail page. The posting is given up once this makes
+        max_attempts; until then the keyword's unit is left incomplete.
+        """
+        key = (site, external_id)
+        if key not in self._failed:
+            # Buffered failures of one posting count as one attempt when flushed
+            self._attempts[key] = self._attempts.get(key, 0) + 1
+        self._failed[key] = error[:500]
+        if self._attempts[key] >= self.max_attempts:
+            self._exhausted.add(key)
+        elif keyword is not None:
+            self._unresolved.setdefault((keyword, site), set()).add(external_id)
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if len(self._done) + len(self._failed) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Checkpoint buffered detail page results in one executemany per state."""
+        if not self._done and not self._failed:
+            return
+        now = datetime.now()
+        session = self.db.jobs_session
+        where = (
+            FrontierUrlTable.run_id == self.id,
+            FrontierUrlTable.site == bindparam("b_site"),
+            FrontierUrlTable.external_id == bindparam("b_external_id"),
+        )
+        if self._done:
+            session.connection().execute(
+                update(FrontierUrlTable).where(*where).values(state="done", job_id=bindparam("b_job_id"), error=None, updated_at=now),
+                [
+                    {"b_site": site, "b_external_id": external_id, "b_job_id": job_id}
+                    for (site, external_id), job_id in self._done.items()
+                ],
+            )
+        if self._failed:
+            session.connection().execute(
+                update(FrontierUrlTable)
+                .where(*where)
+                .values(state="failed", attempts=FrontierUrlTable.attempts + 1, error=bindparam("b_error"), updated_at=now),
+                [
+                    {"b_site": site, "b_external_id": external_id, "b_error": error}
+                    for (site, external_id), error in self._failed.items()
+                ],
+            )
+        session.execute(update(FrontierRunTable).where(FrontierRunTable.id == self.id).values(updated_at=now))
+        session.commit()
+        self._done.clear()
+        self._failed.clear()
+
+    def finish(self) -> str:
+        """Close the frontier: completed if no unit is left to crawl, else left to resume."""
+        self.flush()
+        status = "running" if self.pending_units() else "completed"
+        self.set_status(self.db, self.id, status)
+        return status
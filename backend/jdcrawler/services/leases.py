@@ -0,0 +1,67 @@
+import asyncio
+import os
+import socket
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from jdcrawler.db.client import DatabaseClient
+
+
+class LeaseUnavailable(Exception):
+    """Another process holds the unit, or already crawled it during this run."""
+
+
+class LeaseHold:
+    """A held lease; clear completed to release it without recording a completed crawl."""
+
+    def __init__(self):
+        self.completed = True
+
+
+class CrawlLeases:
+    """
+    Per-(keyword, site) leases in the jobs database, so the scheduler, API
+    runs and CLI crawls in any number of processes never crawl the same unit
+    at once. A held lease is renewed by a heartbeat every ttl/3; if its
+    process dies, the lease expires after ttl and the unit is free again.
+
+    Processes that start overlapping runs split the units between them:
+    units another owner is crawling, or finished after this run started,
+    are skipped rather than crawled twice.
+    """
+
+    def __init__(self, db: DatabaseClient, ttl: timedelta | None = None, owner: str | None = None):
+        self.db = db
+        self.ttl = ttl or timedelta(seconds=int(os.getenv("CRAWL_LEASE_TTL_SECONDS", "120")))
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+    async def _heartbeat(self, keyword: str, site: str) -> None:
+        while True:
+            await asyncio.sleep(self.ttl.total_seconds() / 3)
+            if not self.db.renew_lease(keyword, site, self.owner, datetime.now() + self.ttl):
+                print(f"Lost crawl lease on {site} '{keyword}'; another process may crawl it too")
+                return
+
+    @asynccontextmanager
+    async def hold(self, keyword: str, site: str, since: datetime):
+        """
+        Hold the unit's lease for the duration of the block, raising
+        LeaseUnavailable if it cannot be claimed. The lease is released on
+        exit and marked completed if the block did not raise and left the
+        yielded LeaseHold completed.
+        """
+        if not self.db.acquire_lease(keyword, site, self.owner, datetime.now() + self.ttl, since):
+            raise LeaseUnavailable(f"{site} '{keyword}' is being or was just crawled by another process")
+        heartbeat = asyncio.create_task(self._heartbeat(keyword, site))
+        lease = LeaseHold()
+        completed = False
+        try:
+            yield lease
+            completed = lease.completed
+        finally:
+            heartbeat.cancel()
+            # A failed flush leaves the shared session unusable until rolled back
+            if not self.db.jobs_session.is_active:
+                self.db.jobs_session.rollback()
+            self.db.release_lease(keyword, site, self.owner, completed)
@@ -0,0 +1,171 @@
+import os
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import (
+    JobKeywordTable,
+    JobLshBandTable,
+    JobSkillTable,
+    JobTable,
+    job_archive_table,
+)
+from jdcrawler.services.vector_index import get_vector_index, save_vector_index
+
+# Result of the most recent sweep in this process, for the status endpoint
+last_sweep: dict | None = None
+
+
+class LifecycleService:
+    """
+    Moves postings that are no longer useful out of the hot jobs table into
+    jobs_archive, in batched transactions:
+
+    - expired: the parsed deadline passed more than `expired_after_days` ago
+    - vanished: not listed by any crawl for `unseen_after_days`
+    - capacity: the oldest-seen postings beyond `max_hot_jobs` (0 disables the cap)
+
+    Bookmarked postings and jobs being analyzed are never archived. The newest
+    row is kept as well, so SQLite never hands out an archived id again.
+    Side tables keyed by job id (skills, LSH bands, keywords) are cleaned up in the same
+    transaction, and clusters that lose their first job get a new one.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseClient,
+        expired_after_days: int | None = None,
+        unseen_after_days: int | None = None,
+        max_hot_jobs: int | None = None,
+        batch_size: int = 500,
+    ):
+        self.db = db
+        self.expired_after_days = (
+            expired_after_days
+            if expired_after_days is not None
+            else int(os.getenv("JOBS_ARCHIVE_EXPIRED_DAYS", "30"))
+        )
+        self.unseen_after_days = (
+            unseen_after_days
+            if unseen_after_days is not None
+            else int(os.getenv("JOBS_ARCHIVE_UNSEEN_DAYS", "60"))
+        )
+        self.max_hot_jobs = (
+            max_hot_jobs if max_hot_jobs is not None else int(os.getenv("JOBS_HOT_MAX_ROWS", "50000"))
+        )
+        self.batch_size = batch_size
+
+    def _archivable(self, session: Session) -> list:
+        newest_id = session.execute(select(func.max(JobTable.id))).scalar_one()
+        return [
+            JobTable.is_bookmarked.is_(False),
+            JobTable.ai_status != "analyzing",
+            JobTable.id != newest_id,
+        ]
+
+    def sweep(self) -> dict:
+        global last_sweep
+        started_at = datetime.now()
+        now = datetime.now()
+        archived_ids: list[int] = []
+        counts = {}
+
+        expired_before = date.today() - timedelta(days=self.expired_after_days)
+        counts["expired"] = self._archive_where(
+            [JobTable.deadline_date < expired_before], "expired", archived_ids
+        )
+        unseen_before = now - timedelta(days=self.unseen_after_days)
+        counts["vanished"] = self._archive_where(
+            [func.coalesce(JobTable.last_seen_at, JobTable.created_at) < unseen_before],
+            "vanished",
+            archived_ids,
+        )
+        counts["capacity"] = self._archive_over_capacity(archived_ids)
+
+        if archived_ids:
+            index = get_vector_index(self.db)
+            index.remove(archived_ids)
+            save_vector_index(self.db)
+
+        last_sweep = {
+            **counts,
+            "started_at": started_at,
+            "finished_at": datetime.now(),
+        }
+        print(f"Lifecycle sweep archived {len(archived_ids)} jobs: {counts}")
+        return counts
+
+    def _archive_where(self, conditions: list, reason: str, archived_ids: list[int]) -> int:
+        total = 0
+        while True:
+            with Session(self.db.jobs_engine) as session:
+                ids = session.execute(
+                    select(JobTable.id)
+                    .where(*conditions, *self._archivable(session))
+                    .order_by(JobTable.id)
+                    .limit(self.batch_size)
+                ).scalars().all()
+                if not ids:
+                    return total
+                self._archive_batch(session, ids, reason)
+                session.commit()
+            archived_ids.extend(ids)
+            total += len(ids)
+
+    def _archive_over_capacity(self, archived_ids: list[int]) -> int:
+        if not self.max_hot_jobs:
+            return 0
+        total = 0
+        while True:
+            with Session(self.db.jobs_engine) as session:
+                excess = session.execute(select(func.count(JobTable.id))).scalar_one() - self.max_hot_jobs
+                if excess <= 0:
+                    return total
+                ids = session.execute(
+                    select(JobTable.id)
+                    .where(*self._archivable(session))
+                    .order_by(func.coalesce(JobTable.last_seen_at, JobTable.created_at), JobTable.id)
+                    .limit(min(excess, self.batch_size))
+                ).scalars().all()
+                if not ids:
+                    # Everything left is bookmarked or in use
+                    return total
+                self._archive_batch(session, ids, "capacity")
+                session.commit()
+            archived_ids.extend(ids)
+            total += len(ids)
+
+    @staticmethod
+    def _archive_batch(session: Session, ids: list[int], reason: str) -> None:
+        columns = [column.name for column in JobTable.__table__.columns]
+        source = select(
+            *JobTable.__table__.columns,
+            literal(datetime.now()).label("archived_at"),
+            literal(reason).label("archive_reason"),
+        ).where(JobTable.id.in_(ids))
+        # A posting that reappeared and expired again replaces its older archived copy
+        session.execute(
+            insert(job_archive_table)
+            .prefix_with("OR REPLACE")
+            .from_select([*columns, "archived_at", "archive_reason"], source)
+        )
+
+        cluster_ids = session.execute(
+            select(JobTable.cluster_id).where(JobTable.id.in_(ids), JobTable.cluster_id.is_not(None)).distinct()
+        ).scalars().all()
+
+        session.execute(delete(JobSkillTable).where(JobSkillTable.job_id.in_(ids)))
+        session.execute(delete(JobLshBandTable).where(JobLshBandTable.job_id.in_(ids)))
+        session.execute(delete(JobKeywordTable).where(JobKeywordTable.job_id.in_(ids)))
+        session.execute(delete(JobTable).where(JobTable.id.in_(ids)))
+
+        DatabaseClient.reassign_cluster_heads(session, cluster_ids)
+
+    def counts(self) -> dict[str, int]:
+        with Session(self.db.jobs_engine) as session:
+            return {
+                "hot": session.execute(select(func.count(JobTable.id))).scalar_one(),
+                "archived": session.execute(select(func.count()).select_from(job_archive_table)).scalar_one(),
+            }
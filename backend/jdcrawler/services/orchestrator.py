@@ -0,0 +1,148 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from itertools import zip_longest
+
+
+class UnitSkipped(Exception):
+    """Raised by a unit's work to skip it without counting it as failed."""
+
+
+class CrawlUnit:
+    """One (keyword, site) crawl scheduled by the orchestrator."""
+
+    def __init__(self, keyword: str, site: str):
+        self.keyword = keyword
+        self.site = site
+        self.status = "pending"
+        self.crawled = 0
+        self.error: str | None = None
+        self.queued_at: float | None = None
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def wait(self) -> float | None:
+        if self.queued_at is None or self.started_at is None:
+            return None
+        return self.started_at - self.queued_at
+
+    def to_dict(self) -> dict:
+        return {
+            "keyword": self.keyword,
+            "site": self.site,
+            "status": self.status,
+            "crawled": self.crawled,
+            "error": self.error,
+            "wait_seconds": round(self.wait, 3) if self.wait is not None else None,
+            "duration_seconds": round(self.duration, 3) if self.duration is not None else None,
+        }
+
+
+class CrawlOrchestrator:
+    """
+    Runs (keyword, site) units concurrently: at most max_concurrency units at
+    once overall and site_concurrency per site, since each site has its own
+    rate limit and ban threshold while different sites do not slow each other
+    down. A unit waits for its site's slot before taking a global one, so a
+    backlog on one site never blocks the others. Failures are recorded on the
+    unit and do not affect other units.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        site_concurrency: int | None = None,
+        site_limits: dict[str, int] | None = None,
+    ):
+        self.max_concurrency = max_concurrency or int(os.getenv("CRAWL_MAX_CONCURRENCY", "3"))
+        self.site_concurrency = site_concurrency or int(os.getenv("CRAWL_SITE_CONCURRENCY", "1"))
+        self.site_limits = site_limits or {}
+
+    @staticmethod
+    def interleave(units: list[CrawlUnit]) -> list[CrawlUnit]:
+        """Round-robin over sites, so each site's first unit is queued early."""
+        by_site: dict[str, list[CrawlUnit]] = {}
+        for unit in units:
+            by_site.setdefault(unit.site, []).append(unit)
+        return [unit for batch in zip_longest(*by_site.values()) for unit in batch if unit is not None]
+
+    async def run(self, units: list[CrawlUnit], work: Callable[[CrawlUnit], Awaitable[int]]) -> dict:
+        """Run work(unit) for every unit; returns the run summary."""
+        global_slots = asyncio.Semaphore(self.max_concurrency)
+        site_slots = {
+            site: asyncio.Semaphore(self.site_limits.get(site, self.site_concurrency))
+            for site in {unit.site for unit in units}
+        }
+
+        async def run_unit(unit: CrawlUnit) -> None:
+            unit.queued_at = time.monotonic()
+            async with site_slots[unit.site], global_slots:
+                unit.status = "running"
+                unit.started_at = time.monotonic()
+                try:
+                    unit.crawled = await work(unit)
+                    unit.status = "completed"
+                except UnitSkipped as e:
+                    unit.status = "skipped"
+                    unit.error = str(e)
+                except Exception as e:
+                    unit.status = "failed"
+                    unit.error = str(e)
+                finally:
+                    unit.finished_at = time.monotonic()
+
+        started = time.monotonic()
+        ordered = self.interleave(units)
+        await asyncio.gather(*(run_unit(unit) for unit in ordered))
+        return self.summarize(ordered, time.monotonic() - started)
+
+    @staticmethod
+    def merge(summaries: list[dict], elapsed: float) -> dict:
+        """One summary for units run by several processes (crawl workers)."""
+        units = [unit for summary in summaries for unit in summary["units"]]
+        by_site: dict[str, float] = {}
+        for unit in units:
+            by_site[unit["site"]] = by_site.get(unit["site"], 0.0) + (unit["duration_seconds"] or 0.0)
+        finished = [unit for unit in units if unit["duration_seconds"] is not None]
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "unit_seconds": round(sum(by_site.values()), 3),
+            "site_seconds": {site: round(seconds, 3) for site, seconds in by_site.items()},
+            "critical_site": max(by_site, key=by_site.get) if by_site else None,
+            "slowest_unit": max(finished, key=lambda unit: unit["duration_seconds"], default=None),
+            "crawled": sum(unit["crawled"] for unit in units),
+            "failed": sum(unit["status"] == "failed" for unit in units),
+            "skipped": sum(unit["status"] == "skipped" for unit in units),
+            "units": units,
+        }
+
+    @staticmethod
+    def summarize(units: list[CrawlUnit], elapsed: float) -> dict:
+        """
+        Per-unit results plus busy time per site: the busiest site bounds the
+        wall time of the whole run, so it is the critical path.
+        """
+        by_site: dict[str, float] = {}
+        for unit in units:
+            by_site[unit.site] = by_site.get(unit.site, 0.0) + (unit.duration or 0.0)
+        finished = [unit for unit in units if unit.duration is not None]
+        slowest = max(finished, key=lambda unit: unit.duration, default=None)
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "unit_seconds": round(sum(by_site.values()), 3),
+            "site_seconds": {site: round(seconds, 3) for site, seconds in by_site.items()},
+            "critical_site": max(by_site, key=by_site.get) if by_site else None,
+            "slowest_unit": slowest.to_dict() if slowest else None,
+            "crawled": sum(unit.crawled for unit in units),
+            "failed": sum(unit.status == "failed" for unit in units),
+            "skipped": sum(unit.status == "skipped" for unit in units),
+            "units": [unit.to_dict() for unit in units],
+        }
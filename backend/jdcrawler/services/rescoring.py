@@ -0,0 +1,163 @@
+import threading
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobTable
+from jdcrawler.services.scoring import ProfileScorer
+
+
+class RescoreProgress:
+    """Progress of the current (or last) bulk re-scoring run."""
+
+    def __init__(self):
+        self.status = "idle"
+        self.profile_version: int | None = None
+        self.total = 0
+        self.processed = 0
+        self.last_job_id = 0
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.error: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "profile_version": self.profile_version,
+            "total": self.total,
+            "processed": self.processed,
+            "last_job_id": self.last_job_id,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+# Shared across requests, like the APScheduler instance in jdcrawler.scheduler
+progress = RescoreProgress()
+_run_lock = threading.Lock()
+
+
+class RescoringService:
+    """
+    Re-computes the rule-based ai_score of stored jobs after the profile changes.
+
+    Jobs are streamed in primary-key order with keyset pagination, scored with
+    a compiled ProfileScorer and written back with one executemany UPDATE per
+    chunk, so memory stays bounded by chunk_size regardless of table size.
+    Every row records the profile version it was scored with, which makes the
+    run resumable: a restarted run simply picks up the rows that are still stale.
+    Rows that already have an LLM result (ai_status='completed') are left alone,
+    and so are rows queued for or being analyzed, which belong to the
+    AnalysisQueue until their result is written.
+    """
+
+    def __init__(self, db: DatabaseClient, chunk_size: int = 1000):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def _rescorable(table=JobTable):
+        return (
+            table.ai_status != "completed",
+            table.ai_status != "analyzing",
+            table.analysis_queued_at.is_(None),
+        )
+
+    @classmethod
+    def _stale_filter(cls, version: int):
+        return (
+            JobTable.description.is_not(None),
+            *cls._rescorable(),
+            or_(
+                JobTable.scored_profile_version.is_(None),
+                JobTable.scored_profile_version != version,
+            ),
+        )
+
+    def count_stale(self, version: int | None = None) -> int:
+        if version is None:
+            version = self.db.get_profile_snapshot().version
+        with Session(self.db.jobs_engine) as session:
+            return session.execute(
+                select(func.count(JobTable.id)).where(*self._stale_filter(version))
+            ).scalar_one()
+
+    def run(self) -> None:
+        """Re-score all stale jobs. Returns immediately if a run is already active."""
+        if not _run_lock.acquire(blocking=False):
+            return
+        try:
+            progress.status = "running"
+            progress.error = None
+            progress.started_at = datetime.now()
+            progress.finished_at = None
+            progress.processed = 0
+            # Loop until no profile update happened while we were working
+            while True:
+                profile = self.db.get_profile_snapshot()
+                progress.profile_version = profile.version
+                progress.total = self.count_stale(profile.version)
+                progress.last_job_id = 0
+                self._rescore_version(ProfileScorer(profile), profile.version)
+                if self.db.get_profile_snapshot().version == profile.version:
+                    break
+            progress.status = "completed"
+        except Exception as e:
+            print(f"Re-scoring failed: {e}")
+            progress.status = "failed"
+            progress.error = str(e)
+        finally:
+            progress.finished_at = datetime.now()
+            _run_lock.release()
+
+    def _rescore_version(self, scorer: ProfileScorer, version: int) -> None:
+        stmt = (
+            update(JobTable.__table__)
+            .where(
+                JobTable.__table__.c.id == bindparam("b_id"),
+                # Re-checked at write time: a worker may have claimed the row since
+                *self._rescorable(JobTable.__table__.c),
+            )
+            .values(
+                ai_score=bindparam("b_score"),
+                ai_summary=bindparam("b_summary"),
+                ai_status=bindparam("b_status"),
+                scored_profile_version=version,
+            )
+        )
+
+        last_id = 0
+        while True:
+            if self.db.get_profile_snapshot().version != version:
+                # A newer profile arrived; run() restarts with it
+                return
+            with Session(self.db.jobs_engine) as session:
+                rows = session.execute(
+                    select(JobTable.id, JobTable.title, JobTable.description)
+                    .where(JobTable.id > last_id, *self._stale_filter(version))
+                    .order_by(JobTable.id)
+                    .limit(self.chunk_size)
+                ).all()
+                if not rows:
+                    return
+
+                params = []
+                for job_id, title, description in rows:
+                    result = scorer.score(title, description)
+                    params.append(
+                        {
+                            "b_id": job_id,
+                            "b_score": result["score"],
+                            "b_summary": result["summary"],
+                            "b_status": result["status"],
+                        }
+                    )
+                session.execute(stmt, params)
+                session.commit()
+
+            last_id = rows[-1].id
+            progress.processed += len(rows)
+            progress.last_job_id = last_id
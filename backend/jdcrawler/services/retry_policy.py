@@ -0,0 +1,29 @@
+import os
+
+from jdcrawler.utils.retry import CircuitBreaker, RetryBudget, RetryPolicy
+
+# One policy per site, shared by all crawls in this process (like the throttles)
+policies: dict[str, RetryPolicy] = {}
+
+
+def get_retry_policy(site: str) -> RetryPolicy:
+    """
+    The site's retry policy: CRAWL_BREAKER_FAILURES consecutive failures
+    open its circuit for CRAWL_BREAKER_RESET_SECONDS, and retries may not
+    exceed CRAWL_RETRY_BUDGET_PERCENT of its recent requests.
+    """
+    if site not in policies:
+        policies[site] = RetryPolicy(
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("CRAWL_BREAKER_FAILURES", "5")),
+                reset_timeout=float(os.getenv("CRAWL_BREAKER_RESET_SECONDS", "300")),
+            ),
+            budget=RetryBudget(ratio=float(os.getenv("CRAWL_RETRY_BUDGET_PERCENT", "10")) / 100),
+            max_attempts=int(os.getenv("CRAWL_RETRY_MAX_ATTEMPTS", "3")),
+        )
+    return policies[site]
+
+
+def status() -> dict[str, dict]:
+    """Breaker state, failure kinds and retry budget per site."""
+    return {site: policy.status() for site, policy in sorted(policies.items())}
@@ -0,0 +1,51 @@
+from jdcrawler.models.profile import UserProfile
+from jdcrawler.utils.matcher import KeywordMatcher
+
+
+class ProfileScorer:
+    """
+    Phase 1 rule-based scoring compiled from a user profile.
+
+    Exclude keywords, tech stack names and interest keywords are compiled into
+    one KeywordMatcher so each posting is scanned exactly once.
+    """
+
+    def __init__(self, profile: UserProfile):
+        self.profile = profile
+        self.exclude_keywords = [kw for kw in profile.exclude_keywords if kw.strip()]
+        self.skill_names = [skill.name for skill in profile.tech_stack]
+        self.interest_keywords = [kw for kw in profile.interest_keywords if kw.strip()]
+        self.matcher = KeywordMatcher(
+            self.exclude_keywords + self.skill_names + self.interest_keywords
+        )
+
+    def scan(self, title: str, description: str | None) -> dict[str, list[int]]:
+        return self.matcher.scan(f"{title}\n{description or ''}")
+
+    def score(self, title: str, description: str | None) -> dict:
+        """
+        Score a posting against the profile.
+        Returns a dict with 'score', 'summary', 'status' and the matched terms.
+        """
+        hits = self.scan(title, description)
+        normalize = KeywordMatcher.normalize
+
+        matched_skills = [name for name in self.skill_names if normalize(name) in hits]
+        matched_interests = [kw for kw in self.interest_keywords if normalize(kw) in hits]
+        result = {
+            "score": 0,
+            "summary": None,
+            "status": "pending",
+            "matched_skills": matched_skills,
+            "matched_interests": matched_interests,
+        }
+
+        for ex_kw in self.exclude_keywords:
+            if normalize(ex_kw) in hits:
+                result["summary"] = f"제외 키워드 '{ex_kw}' 포함됨"
+                result["status"] = "filtered"
+                return result
+
+        if self.skill_names:
+            result["score"] = int((len(matched_skills) / len(self.skill_names)) * 100)
+        return result
@@ -0,0 +1,109 @@
+from jdcrawler.utils.matcher import KeywordMatcher
+
+# Canonical skill name -> spellings seen in postings (the canonical name is
+# always matched as well). Korean transliterations are listed explicitly since
+# postings mix them freely with the English names.
+SKILL_DICTIONARY: dict[str, list[str]] = {
+    "Python": ["파이썬"],
+    "Java": ["자바"],
+    "Kotlin": ["코틀린"],
+    "JavaScript": ["js", "자바스크립트"],
+    "TypeScript": ["타입스크립트"],
+    "Go": ["golang", "고랭"],
+    "C++": ["cpp"],
+    "C#": ["씨샵"],
+    "Rust": ["러스트"],
+    "Swift": ["스위프트"],
+    "Objective-C": ["objc", "objective c"],
+    "PHP": [],
+    "Ruby": ["루비"],
+    "Ruby on Rails": ["rails", "레일즈"],
+    "Scala": ["스칼라"],
+    "Spring": ["spring boot", "springboot", "스프링", "스프링부트"],
+    "JPA": ["hibernate"],
+    "Django": ["장고"],
+    "Flask": ["플라스크"],
+    "FastAPI": [],
+    "Node.js": ["nodejs", "node js", "노드js"],
+    "NestJS": ["nest.js"],
+    "Express": ["express.js", "expressjs"],
+    "React": ["react.js", "reactjs", "리액트"],
+    "React Native": ["리액트 네이티브", "리액트네이티브"],
+    "Vue.js": ["vue", "vuejs", "뷰js"],
+    "Angular": ["앵귤러"],
+    "Next.js": ["nextjs"],
+    "Flutter": ["플러터"],
+    "Android": ["안드로이드"],
+    "iOS": [],
+    "SQL": [],
+    "MySQL": ["mariadb"],
+    "PostgreSQL": ["postgres", "포스트그레스"],
+    "Oracle": ["오라클"],
+    "MongoDB": ["mongo", "몽고db"],
+    "Redis": ["레디스"],
+    "Elasticsearch": ["elastic search", "엘라스틱서치", "opensearch"],
+    "Kafka": ["카프카"],
+    "RabbitMQ": ["래빗mq"],
+    "Docker": ["도커"],
+    "Kubernetes": ["k8s", "쿠버네티스"],
+    "AWS": ["amazon web services"],
+    "GCP": ["google cloud"],
+    "Azure": ["애저"],
+    "Terraform": ["테라폼"],
+    "Jenkins": ["젠킨스"],
+    "GitHub Actions": [],
+    "Linux": ["리눅스"],
+    "Spark": ["pyspark", "스파크"],
+    "Hadoop": ["하둡"],
+    "Airflow": ["에어플로우"],
+    "TensorFlow": ["텐서플로우"],
+    "PyTorch": ["파이토치"],
+    "GraphQL": [],
+    "gRPC": [],
+    "Unity": ["유니티"],
+    "Unreal Engine": ["unreal", "언리얼"],
+}
+
+
+class SkillExtractor:
+    """
+    Extracts canonical skill names from postings with one compiled
+    KeywordMatcher over every spelling in the dictionary.
+
+    When spellings overlap, the longest match wins, so "JavaScript" does not
+    also count as "Java" and "리액트 네이티브" is not also "React". English
+    spellings only match whole words ("Rust" is not in "trust"); Korean ones
+    match as substrings, as particles attach to them ("자바를").
+    """
+
+    def __init__(self, dictionary: dict[str, list[str]] | None = None):
+        dictionary = SKILL_DICTIONARY if dictionary is None else dictionary
+        normalize = KeywordMatcher.normalize
+        self._canonical: dict[str, str] = {}
+        for name, synonyms in dictionary.items():
+            for spelling in [name, *synonyms]:
+                self._canonical.setdefault(normalize(spelling), name)
+        self.matcher = KeywordMatcher(self._canonical, boundary_max_len=None)
+
+    def canonicalize(self, name: str) -> str | None:
+        """Canonical name for any known spelling ("자바" -> "Java")."""
+        return self._canonical.get(KeywordMatcher.normalize(name))
+
+    def extract(self, title: str, description: str | None) -> list[str]:
+        hits = self.matcher.scan(f"{title}\n{description or ''}")
+        spans = sorted(
+            ((start, start + len(term), term) for term, starts in hits.items() for start in starts),
+            key=lambda span: (span[0], -span[1]),
+        )
+        skills: set[str] = set()
+        covered_until = -1
+        for _start, end, term in spans:
+            if end <= covered_until:
+                # Inside a longer match that starts at or before this one
+                continue
+            covered_until = end
+            skills.add(self._canonical[term])
+        return sorted(skills)
+
+
+skill_extractor = SkillExtractor()
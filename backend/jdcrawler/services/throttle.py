@@ -0,0 +1,29 @@
+import os
+
+from jdcrawler.utils.rate_limiter import AdaptiveRateLimiter
+
+# One controller per site, shared by all crawls in this process
+throttles: dict[str, AdaptiveRateLimiter] = {}
+
+
+def get_throttle(site: str) -> AdaptiveRateLimiter:
+    """
+    The site's AIMD rate limiter. The initial 6 requests per minute match
+    the fixed 10-15s delay crawls used before; healthy sites speed up to
+    CRAWL_THROTTLE_MAX_RPM and troubled ones slow down to CRAWL_THROTTLE_MIN_RPM.
+    """
+    if site not in throttles:
+        throttles[site] = AdaptiveRateLimiter(
+            initial_rate=float(os.getenv("CRAWL_THROTTLE_INITIAL_RPM", "6")),
+            min_rate=float(os.getenv("CRAWL_THROTTLE_MIN_RPM", "0.5")),
+            max_rate=float(os.getenv("CRAWL_THROTTLE_MAX_RPM", "20")),
+            increase=float(os.getenv("CRAWL_THROTTLE_INCREASE_RPM", "0.5")),
+            decrease=float(os.getenv("CRAWL_THROTTLE_DECREASE", "0.5")),
+            slow_seconds=float(os.getenv("CRAWL_THROTTLE_SLOW_SECONDS", "10")),
+        )
+    return throttles[site]
+
+
+def metrics() -> dict[str, dict]:
+    """Current rate, latency and outcome counts per site."""
+    return {site: throttle.metrics() for site, throttle in sorted(throttles.items())}
@@ -0,0 +1,289 @@
+import math
+import os
+import re
+import weakref
+import zlib
+from collections import Counter
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobTable
+from jdcrawler.models.profile import UserProfile
+
+# Latin words, or (zero-width, so they overlap) Hangul character bigrams
+_TOKEN = re.compile(r"([a-z0-9+#]+)|(?=([가-힣]{2}))")
+TITLE_WEIGHT = 2
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Latin words are kept whole; Hangul runs are split into character bigrams so
+    that inflected forms ("자바를", "자바") still share features without a
+    morphological analyzer. Single-syllable Hangul words ("및", "등") are dropped.
+    """
+    return [word or bigram for word, bigram in _TOKEN.findall(text.lower())]
+
+
+class JobVectorIndex:
+    """
+    Local, CPU-only TF-IDF vector index over job titles and descriptions.
+
+    Tokens are hashed into `num_buckets` TF-IDF features which are projected
+    to `dim` dimensions with a fixed random sign matrix (cosine similarity is
+    approximately preserved), then L2-normalized. Vectors live in one float32
+    NumPy matrix, so scoring every job against a query is a single mat-vec
+    product. Rows are appended incrementally as jobs are inserted; IDF weights
+    use the document frequencies known at insert time. Each row remembers the
+    content_hash of the job it was embedded from, so sync() can tell which
+    jobs another process added or changed.
+    """
+
+    def __init__(self, dim: int = 256, num_buckets: int = 1 << 15, seed: int = 42):
+        self.dim = dim
+        self.num_buckets = num_buckets
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        signs = rng.integers(0, 2, size=(num_buckets, dim), dtype=np.int8) * 2 - 1
+        self.projection = signs.astype(np.float32) / math.sqrt(dim)
+
+        self.doc_freq = np.zeros(num_buckets, dtype=np.int64)
+        self.num_docs = 0
+        self._matrix = np.zeros((1024, dim), dtype=np.float32)
+        self._ids = np.zeros(1024, dtype=np.int64)
+        self._rows: dict[int, int] = {}
+        # job id -> content_hash the row was embedded from
+        self._hashes: dict[int, str | None] = {}
+        self.size = 0
+        self.dirty = False
+        # token -> bucket memo; the vocabulary of job postings is small
+        self._buckets: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def max_id(self) -> int:
+        return int(self._ids[: self.size].max()) if self.size else 0
+
+    def _bucket(self, token: str) -> int:
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            bucket = zlib.crc32(token.encode("utf-8")) & (self.num_buckets - 1)
+            self._buckets[token] = bucket
+        return bucket
+
+    def _features(self, title: str, description: str | None) -> tuple[np.ndarray, np.ndarray]:
+        token_counts = Counter(tokenize(description or ""))
+        for token in tokenize(title):
+            token_counts[token] += TITLE_WEIGHT
+        counts: Counter[int] = Counter()
+        for token, count in token_counts.items():
+            counts[self._bucket(token)] += count
+        if not counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        buckets = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        return buckets, 1.0 + np.log(tf)
+
+    def _embed(self, buckets: np.ndarray, tf: np.ndarray) -> np.ndarray:
+        if not len(buckets):
+            return np.zeros(self.dim, dtype=np.float32)
+        idf = np.log((1.0 + self.num_docs) / (1.0 + self.doc_freq[buckets])) + 1.0
+        vector = (tf * idf.astype(np.float32)) @ self.projection[buckets]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def vectorize(self, text: str) -> np.ndarray:
+        """Embed a free-text query without changing document frequencies."""
+        return self._embed(*self._features("", text))
+
+    def add(self, job_id: int, title: str, description: str | None, content_hash: str | None = None) -> None:
+        """Insert a job, or re-embed it if it is already indexed."""
+        self.add_many([(job_id, title, description)], [content_hash])
+
+    def add_many(
+        self, jobs: list[tuple[int, str, str | None]], content_hashes: list[str | None] | None = None
+    ) -> None:
+        """
+        Insert a batch of (job_id, title, description), with the jobs'
+        content_hash if known. Document frequencies are updated for the whole
+        batch before embedding, so a bulk build weights every row with the
+        batch's IDF rather than a partial one.
+        """
+        if content_hashes is None:
+            content_hashes = [None] * len(jobs)
+        for (job_id, _, _), digest in zip(jobs, content_hashes, strict=True):
+            self._hashes[job_id] = digest
+        features = []
+        for job_id, title, description in jobs:
+            buckets, tf = self._features(title, description)
+            if job_id not in self._rows:
+                self.doc_freq[buckets] += 1
+                self.num_docs += 1
+            features.append((job_id, buckets, tf))
+
+        for job_id, buckets, tf in features:
+            row = self._rows.get(job_id)
+            if row is None:
+                if self.size == len(self._ids):
+                    self._grow()
+                row = self.size
+                self._rows[job_id] = row
+                self._ids[row] = job_id
+                self.size += 1
+            self._matrix[row] = self._embed(buckets, tf)
+        if features:
+            self.dirty = True
+
+    def remove(self, job_ids: list[int]) -> None:
+        for job_id in job_ids:
+            row = self._rows.pop(job_id, None)
+            if row is None:
+                continue
+            self._hashes.pop(job_id, None)
+            last = self.size - 1
+            if row != last:
+                # Move the last row into the hole to keep the matrix dense
+                moved_id = int(self._ids[last])
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self.size -= 1
+            self.dirty = True
+
+    def _grow(self) -> None:
+        capacity = len(self._ids) * 2
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[: self.size] = self._matrix[: self.size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[: self.size] = self._ids[: self.size]
+        self._matrix, self._ids = matrix, ids
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every indexed job to the query vector."""
+        return self._matrix[: self.size] @ query
+
+    def top_k(
+        self, query: np.ndarray, k: int = 10, exclude: set[int] | None = None
+    ) -> list[tuple[int, float]]:
+        if not self.size:
+            return []
+        scores = self.scores(query)
+        n = min(len(scores), k + len(exclude or ()))
+        candidates = np.argpartition(-scores, n - 1)[:n]
+        candidates = candidates[np.argsort(-scores[candidates])]
+        results = []
+        for row in candidates:
+            job_id = int(self._ids[row])
+            if exclude and job_id in exclude:
+                continue
+            results.append((job_id, float(scores[row])))
+            if len(results) == k:
+                break
+        return results
+
+    def similar(self, job_id: int, k: int = 10) -> list[tuple[int, float]]:
+        row = self._rows.get(job_id)
+        if row is None:
+            return []
+        return self.top_k(self._matrix[row], k, exclude={job_id})
+
+    def profile_vector(self, profile: UserProfile) -> np.ndarray:
+        parts = [skill.name for skill in profile.tech_stack]
+        parts += [skill.description for skill in profile.tech_stack if skill.description]
+        parts += profile.interest_keywords
+        return self.vectorize(" ".join(parts))
+
+    def sync(self, db: DatabaseClient, chunk_size: int = 1000) -> int:
+        """
+        Catch up with the jobs table: index jobs missing from this index
+        (inserted by another process, or left out of a file another process
+        saved last), re-embed jobs whose content_hash changed and drop jobs no
+        longer stored. Indexed ids are compared with stored ones rather than a
+        high-water mark, so interleaved inserts and saves of several processes
+        never leave a job out. Returns the number of jobs (re-)embedded.
+        """
+        with Session(db.jobs_engine) as session:
+            stored = dict(session.execute(select(JobTable.id, JobTable.content_hash)).all())
+        self.remove([job_id for job_id in self._rows if job_id not in stored])
+        stale = sorted(
+            job_id
+            for job_id, digest in stored.items()
+            if job_id not in self._rows or self._hashes.get(job_id) != digest
+        )
+        for start in range(0, len(stale), chunk_size):
+            with Session(db.jobs_engine) as session:
+                rows = session.execute(
+                    select(JobTable.id, JobTable.title, JobTable.description, JobTable.content_hash)
+                    .where(JobTable.id.in_(stale[start : start + chunk_size]))
+                    .order_by(JobTable.id)
+                ).all()
+            self.add_many(
+                [(job_id, title, description) for job_id, title, description, _ in rows],
+                [digest for *_, digest in rows],
+            )
+        return len(stale)
+
+    def save(self, path: str) -> None:
+        np.savez(
+            path,
+            matrix=self._matrix[: self.size],
+            ids=self._ids[: self.size],
+            # "" for jobs without a content_hash, so the array needs no pickling
+            hashes=np.array([self._hashes.get(int(job_id)) or "" for job_id in self._ids[: self.size]], dtype=str),
+            doc_freq=self.doc_freq,
+            meta=np.array([self.dim, self.num_buckets, self.seed, self.num_docs]),
+        )
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str) -> "JobVectorIndex":
+        data = np.load(path)
+        dim, num_buckets, seed, num_docs = (int(v) for v in data["meta"])
+        index = cls(dim=dim, num_buckets=num_buckets, seed=seed)
+        index.doc_freq = data["doc_freq"]
+        index.num_docs = num_docs
+        size = len(data["ids"])
+        while len(index._ids) < size:
+            index._grow()
+        index._matrix[:size] = data["matrix"]
+        index._ids[:size] = data["ids"]
+        index._rows = {int(job_id): row for row, job_id in enumerate(data["ids"])}
+        if "hashes" in data:
+            index._hashes = {
+                int(job_id): str(digest) or None for job_id, digest in zip(data["ids"], data["hashes"], strict=True)
+            }
+        index.size = size
+        return index
+
+
+_indexes: "weakref.WeakKeyDictionary[DatabaseClient, JobVectorIndex]" = weakref.WeakKeyDictionary()
+
+
+def index_path(db: DatabaseClient) -> str | None:
+    """The index is stored next to the jobs SQLite file (jobs.db -> jobs.vectors.npz)."""
+    database = db.jobs_engine.url.database
+    if not database or database == ":memory:":
+        return None
+    return os.path.splitext(database)[0] + ".vectors.npz"
+
+
+def get_vector_index(db: DatabaseClient) -> JobVectorIndex:
+    """Return the index for this database, loading it and catching up with the jobs table."""
+    index = _indexes.get(db)
+    if index is None:
+        path = index_path(db)
+        index = JobVectorIndex.load(path) if path and os.path.exists(path) else JobVectorIndex()
+        _indexes[db] = index
+    index.sync(db)
+    return index
+
+
+def save_vector_index(db: DatabaseClient) -> None:
+    index = _indexes.get(db)
+    path = index_path(db)
+    if index is not None and index.dirty and path:
+        index.save(path)
@@ -0,0 +1,417 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, case, func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import CrawlTaskTable
+
+
+class QueueTask:
+    """One task of the crawl work queue, as handed to a worker."""
+
+    def __init__(
+        self,
+        id: int | str,
+        run_id: str,
+        kind: str,
+        payload: dict,
+        state: str = "queued",
+        attempts: int = 0,
+        result: dict | None = None,
+        error: str | None = None,
+    ):
+        self.id = id
+        self.run_id = run_id
+        self.kind = kind
+        self.payload = payload
+        self.state = state
+        self.attempts = attempts
+        self.result = result
+        self.error = error
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("done", "failed", "cancelled")
+
+
+class WorkQueue(ABC):
+    """
+    Shared queue of crawl tasks. Two kinds: "unit" ({keyword, site}) and
+    "details" ({site, job_ids}). A worker claims a task for visibility,
+    extends the claim while it works and completes it with a result; a claim
+    that runs out (the worker died) is handed to another worker. Claims keep
+    at most site_concurrency tasks per site in flight across all workers,
+    so adding workers never adds load on a single site beyond that limit.
+    A task whose claims ran out max_attempts times (it keeps killing or
+    hanging its worker) fails instead of going back to the queue.
+    """
+
+    ABANDONED = "abandoned: the worker's claim expired"
+
+    def __init__(
+        self,
+        site_concurrency: int | None = None,
+        visibility: timedelta | None = None,
+        max_attempts: int | None = None,
+    ):
+        self.site_concurrency = site_concurrency or int(os.getenv("CRAWL_SITE_CONCURRENCY", "1"))
+        self.visibility = visibility or timedelta(seconds=int(os.getenv("CRAWL_TASK_VISIBILITY_SECONDS", "300")))
+        self.max_attempts = max_attempts or int(os.getenv("CRAWL_TASK_MAX_ATTEMPTS", "3"))
+
+    @abstractmethod
+    def put(self, run_id: str, kind: str, payloads: list[dict]) -> list:
+        pass
+
+    @abstractmethod
+    def claim(self, worker: str) -> QueueTask | None:
+        pass
+
+    @abstractmethod
+    def extend(self, task_id, worker: str) -> bool:
+        pass
+
+    @abstractmethod
+    def complete(self, task_id, worker: str, result: dict) -> bool:
+        """Record the result of worker's claim; False if the claim was lost to another worker."""
+
+    @abstractmethod
+    def fail(self, task_id, worker: str, error: str) -> bool:
+        """Requeue worker's claimed task, or give up after max_attempts; False if the claim was lost."""
+
+    @abstractmethod
+    def tasks(self, run_id: str) -> list[QueueTask]:
+        pass
+
+    @abstractmethod
+    def cancel(self, run_id: str) -> int:
+        """Drop the run's queued tasks; claimed ones finish on their worker."""
+
+    @abstractmethod
+    def stats(self) -> dict[str, int]:
+        pass
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """WorkQueue on the crawl_tasks table of the jobs database; the default backend."""
+
+    def __init__(self, db: DatabaseClient, **options):
+        super().__init__(**options)
+        self.db = db
+
+    def put(self, run_id: str, kind: str, payloads: list[dict]) -> list[int]:
+        now = datetime.now()
+        rows = [
+            CrawlTaskTable(
+                run_id=run_id,
+                kind=kind,
+                site=payload["site"],
+                payload=json.dumps(payload, ensure_ascii=False),
+                state="queued",
+                created_at=now,
+                updated_at=now,
+            )
+            for payload in payloads
+        ]
+        with Session(self.db.jobs_engine) as session:
+            session.add_all(rows)
+            session.commit()
+            return [row.id for row in rows]
+
+    def _retry_state(self):
+        return case((CrawlTaskTable.attempts < self.max_attempts, "queued"), else_="failed")
+
+    def _recover(self, session: Session, now: datetime) -> None:
+        session.execute(
+            update(CrawlTaskTable)
+            .where(CrawlTaskTable.state == "claimed", CrawlTaskTable.claimed_until < now)
+            .values(state=self._retry_state(), error=self.ABANDONED, worker=None, claimed_until=None, updated_at=now)
+        )
+
+    def claim(self, worker: str) -> QueueTask | None:
+        now = datetime.now()
+        with Session(self.db.jobs_engine) as session:
+            self._recover(session, now)
+            session.commit()
+            candidates = session.execute(
+                select(CrawlTaskTable.id, CrawlTaskTable.site)
+                .where(CrawlTaskTable.state == "queued")
+                .order_by(CrawlTaskTable.id)
+                .limit(20)
+            ).all()
+            busy_sites = set()
+            for task_id, site in candidates:
+                if site in busy_sites:
+                    continue
+                # The per-site limit is checked in the UPDATE itself, so two
+                # workers claiming at once cannot both take the last slot
+                others = aliased(CrawlTaskTable)
+                in_flight = (
+                    select(func.count())
+                    .select_from(others)
+                    .where(others.site == site, others.state == "claimed")
+                    .scalar_subquery()
+                )
+                claimed = session.execute(
+                    update(CrawlTaskTable)
+                    .where(
+                        and_(CrawlTaskTable.id == task_id, CrawlTaskTable.state == "queued"),
+                        in_flight < self.site_concurrency,
+                    )
+                    .values(
+                        state="claimed",
+                        worker=worker,
+                        claimed_until=now + self.visibility,
+                        attempts=CrawlTaskTable.attempts + 1,
+                        updated_at=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                session.commit()
+                if claimed == 1:
+                    return self._to_task(session.get(CrawlTaskTable, task_id))
+                busy_sites.add(site)
+        return None
+
+    def extend(self, task_id: int, worker: str) -> bool:
+        now = datetime.now()
+        with Session(self.db.jobs_engine) as session:
+            extended = session.execute(
+                update(CrawlTaskTable)
+                .where(CrawlTaskTable.id == task_id, CrawlTaskTable.worker == worker, CrawlTaskTable.state == "claimed")
+                .values(claimed_until=now + self.visibility, updated_at=now)
+            ).rowcount
+            session.commit()
+        return extended == 1
+
+    def complete(self, task_id: int, worker: str, result: dict) -> bool:
+        with Session(self.db.jobs_engine) as session:
+            completed = session.execute(
+                update(CrawlTaskTable)
+                .where(CrawlTaskTable.id == task_id, CrawlTaskTable.worker == worker, CrawlTaskTable.state == "claimed")
+                .values(
+                    state="done",
+                    result=json.dumps(result, ensure_ascii=False, default=str),
+                    claimed_until=None,
+                    updated_at=datetime.now(),
+                )
+            ).rowcount
+            session.commit()
+        return completed == 1
+
+    def fail(self, task_id: int, worker: str, error: str) -> bool:
+        with Session(self.db.jobs_engine) as session:
+            failed = session.execute(
+                update(CrawlTaskTable)
+                .where(CrawlTaskTable.id == task_id, CrawlTaskTable.worker == worker, CrawlTaskTable.state == "claimed")
+                .values(
+                    state=self._retry_state(),
+                    error=error[:500],
+                    worker=None,
+                    claimed_until=None,
+                    updated_at=datetime.now(),
+                )
+            ).rowcount
+            session.commit()
+        return failed == 1
+
+    def tasks(self, run_id: str) -> list[QueueTask]:
+        with Session(self.db.jobs_engine) as session:
+            rows = session.execute(
+                select(CrawlTaskTable).where(CrawlTaskTable.run_id == run_id).order_by(CrawlTaskTable.id)
+            ).scalars()
+            return [self._to_task(row) for row in rows]
+
+    def cancel(self, run_id: str) -> int:
+        with Session(self.db.jobs_engine) as session:
+            cancelled = session.execute(
+                update(CrawlTaskTable)
+                .where(CrawlTaskTable.run_id == run_id, CrawlTaskTable.state == "queued")
+                .values(state="cancelled", updated_at=datetime.now())
+            ).rowcount
+            session.commit()
+        return cancelled
+
+    def stats(self) -> dict[str, int]:
+        with Session(self.db.jobs_engine) as session:
+            self._recover(session, datetime.now())
+            session.commit()
+            rows = session.execute(
+                select(CrawlTaskTable.state, func.count()).group_by(CrawlTaskTable.state)
+            ).all()
+        return {"queued": 0, "claimed": 0, **dict(rows)}
+
+    @staticmethod
+    def _to_task(row: CrawlTaskTable) -> QueueTask:
+        return QueueTask(
+            row.id,
+            row.run_id,
+            row.kind,
+            json.loads(row.payload),
+            state=row.state,
+            attempts=row.attempts,
+            result=json.loads(row.result) if row.result else None,
+            error=row.error,
+        )
+
+
+class RedisWorkQueue(WorkQueue):
+    """
+    WorkQueue on a Redis-compatible server, for workers on several hosts.
+    Tasks are hashes, queued ids are kept in one list per site and claims in
+    a sorted set scored by their deadline; a per-site counter enforces
+    site_concurrency. Requires the optional `redis` package.
+    """
+
+    prefix = "jdcrawler:"
+
+    def __init__(self, url: str | None = None, client=None, **options):
+        super().__init__(**options)
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("CRAWL_QUEUE_BACKEND=redis requires the redis package (pip install redis)") from e
+            client = redis.Redis.from_url(
+                url or os.getenv("CRAWL_QUEUE_URL", "redis://localhost:6379/0"), decode_responses=True
+            )
+        self.redis = client
+
+    def _key(self, *parts) -> str:
+        return self.prefix + ":".join(str(part) for part in parts)
+
+    def put(self, run_id: str, kind: str, payloads: list[dict]) -> list[str]:
+        ids = []
+        for payload in payloads:
+            task_id = str(self.redis.incr(self._key("task_seq")))
+            site = payload["site"]
+            self.redis.hset(
+                self._key("task", task_id),
+                mapping={
+                    "run_id": run_id,
+                    "kind": kind,
+                    "site": site,
+                    "payload": json.dumps(payload, ensure_ascii=False),
+                    "state": "queued",
+                    "attempts": 0,
+                },
+            )
+            self.redis.sadd(self._key("sites"), site)
+            self.redis.rpush(self._key("run", run_id), task_id)
+            self.redis.lpush(self._key("queue", site), task_id)
+            ids.append(task_id)
+        return ids
+
+    def _release_slot(self, task_id: str) -> bool:
+        """Drop the task's claim and free its site slot; False if the claim was already gone."""
+        # Only the caller whose ZREM removed the claim frees the slot, so
+        # workers recovering or finishing the same task at once do it once
+        if self.redis.zrem(self._key("claimed"), task_id) != 1:
+            return False
+        self.redis.decr(self._key("active", self.redis.hget(self._key("task", task_id), "site")))
+        return True
+
+    def _owns(self, task_id: str, worker: str) -> bool:
+        key = self._key("task", task_id)
+        return self.redis.hget(key, "worker") == worker and self.redis.hget(key, "state") == "claimed"
+
+    def _recover(self) -> None:
+        now = datetime.now().timestamp()
+        for task_id in self.redis.zrangebyscore(self._key("claimed"), "-inf", now):
+            if not self._release_slot(task_id):
+                # Recovered or finished by another worker since the range was read
+                continue
+            self._requeue_or_fail(task_id, self.ABANDONED)
+
+    def claim(self, worker: str) -> QueueTask | None:
+        self._recover()
+        for site in sorted(self.redis.smembers(self._key("sites"))):
+            active = self._key("active", site)
+            if self.redis.incr(active) > self.site_concurrency:
+                self.redis.decr(active)
+                continue
+            task_id = self.redis.rpop(self._key("queue", site))
+            if task_id is None:
+                self.redis.decr(active)
+                continue
+            key = self._key("task", task_id)
+            self.redis.hset(key, mapping={"state": "claimed", "worker": worker})
+            self.redis.hincrby(key, "attempts", 1)
+            self.redis.zadd(self._key("claimed"), {task_id: (datetime.now() + self.visibility).timestamp()})
+            return self._task(task_id)
+        return None
+
+    def extend(self, task_id: str, worker: str) -> bool:
+        if not self._owns(task_id, worker):
+            return False
+        self.redis.zadd(self._key("claimed"), {task_id: (datetime.now() + self.visibility).timestamp()})
+        return True
+
+    def complete(self, task_id: str, worker: str, result: dict) -> bool:
+        if not self._owns(task_id, worker) or not self._release_slot(task_id):
+            return False
+        self.redis.hset(
+            self._key("task", task_id),
+            mapping={"state": "done", "result": json.dumps(result, ensure_ascii=False, default=str)},
+        )
+        return True
+
+    def fail(self, task_id: str, worker: str, error: str) -> bool:
+        if not self._owns(task_id, worker) or not self._release_slot(task_id):
+            return False
+        self._requeue_or_fail(task_id, error)
+        return True
+
+    def _requeue_or_fail(self, task_id: str, error: str) -> None:
+        key = self._key("task", task_id)
+        if int(self.redis.hget(key, "attempts") or 0) < self.max_attempts:
+            self.redis.hset(key, mapping={"state": "queued", "worker": "", "error": error[:500]})
+            self.redis.rpush(self._key("queue", self.redis.hget(key, "site")), task_id)
+        else:
+            self.redis.hset(key, mapping={"state": "failed", "worker": "", "error": error[:500]})
+
+    def tasks(self, run_id: str) -> list[QueueTask]:
+        return [self._task(task_id) for task_id in self.redis.lrange(self._key("run", run_id), 0, -1)]
+
+    def cancel(self, run_id: str) -> int:
+        cancelled = 0
+        for task in self.tasks(run_id):
+            if task.state == "queued":
+                self.redis.lrem(self._key("queue", task.payload["site"]), 0, task.id)
+                self.redis.hset(self._key("task", task.id), "state", "cancelled")
+                cancelled += 1
+        return cancelled
+
+    def stats(self) -> dict[str, int]:
+        self._recover()
+        sites = self.redis.smembers(self._key("sites"))
+        return {
+            "queued": sum(self.redis.llen(self._key("queue", site)) for site in sites),
+            "claimed": self.redis.zcard(self._key("claimed")),
+        }
+
+    def _task(self, task_id: str) -> QueueTask:
+        data = self.redis.hgetall(self._key("task", task_id))
+        return QueueTask(
+            task_id,
+            data["run_id"],
+            data["kind"],
+            json.loads(data["payload"]),
+            state=data["state"],
+            attempts=int(data.get("attempts") or 0),
+            result=json.loads(data["result"]) if data.get("result") else None,
+            error=data.get("error") or None,
+        )
+
+
+def get_work_queue(db: DatabaseClient) -> WorkQueue:
+    """The queue backend selected by CRAWL_QUEUE_BACKEND (sqlite or redis)."""
+    backend = os.getenv("CRAWL_QUEUE_BACKEND", "sqlite")
+    if backend == "redis":
+        return RedisWorkQueue()
+    if backend != "sqlite":
+        raise ValueError(f"Unknown CRAWL_QUEUE_BACKEND: {backend}")
+    return SQLiteWorkQueue(db)
@@ -0,0 +1,57 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Per site: pattern for the stable posting ID in any link variant, and the
+# canonical URL built from it
+SITE_PATTERNS: dict[str, tuple[re.Pattern, str]] = {
+    # ".../jobs/view?rec_idx=123", ".../jobs/relay/view?view_type=search&rec_idx=123",
+    # ".../jobs/relay/view/rec_idx/123"
+    "saramin": (
+        re.compile(r"rec_idx[=/](\d+)", re.IGNORECASE),
+        "https://www.saramin.co.kr/zf_user/jobs/relay/view?rec_idx={}",
+    ),
+    # "/Recruit/GI_Read/123?Oem_Code=C1&logpath=1"
+    "jobkorea": (
+        re.compile(r"/recruit/gi_read/(\d+)", re.IGNORECASE),
+        "https://www.jobkorea.co.kr/Recruit/GI_Read/{}",
+    ),
+    # "/wd/123", "/wd/123?referer_id=..."
+    "wanted": (
+        re.compile(r"/wd/(\d+)", re.IGNORECASE),
+        "https://www.wanted.co.kr/wd/{}",
+    ),
+}
+
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|ref|referer_id|logpath|oem_code|searchword|search_uuid)$", re.IGNORECASE)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Generic cleanup for links without a known posting ID: https, lower-case
+    host, no fragment, no tracking parameters, sorted query, no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(key)
+    )
+    path = parts.path.rstrip("/") or "/"
+    scheme = "https" if parts.scheme in ("http", "https", "") else parts.scheme
+    return urlunsplit((scheme, parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def canonicalize(site: str, url: str) -> tuple[str, str]:
+    """
+    (external_id, canonical_url) of a posting link. external_id is the site's
+    posting ID; links without one fall back to their normalized URL, so every
+    posting still has a (site, external_id) key.
+    """
+    known = SITE_PATTERNS.get(site)
+    if known:
+        pattern, template = known
+        match = pattern.search(url)
+        if match:
+            return match.group(1), template.format(match.group(1))
+    canonical = normalize_url(url)
+    return canonical, canonical
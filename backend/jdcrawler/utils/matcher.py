@@ -0,0 +1,118 @@
+from collections import deque
+from collections.abc import Iterable
+
+# Characters treated as part of a word when checking term boundaries.
+# '+' and '#' are included so that "C" does not match inside "C++" or "C#".
+WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+#")
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton that finds every occurrence of many terms in a
+    single pass over the text.
+
+    Matching is case-insensitive. Short ASCII terms (e.g. "C", "Go", "AWS")
+    only match on word boundaries, so "Go" does not hit "Google" and "C" does
+    not hit "C++". Longer terms and Korean terms keep plain substring
+    semantics ("자바" still matches "자바를"). With boundary_max_len=None the
+    ASCII ends of terms of any length respect word boundaries, so "Scala"
+    does not hit "scalable" either.
+    """
+
+    def __init__(self, terms: Iterable[str], boundary_max_len: int | None = 3):
+        self.boundary_max_len = boundary_max_len
+        self.terms: list[str] = []
+        self._index: dict[str, int] = {}
+        for term in terms:
+            normalized = self.normalize(term)
+            if normalized and normalized not in self._index:
+                self._index[normalized] = len(self.terms)
+                self.terms.append(normalized)
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        # Fully resolved transitions (goto + failure links) so scanning is a
+        # single dict lookup per character
+        self._delta: list[dict[str, int]] = []
+        self._build()
+
+    @staticmethod
+    def normalize(term: str) -> str:
+        return term.strip().lower()
+
+    def _build(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+
+        for term_idx, term in enumerate(self.terms):
+            node = 0
+            for ch in term:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    fail.append(0)
+                    out.append(())
+                    goto[node][ch] = nxt
+                node = nxt
+            out[node] = out[node] + (term_idx,)
+
+        # Breadth-first pass to compute failure links and merged outputs.
+        # Parents are visited before children, so delta[fail[child]] is
+        # always complete by the time the child inherits from it.
+        delta: list[dict[str, int]] = [{} for _ in goto]
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            if node:
+                delta[node] = {**delta[fail[node]], **goto[node]}
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[child] = target if target != child else 0
+                out[child] = out[child] + out[fail[child]]
+        self._delta = delta
+        self._boundary = [self._needs_boundary(term) for term in self.terms]
+
+    def _needs_boundary(self, term: str) -> bool:
+        if self.boundary_max_len is not None and len(term) > self.boundary_max_len:
+            return False
+        return term[0] in WORD_CHARS or term[-1] in WORD_CHARS
+
+    def scan(self, text: str) -> dict[str, list[int]]:
+        """
+        Return a mapping of matched (normalized) term -> start positions.
+        Terms that do not occur are omitted.
+        """
+        hits: dict[str, list[int]] = {}
+        if not self.terms or not text:
+            return hits
+
+        lowered = text.lower()
+        delta, out, terms, boundary = self._delta, self._out, self.terms, self._boundary
+        text_len = len(lowered)
+        node = 0
+
+        for pos, ch in enumerate(lowered):
+            node = delta[node].get(ch, 0)
+            if not out[node]:
+                continue
+
+            for term_idx in out[node]:
+                term = terms[term_idx]
+                start = pos - len(term) + 1
+                if boundary[term_idx]:
+                    if term[0] in WORD_CHARS and start > 0 and lowered[start - 1] in WORD_CHARS:
+                        continue
+                    if term[-1] in WORD_CHARS and pos + 1 < text_len and lowered[pos + 1] in WORD_CHARS:
+                        continue
+                hits.setdefault(term, []).append(start)
+
+        return hits
+
+    def count(self, text: str) -> dict[str, int]:
+        return {term: len(positions) for term, positions in self.scan(text).items()}
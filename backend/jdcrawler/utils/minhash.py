@@ -0,0 +1,79 @@
+import hashlib
+import re
+import zlib
+
+import numpy as np
+
+# Mersenne prime for the universal hash family; a * x stays below 2**62,
+# so the arithmetic never overflows uint64
+_PRIME = (1 << 31) - 1
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def shingles(text: str, k: int = 5) -> set[str]:
+    """
+    Character k-shingles of the text with case, whitespace and punctuation
+    removed, so the same posting formatted differently by two sites still
+    produces the same shingles.
+    """
+    normalized = _NON_WORD.sub("", text.lower())
+    if len(normalized) <= k:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + k] for i in range(len(normalized) - k + 1)}
+
+
+class MinHasher:
+    """
+    MinHash signatures and LSH band keys for near-duplicate detection.
+
+    Two documents whose shingle sets have Jaccard similarity s share at least
+    one band with probability 1 - (1 - s^rows)^bands. With the defaults
+    (128 permutations, 16 bands of 8 rows) the threshold where that reaches
+    50% is about 0.7. Texts with fewer than min_shingles shingles get no
+    signature: a couple of shared lines would make them look like duplicates.
+    """
+
+    def __init__(self, num_perm: int = 128, num_bands: int = 16, seed: int = 1, min_shingles: int = 50):
+        if num_perm % num_bands:
+            raise ValueError("num_perm must be a multiple of num_bands")
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+        self.rows = num_perm // num_bands
+        self.min_shingles = min_shingles
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """uint32 signature of length num_perm, or None for (too) short text."""
+        shingle_set = shingles(text)
+        if not shingle_set or len(shingle_set) < self.min_shingles:
+            return None
+        hashed = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) % _PRIME for s in shingle_set),
+            dtype=np.uint64,
+            count=len(shingle_set),
+        )
+        return ((self._a * hashed + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def bands(self, signature: np.ndarray) -> list[int]:
+        """One signed 64-bit key per band (fits an SQLite INTEGER)."""
+        keys = []
+        for band in range(self.num_bands):
+            chunk = signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "big", signed=True))
+        return keys
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the two documents."""
+        return float(np.mean(a == b))
+
+    @staticmethod
+    def to_bytes(signature: np.ndarray) -> bytes:
+        return signature.astype(np.uint32).tobytes()
+
+    @staticmethod
+    def from_bytes(data: bytes) -> np.ndarray:
+        return np.frombuffer(data, dtype=np.uint32)
@@ -0,0 +1,171 @@
+import re
+from datetime import date, datetime, timedelta
+
+from jdcrawler.utils.regions import gazetteer
+
+# "3~5년", "3-5년", "3년~5년"
+_YEAR_RANGE = re.compile(r"(\d+)\s*년?\s*[~\-–]\s*(\d+)\s*년")
+_YEARS = re.compile(r"(\d+)\s*년")
+_AT_LEAST = re.compile(r"이상|최소|↑|\+")
+_AT_MOST = re.compile(r"이하|미만|최대|↓")
+_OPEN_END = ("~", "-", "–")
+
+_EOK = re.compile(r"(\d+(?:\.\d+)?)\s*억")
+_MAN = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(천)?")
+_SALARY_SPLIT = re.compile(r"[~\-–]")
+_UNDISCLOSED = re.compile(r"내규|협의|면접\s*후|결정")
+# Hourly and daily wages cannot be annualized without knowing the hours worked
+_NOT_ANNUALIZABLE = re.compile(r"시급|일급|시간당|일당")
+
+_FULL_DATE = re.compile(r"(\d{4})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})")
+_MONTH_DAY = re.compile(r"(\d{1,2})\s*[.\-/월]\s*(\d{1,2})")
+_D_DAY = re.compile(r"d\s*-\s*(\d+)", re.IGNORECASE)
+
+
+def parse_experience(text: str | None) -> tuple[int | None, int | None]:
+    """
+    Parse an experience requirement into (min_years, max_years).
+
+    "신입" -> (0, 0), "경력무관" / "신입·경력" -> (0, None),
+    "경력 3~5년" -> (3, 5), "경력 3년 이상" -> (3, None), "5년~" -> (5, None),
+    "경력 5년 이하" / "~5년" -> (0, 5). Unrecognized text gives (None, None).
+    """
+    if not text:
+        return None, None
+    text = text.replace(" ", "")
+    if "무관" in text:
+        return 0, None
+
+    newcomer = "신입" in text
+    match = _YEAR_RANGE.search(text)
+    if match:
+        low, high = int(match.group(1)), int(match.group(2))
+        return (0 if newcomer else low), high
+
+    match = _YEARS.search(text)
+    if match:
+        years = int(match.group(1))
+        if _AT_MOST.search(text) or text[: match.start()].endswith(_OPEN_END):
+            return 0, years
+        if newcomer:
+            # "신입·경력 3년↑": newcomers are welcome too
+            return 0, None
+        if _AT_LEAST.search(text) or "경력" in text or text[match.end() :].startswith(_OPEN_END):
+            return years, None
+        return years, years
+
+    if newcomer:
+        return (0, None) if "경력" in text else (0, 0)
+    return None, None
+
+
+def _parse_amount(text: str) -> int | None:
+    """Amount in 만원 ("3,500", "5천", "1억 2,000") -> KRW."""
+    eok = _EOK.search(text)
+    man = _MAN.search(text[eok.end() :] if eok else text)
+    if not eok and not man:
+        return None
+    amount = float(eok.group(1)) * 100_000_000 if eok else 0.0
+    if man:
+        value = float(man.group(1).replace(",", ""))
+        if man.group(2):
+            value *= 1000
+        if not eok and "만" not in text and "천" not in text and value >= 100_000:
+            # Already written in won ("연봉 35,000,000원")
+            return int(value)
+        amount += value * 10_000
+    return int(amount)
+
+
+def parse_salary(text: str | None) -> tuple[int | None, int | None]:
+    """
+    Parse a salary into an annual (min_krw, max_krw) range.
+
+    "3,000~4,000만원" -> (30000000, 40000000), "연봉 5,000만원 이상" ->
+    (50000000, None), "최대 8,000" -> (None, 80000000), "월급 300만원" ->
+    (36000000, 36000000). "회사내규에 따름", "면접 후 결정", hourly or daily
+    wages ("시급 10,000원") and unparseable text give (None, None).
+    """
+    if not text or _UNDISCLOSED.search(text) or _NOT_ANNUALIZABLE.search(text):
+        return None, None
+    multiplier = 12 if "월" in text else 1
+    parts = [part for part in _SALARY_SPLIT.split(text) if part.strip()]
+    if not parts:
+        return None, None
+
+    amounts = []
+    for i, part in enumerate(parts[:2]):
+        # "3,000~4,000만원": the unit is only written after the upper bound
+        if i == 0 and len(parts) == 2 and not re.search(r"[만억천원]", part):
+            part += "만원"
+        amount = _parse_amount(part)
+        if amount is not None:
+            amounts.append(amount * multiplier)
+    if not amounts:
+        return None, None
+    if len(amounts) == 2:
+        return min(amounts), max(amounts)
+    if _AT_MOST.search(text) or text.strip().startswith(_OPEN_END):
+        return None, amounts[0]
+    if _AT_LEAST.search(text) or text.strip().endswith(_OPEN_END):
+        return amounts[0], None
+    return amounts[0], amounts[0]
+
+
+def parse_deadline(text: str | None, reference: datetime | date | None = None) -> date | None:
+    """
+    Parse a deadline into a date. Year-less dates ("~02.28(금)") are resolved
+    against the reference date (when the posting was crawled) and rolled into
+    the next year if they would otherwise lie in the past.
+    "오늘마감", "내일마감" and "D-7" are relative to the reference date;
+    "상시채용", "채용시 마감" and other open-ended deadlines give None.
+    """
+    if not text:
+        return None
+    if isinstance(reference, datetime):
+        reference = reference.date()
+    reference = reference or date.today()
+
+    if "오늘" in text:
+        return reference
+    if "내일" in text:
+        return reference + timedelta(days=1)
+    match = _D_DAY.search(text)
+    if match:
+        return reference + timedelta(days=int(match.group(1)))
+
+    match = _FULL_DATE.search(text)
+    try:
+        if match:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        match = _MONTH_DAY.search(text)
+        if match:
+            month, day = int(match.group(1)), int(match.group(2))
+            deadline = date(reference.year, month, day)
+            if deadline < reference - timedelta(days=1):
+                deadline = date(reference.year + 1, month, day)
+            return deadline
+    except ValueError:
+        # 02.30 and the like
+        return None
+    return None
+
+
+def structured_fields(
+    experience: str | None,
+    salary: str | None,
+    deadline: str | None,
+    reference: datetime | date | None = None,
+    location: str | None = None,
+) -> dict:
+    """Structured column values for the raw experience/salary/deadline/location strings."""
+    experience_min, experience_max = parse_experience(experience)
+    salary_min, salary_max = parse_salary(salary)
+    return {
+        "experience_min_years": experience_min,
+        "experience_max_years": experience_max,
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "deadline_date": parse_deadline(deadline, reference),
+        "region_code": gazetteer.resolve(location),
+    }
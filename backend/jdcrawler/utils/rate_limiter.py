@@ -1,5 +1,7 @@
 import asyncio
 import random
+import time
+from collections import deque
 
 
 class RateLimiter:
@@ -20,3 +22,129 @@ class RateLimiter:
             await asyncio.sleep(wait_time)
             
         self._last_call = loop.time()
+
+
+class AdaptiveRateLimiter:
+    """
+    AIMD request rate for one site, shared by every crawler of the site in
+    the process. Each healthy response raises the rate by `increase`
+    requests per minute; trouble (a timeout, an error or 5xx, a 429, a
+    response slower than slow_seconds) multiplies it by `decrease`, at most
+    once per cooldown so one incident seen by several requests in flight
+    backs off once. A block page (403, captcha) drops straight to min_rate.
+    Requests are spaced 60 / rate seconds apart plus up to `jitter` of that.
+    """
+
+    OUTCOMES = ("ok", "slow", "timeout", "error", "throttled", "blocked")
+
+    def __init__(
+        self,
+        initial_rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        slow_seconds: float = 10.0,
+        jitter: float = 0.5,
+        cooldown: float = 30.0,
+        window: int = 50,
+    ):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_seconds = slow_seconds
+        self.jitter = jitter
+        self.cooldown = cooldown
+        self.counts = dict.fromkeys(self.OUTCOMES, 0)
+        # Outcomes of the last `window` requests, for timeout and error rates
+        self.recent: deque[str] = deque(maxlen=window)
+        self.latency: float | None = None
+        self.backoffs = 0
+        self.last_signal: str | None = None
+        self._last_backoff: float | None = None
+        self._next_at = 0.0
+
+    @property
+    def delay(self) -> float:
+        return 60.0 / self.rate
+
+    async def acquire(self):
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+        # Reserve the next slot before sleeping, so concurrent callers queue up
+        start = max(now, self._next_at)
+        self._next_at = start + self.delay * (1 + random.random() * self.jitter)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def record(self, outcome: str, latency: float | None = None) -> None:
+        """Feed back one response: an OUTCOMES value and its latency in seconds."""
+        if latency is not None:
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            if outcome == "ok" and latency > self.slow_seconds:
+                outcome = "slow"
+        self.counts[outcome] += 1
+        self.recent.append(outcome)
+        if outcome == "ok":
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            return
+        self.last_signal = outcome
+        now = time.monotonic()
+        if outcome == "blocked":
+            self.rate = self.min_rate
+        elif self._last_backoff is None or now - self._last_backoff >= self.cooldown:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+        else:
+            return
+        self._last_backoff = now
+        self.backoffs += 1
+
+    def metrics(self) -> dict:
+        recent = len(self.recent) or 1
+        return {
+            "rate_per_minute": round(self.rate, 2),
+            "delay_seconds": round(self.delay, 2),
+            "latency_seconds": round(self.latency, 3) if self.latency is not None else None,
+            "requests": sum(self.counts.values()),
+            "outcomes": dict(self.counts),
+            "timeout_rate": round(self.recent.count("timeout") / recent, 3),
+            "error_rate": round(sum(outcome != "ok" for outcome in self.recent) / recent, 3),
+            "backoffs": self.backoffs,
+            "last_signal": self.last_signal,
+        }
+
+
+class TokenBucket:
+    """
+    Async token bucket: refills at `rate` units per second up to `capacity`.
+    Used for request-per-minute and token-per-minute budgets.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self._updated_at is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, amount: float = 1.0):
+        # Requests larger than the bucket would never fit; let them drain it instead
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            loop = asyncio.get_event_loop()
+            self._refill(loop.time())
+            if self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+                self._refill(loop.time())
+            self._tokens -= amount
+
+    def consume(self, amount: float) -> None:
+        """Settle a difference after the fact (negative amounts refund)."""
+        self._tokens = min(self.capacity, self._tokens - amount)
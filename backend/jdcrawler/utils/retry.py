@@ -1,4 +1,6 @@
 import asyncio
+import time
+from collections import deque
 
 
 def retry(max_attempts: int = 3, delay: float = 1.0):
@@ -16,3 +18,168 @@ def retry(max_attempts: int = 3, delay: float = 1.0):
         return wrapper
 
     return decorator
+
+
+class CircuitOpen(Exception):
+    """The site's circuit breaker is open: requests fail fast until it probes again."""
+
+
+class CircuitBreaker:
+    """
+    closed: requests pass; failure_threshold consecutive failures open it.
+    open: requests fail fast with CircuitOpen for reset_timeout.
+    half_open: one probe request passes; success closes, failure reopens.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trips = 0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._probing = False
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def before_request(self) -> None:
+        if not self.allow():
+            raise CircuitOpen(f"circuit open, next probe in {self.retry_in():.0f}s")
+
+    def retry_in(self) -> float:
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def release(self) -> None:
+        """A request ended without an outcome (cancelled): a probe it held goes to the next request."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self) -> None:
+        if self.state != "open":
+            self.trips += 1
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class RetryBudget:
+    """
+    Retries allowed within `window` seconds: min_retries plus `ratio` of the
+    requests made, so a failing site cannot multiply its load by retrying.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_retries: int = 3, window: float = 600.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+
+    def _trim(self, now: float) -> None:
+        for events in (self._requests, self._retries):
+            while events and events[0] < now - self.window:
+                events.popleft()
+
+    def record_request(self) -> None:
+        self._requests.append(time.monotonic())
+
+    def remaining(self) -> int:
+        self._trim(time.monotonic())
+        return max(0, int(self.min_retries + self.ratio * len(self._requests)) - len(self._retries))
+
+    def try_spend(self) -> bool:
+        if self.remaining() <= 0:
+            return False
+        self._retries.append(time.monotonic())
+        return True
+
+    def stats(self) -> dict:
+        remaining = self.remaining()
+        return {"requests": len(self._requests), "retries": len(self._retries), "remaining": remaining}
+
+
+class RetryPolicy:
+    """
+    Retries a site request by the kind of failure. `classify` maps an
+    exception to a kind: RETRYABLE kinds (timeouts, network errors, 429/5xx)
+    are retried with exponential backoff while attempts and the retry budget
+    last, and count against the circuit breaker; "blocked" opens the breaker
+    at once; anything else (a parser error, a missing element) is
+    deterministic and raised right away.
+    """
+
+    RETRYABLE = ("timeout", "network", "server")
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker | None = None,
+        budget: RetryBudget | None = None,
+        max_attempts: int = 3,
+        delay: float = 2.0,
+    ):
+        self.breaker = breaker or CircuitBreaker()
+        self.budget = budget or RetryBudget()
+        self.max_attempts = max_attempts
+        self.delay = delay
+        self.failures: dict[str, int] = {}
+
+    async def call(self, func, classify):
+        attempt = 1
+        while True:
+            self.breaker.before_request()
+            self.budget.record_request()
+            try:
+                result = await func()
+            except Exception as e:
+                kind = classify(e)
+                self.failures[kind] = self.failures.get(kind, 0) + 1
+                if kind == "blocked":
+                    self.breaker.trip()
+                    raise
+                if kind not in self.RETRYABLE:
+                    # The site answered; the failure is ours and would repeat
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self.max_attempts or self.breaker.state == "open" or not self.budget.try_spend():
+                    raise
+                await asyncio.sleep(self.delay * (2 ** (attempt - 1)))
+                attempt += 1
+            except BaseException:
+                # Cancelled mid-request: says nothing about the site, but must
+                # not leave the half-open breaker waiting on a probe forever
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+    def status(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "trips": self.breaker.trips,
+            "retry_in_seconds": round(self.breaker.retry_in(), 1),
+            "failures": dict(self.failures),
+            "budget": self.budget.stats(),
+        }
@@ -1,5 +1,71 @@
 import pytest
 
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.services.crawler import CrawlerService
+
+URL = "https://www.saramin.co.kr/zf_user/jobs/relay/view?rec_idx=1"
+
+
+@pytest.fixture
+def db_client(tmp_path):
+    """An empty jobs and user database; modules that need rows override it on top of this one."""
+    client = DatabaseClient(
+        f"sqlite:///{tmp_path / 'jobs.db'}", f"sqlite:///{tmp_path / 'user.db'}"
+    )
+    client.create_tables()
+    yield client
+    client.close()
+
+
+class FakeCrawler:
+    """Stands in for a site crawler: serves a fixed listing and detail pages."""
+
+    listing: list[JobCreate] = []
+    pages: dict[str, str] = {}
+    not_modified: set[str] = set()
+    fetched: list[str] = []
+
+    def __init__(self, headless: bool = True, **options):
+        self.validators = {}
+        self.pages_fetched = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def crawl(self, keyword: str) -> list[JobCreate]:
+        self.pages_fetched += 1
+        return [job.model_copy() for job in self.listing]
+
+    async def extract_details(self, url: str) -> dict:
+        self.pages_fetched += 1
+        self.fetched.append(url)
+        self.validators[url] = {"etag": '"v1"'}
+        return {"description": self.pages[url], "description_image_url": None}
+
+    async def is_not_modified(self, url: str, etag: str | None, last_modified: str | None) -> bool:
+        return etag is not None and url in self.not_modified
+
+
+@pytest.fixture
+def fake_crawler():
+    FakeCrawler.listing = [
+        JobCreate(title="Python 백엔드 개발자", company="A사", url=URL, site=JobSite.SARAMIN, salary="4,000만원")
+    ]
+    FakeCrawler.pages = {URL: "Django 와 PostgreSQL 로 API 서버를 개발합니다."}
+    FakeCrawler.not_modified = set()
+    FakeCrawler.fetched = []
+    return FakeCrawler
+
+
+def crawler_service(db: DatabaseClient) -> CrawlerService:
+    service = CrawlerService(db)
+    service.crawlers = {"saramin": FakeCrawler}
+    return service
+
 
 @pytest.fixture
 def sample_job_data():
@@ -9,3 +75,76 @@ def sample_job_data():
         "location": "Seoul",
         "url": "https://example.com/job/1",
     }
+
+
+class MockLLMServer:
+    """
+    Local OpenAI-compatible /chat/completions endpoint for analysis tests.
+    `responses` are served in order (the last one repeats); an int entry
+    returns that HTTP status instead of a completion.
+    """
+
+    def __init__(self):
+        self.responses: list = ['{"score": 80, "summary": "good fit"}']
+        self.requests: list[dict] = []
+        self.delay = 0.0
+        self.server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}/v4"
+
+    def handle(self, body: dict) -> tuple[int, dict]:
+        import time
+
+        self.requests.append(body)
+        if self.delay:
+            time.sleep(self.delay)
+        index = min(len(self.requests), len(self.responses)) - 1
+        response = self.responses[index]
+        if isinstance(response, int):
+            return response, {"error": {"message": "mock failure"}}
+        return 200, {
+            "id": f"mock-{len(self.requests)}",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": response},
+                }
+            ],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+        }
+
+
+@pytest.fixture
+def mock_llm_server():
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    mock = MockLLMServer()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            status, payload = mock.handle(body)
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    mock.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=mock.server.serve_forever, daemon=True)
+    thread.start()
+    yield mock
+    mock.server.shutdown()
+    mock.server.server_close()
@@ -0,0 +1,126 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from jdcrawler.main import app
+from jdcrawler.models.job import Job, JobCreate, JobSite
+from jdcrawler.models.profile import UserProfile
+from jdcrawler.services import analysis_cache
+from jdcrawler.services.analysis import AnalysisService
+from jdcrawler.services.analysis_cache import AnalysisCache
+from jdcrawler.services.analysis_worker import AnalysisQueue, AnalysisWorker
+
+
+def _job(**kwargs) -> Job:
+    defaults = {
+        "id": 1,
+        "title": "Backend Engineer",
+        "company": "Tech Corp",
+        "url": "https://saramin.co.kr/job/1",
+        "site": JobSite.SARAMIN,
+        "experience": "경력 3년",
+        "description": "Python, Django\n우대: AWS",
+        "created_at": datetime.now(),
+    }
+    defaults.update(kwargs)
+    return Job(**defaults)
+
+
+class TestCacheKey:
+    def test_key_ignores_whitespace_case_and_site(self):
+        profile = UserProfile()
+        key1 = AnalysisCache.make_key(_job(), profile, "glm")
+        key2 = AnalysisCache.make_key(
+            _job(
+                description="  python,  django \n\n 우대: aws ",
+                company="(주)Tech Corp",
+                site=JobSite.WANTED,
+                url="https://wanted.co.kr/wd/1",
+            ),
+            profile,
+            "glm",
+        )
+        assert key1 == key2
+
+    def test_key_changes_with_profile_version_model_and_content(self):
+        base = AnalysisCache.make_key(_job(), UserProfile(version=1), "glm")
+        assert AnalysisCache.make_key(_job(), UserProfile(version=2), "glm") != base
+        assert AnalysisCache.make_key(_job(), UserProfile(version=1), "other") != base
+        assert AnalysisCache.make_key(_job(description="Java"), UserProfile(version=1), "glm") != base
+
+
+class TestAnalysisCache:
+    def test_put_get_and_metrics(self, db_client):
+        analysis_cache.metrics.update(hits=0, misses=0)
+        cache = AnalysisCache(db_client)
+        assert cache.get("k") is None
+        cache.put("k", "glm", 1, {"score": 75, "summary": "cached"})
+        result = cache.get("k")
+        assert result["score"] == 75
+        assert result["cached"] is True
+
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["total_hits"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_invalidate_by_version(self, db_client):
+        cache = AnalysisCache(db_client)
+        cache.put("a", "glm", 1, {"score": 1, "summary": ""})
+        cache.put("b", "glm", 2, {"score": 2, "summary": ""})
+        assert cache.invalidate(profile_version=1) == 1
+        assert cache.get("a") is None
+        assert cache.invalidate() == 1
+
+    async def test_service_serves_repeat_analysis_from_cache(self, db_client, mock_llm_server):
+        service = AnalysisService(
+            api_key="test.key",
+            base_url=mock_llm_server.base_url,
+            max_retries=0,
+            cache=AnalysisCache(db_client),
+        )
+        first = await service.analyze_job_suitability(_job(), UserProfile())
+        second = await service.analyze_job_suitability(_job(id=2), UserProfile())
+        assert first["score"] == second["score"] == 80
+        assert second["cached"] is True
+        assert len(mock_llm_server.requests) == 1
+
+    async def test_worker_analyzes_cross_listed_posting_once(self, db_client, mock_llm_server):
+        for i, (company, site) in enumerate(
+            [("테크코프", JobSite.SARAMIN), ("TechCorp Korea", JobSite.WANTED)]
+        ):
+            db_client.create_job(
+                JobCreate(
+                    title="Platform Engineer",
+                    company=company,
+                    url=f"https://example.com/{i}",
+                    site=site,
+                    description="Kubernetes 운영 경험",
+                )
+            )
+        assert len(db_client.get_jobs()) == 2
+        AnalysisQueue(db_client).enqueue()
+
+        service = AnalysisService(
+            api_key="test.key",
+            base_url=mock_llm_server.base_url,
+            max_retries=0,
+            cache=AnalysisCache(db_client),
+        )
+        worker = AnalysisWorker(
+            db_client, analysis_service=service, concurrency=1, requests_per_minute=6000
+        )
+        await worker.run_until_empty()
+        assert len(mock_llm_server.requests) == 1
+        assert all(j.ai_status == "completed" for j in db_client.get_jobs())
+
+
+class TestCacheAPI:
+    def test_stats_and_invalidate(self, db_client):
+        AnalysisCache(db_client).put("k", "glm", 1, {"score": 1, "summary": ""})
+        app.state.db = db_client
+        client = TestClient(app)
+        assert client.get("/api/analysis/cache").json()["entries"] == 1
+        assert client.delete("/api/analysis/cache").json() == {"deleted": 1}
+        assert client.get("/api/analysis/cache").json()["entries"] == 0
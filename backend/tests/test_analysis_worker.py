@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from jdcrawler.main import app
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.services.analysis import AnalysisService
+from jdcrawler.services.analysis_worker import AnalysisQueue, AnalysisWorker
+
+
+@pytest.fixture
+def db_client(db_client):
+    for i, score in enumerate([10, 90, 50]):
+        db_client.create_job(
+            JobCreate(
+                title=f"Position {i}",
+                company=f"Company {i}",
+                url=f"https://wanted.co.kr/wd/{i}",
+                site=JobSite.WANTED,
+                description=f"Job description {i}",
+                ai_score=score,
+            )
+        )
+    db_client.create_job(
+        JobCreate(
+            title="No description",
+            company="Company X",
+            url="https://wanted.co.kr/wd/99",
+            site=JobSite.WANTED,
+        )
+    )
+    return db_client
+
+
+def _worker(db_client, mock_llm_server, **kwargs):
+    service = AnalysisService(
+        api_key="test.key", base_url=mock_llm_server.base_url, timeout=5, max_retries=0
+    )
+    kwargs.setdefault("requests_per_minute", 6000)
+    return AnalysisWorker(db_client, analysis_service=service, **kwargs)
+
+
+class TestAnalysisQueue:
+    def test_enqueue_by_min_score(self, db_client):
+        queue = AnalysisQueue(db_client)
+        assert queue.enqueue(min_score=40) == 2
+        assert queue.stats() == {"queued": 2, "analyzing": 0}
+        # Already queued jobs are not queued twice
+        assert queue.enqueue(min_score=40) == 0
+
+    def test_claim_prioritizes_rule_based_score(self, db_client):
+        queue = AnalysisQueue(db_client)
+        queue.enqueue()
+        claimed = [queue.claim().ai_score for _ in range(3)]
+        assert claimed == [90, 50, 10]
+        assert queue.claim() is None
+        assert queue.stats() == {"queued": 0, "analyzing": 3}
+
+    def test_recover_requeues_interrupted_jobs(self, db_client):
+        queue = AnalysisQueue(db_client, claim_timeout=0)
+        queue.enqueue()
+        queue.claim()
+        assert queue.recover() == 1
+        assert queue.stats()["queued"] == 3
+
+    def test_recover_leaves_live_claims_alone(self, db_client):
+        queue = AnalysisQueue(db_client, claim_timeout=600)
+        queue.enqueue()
+        queue.claim()
+        # e.g. a second worker process starting while the first is analyzing
+        assert queue.recover() == 0
+        assert queue.stats() == {"queued": 2, "analyzing": 1}
+
+
+class TestAnalysisWorker:
+    async def test_drains_queue_against_mock_llm(self, db_client, mock_llm_server):
+        AnalysisQueue(db_client).enqueue()
+        worker = _worker(db_client, mock_llm_server, concurrency=2)
+        await worker.run_until_empty()
+
+        assert worker.processed == 3
+        assert len(mock_llm_server.requests) == 3
+        jobs = [j for j in db_client.get_jobs() if j.description]
+        assert all(j.ai_status == "completed" and j.ai_score == 80 for j in jobs)
+
+    async def test_does_not_block_event_loop(self, db_client, mock_llm_server):
+        mock_llm_server.delay = 0.3
+        AnalysisQueue(db_client).enqueue()
+        worker = _worker(db_client, mock_llm_server, concurrency=3)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        start = asyncio.get_running_loop().time()
+        await worker.run_until_empty()
+        elapsed = asyncio.get_running_loop().time() - start
+        ticker_task.cancel()
+
+        # Three concurrent 0.3s calls finish well before three sequential ones
+        assert elapsed < 0.8
+        assert ticks >= 4
+
+    async def test_retries_then_succeeds(self, db_client, mock_llm_server):
+        mock_llm_server.responses = [500, '{"score": 70, "summary": "retry ok"}']
+        AnalysisQueue(db_client).enqueue(job_ids=[2])
+        worker = _worker(db_client, mock_llm_server, concurrency=1, retry_delay=0.01)
+        await worker.run_until_empty()
+
+        job = db_client.get_job(2)
+        assert job.ai_status == "completed"
+        assert job.ai_score == 70
+        assert len(mock_llm_server.requests) == 2
+
+    async def test_gives_up_after_max_attempts(self, db_client, mock_llm_server):
+        mock_llm_server.responses = [500]
+        AnalysisQueue(db_client).enqueue(job_ids=[1])
+        worker = _worker(db_client, mock_llm_server, max_attempts=2, retry_delay=0.01)
+        await worker.run_until_empty()
+
+        job = db_client.get_job(1)
+        assert job.ai_status == "failed"
+        assert len(mock_llm_server.requests) == 2
+        assert worker.failed == 2
+
+
+class TestAnalysisBatchAPI:
+    def test_batch_enqueue(self, db_client, monkeypatch):
+        monkeypatch.delenv("ZHIPU_API_KEY", raising=False)
+        app.state.db = db_client
+        client = TestClient(app)
+        response = client.post("/api/analysis/batch", json={"min_score": 50})
+        assert response.status_code == 200
+        assert response.json()["queued"] == 2
+
+        status = client.get("/api/analysis/queue").json()
+        assert status["queued"] == 2
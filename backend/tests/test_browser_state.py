@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from jdcrawler.services import retry_policy, throttle
+from jdcrawler.services.crawler import CrawlerService
+from tests.conftest import FakeCrawler
+
+STATE = {"cookies": [{"name": "SESSION", "value": "abc", "domain": ".saramin.co.kr", "path": "/"}], "origins": []}
+
+
+class SessionCrawler(FakeCrawler):
+    """Remembers the storage_state it was started with and hands back STATE."""
+
+    started_with: list[dict | None] = []
+    block = False
+
+    def __init__(self, headless: bool = True, storage_state=None, **options):
+        super().__init__(headless)
+        self.started_with.append(storage_state)
+        self.blocked = self.block
+
+    async def current_storage_state(self) -> dict:
+        return STATE
+
+
+@pytest.fixture(autouse=True)
+def session_crawler():
+    SessionCrawler.started_with = []
+    SessionCrawler.block = False
+    throttle.throttles.clear()
+    retry_policy.policies.clear()
+    yield SessionCrawler
+    throttle.throttles.clear()
+    retry_policy.policies.clear()
+
+
+def service_with(db) -> CrawlerService:
+    service = CrawlerService(db)
+    service.crawlers = {"saramin": SessionCrawler}
+    return service
+
+
+class TestBrowserStates:
+    async def test_healthy_sessions_are_carried_to_the_next_crawl(self, db_client, fake_crawler):
+        await service_with(db_client).crawl_keyword("python")
+        await service_with(db_client).crawl_keyword("java")
+
+        assert SessionCrawler.started_with == [None, STATE]
+        [saved] = db_client.get_browser_states()
+        assert (saved["site"], saved["cookies"], saved["expired"]) == ("saramin", 1, False)
+
+    async def test_expired_sessions_are_not_loaded(self, db_client, fake_crawler):
+        db_client.save_browser_state("saramin", STATE, datetime.now() - timedelta(minutes=1))
+        await service_with(db_client).crawl_keyword("python")
+        assert SessionCrawler.started_with == [None]
+
+    async def test_blocked_sessions_are_dropped(self, db_client, fake_crawler):
+        db_client.save_browser_state("saramin", STATE, datetime.now() + timedelta(hours=1))
+        SessionCrawler.block = True
+        await service_with(db_client).crawl_keyword("python")
+
+        assert SessionCrawler.started_with == [STATE]
+        assert db_client.get_browser_state("saramin") is None
+
+    async def test_unexpectedly_empty_listing_drops_the_session(self, db_client, fake_crawler):
+        await service_with(db_client).crawl_keyword("python")
+        assert db_client.get_browser_state("saramin") == STATE
+
+        fake_crawler.listing = []
+        await service_with(db_client).crawl_keyword("python")
+        assert db_client.get_browser_state("saramin") is None
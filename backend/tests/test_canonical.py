@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, select
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobKeywordTable, JobSkillTable, JobTable
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.utils.canonical import canonicalize, normalize_url
+
+
+class TestCanonicalize:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://www.saramin.co.kr/zf_user/jobs/relay/view?view_type=search&rec_idx=49012345&location=ts&searchword=python",
+            "http://www.saramin.co.kr/zf_user/jobs/view?rec_idx=49012345",
+            "https://www.saramin.co.kr/zf_user/jobs/relay/view/rec_idx/49012345/",
+        ],
+    )
+    def test_saramin(self, url):
+        assert canonicalize("saramin", url) == (
+            "49012345",
+            "https://www.saramin.co.kr/zf_user/jobs/relay/view?rec_idx=49012345",
+        )
+
+    def test_jobkorea(self):
+        assert canonicalize("jobkorea", "/Recruit/GI_Read/45123456?Oem_Code=C1&logpath=1&stext=python")[0] == "45123456"
+        assert canonicalize("jobkorea", "https://www.jobkorea.co.kr/recruit/gi_read/45123456")[1] == (
+            "https://www.jobkorea.co.kr/Recruit/GI_Read/45123456"
+        )
+
+    def test_wanted(self):
+        assert canonicalize(JobSite.WANTED, "https://www.wanted.co.kr/wd/212345?referer_id=99") == (
+            "212345",
+            "https://www.wanted.co.kr/wd/212345",
+        )
+
+    def test_unknown_links_are_normalized(self):
+        assert normalize_url("HTTP://Example.COM/jobs/1/?utm_source=x&b=2&a=1#top") == "https://example.com/jobs/1?a=1&b=2"
+        assert canonicalize("saramin", "https://saramin.co.kr/job/1") == (
+            "https://saramin.co.kr/job/1",
+            "https://saramin.co.kr/job/1",
+        )
+
+
+class TestPostingLookup:
+    def test_link_variants_are_one_posting(self, db_client):
+        first = db_client.create_job(
+            JobCreate(
+                title="Backend",
+                company="A",
+                url="https://www.wanted.co.kr/wd/212345?referer_id=1",
+                site=JobSite.WANTED,
+            )
+        )
+        second = db_client.create_job(
+            JobCreate(title="Totally different", company="B", url="http://wanted.co.kr/wd/212345/", site=JobSite.WANTED)
+        )
+        assert second.id == first.id
+        assert first.url == "https://www.wanted.co.kr/wd/212345"
+        assert db_client.find_posting("wanted", "https://www.wanted.co.kr/wd/212345#apply").id == first.id
+        assert db_client.find_posting("saramin", "https://www.wanted.co.kr/wd/212345") is None
+
+
+class TestMigration:
+    def insert_legacy(self, db: DatabaseClient, url: str, **values) -> int:
+        with db.jobs_engine.begin() as conn:
+            return conn.execute(
+                insert(JobTable).values(
+                    title="Backend", company="A", url=url, site=JobSite.SARAMIN, created_at=datetime.now(), **values
+                )
+            ).inserted_primary_key[0]
+
+    def test_merges_duplicates_into_oldest_row(self, db_client):
+        oldest = self.insert_legacy(db_client, "https://www.saramin.co.kr/zf_user/jobs/view?rec_idx=1", seen_count=2)
+        richer = self.insert_legacy(
+            db_client,
+            "https://www.saramin.co.kr/zf_user/jobs/relay/view?rec_idx=1&searchword=python",
+            description="Python 개발",
+            ai_status="completed",
+            ai_summary="LLM result",
+            is_bookmarked=True,
+            seen_count=3,
+        )
+        other = self.insert_legacy(db_client, "https://www.saramin.co.kr/zf_user/jobs/view?rec_idx=2")
+        with db_client.jobs_engine.begin() as conn:
+            conn.execute(insert(JobSkillTable).values(job_id=richer, skill="Python"))
+            conn.execute(insert(JobKeywordTable).values(job_id=richer, keyword="python", site="saramin", last_seen_run=4))
+
+        assert db_client.merge_duplicate_postings() == 1
+        assert db_client.merge_duplicate_postings() == 0
+
+        assert db_client.get_job(richer) is None
+        job = db_client.get_job(oldest)
+        assert job.url == "https://www.saramin.co.kr/zf_user/jobs/relay/view?rec_idx=1"
+        assert (job.description, job.ai_summary, job.is_bookmarked, job.seen_count) == ("Python 개발", "LLM result", True, 5)
+        assert job.skills == ["Python"]
+        listing = db_client.jobs_session.execute(select(JobKeywordTable)).scalar_one()
+        assert (listing.job_id, listing.last_seen_run) == (oldest, 4)
+        assert db_client.jobs_session.get(JobTable, other).external_id == "2"
+
+    def test_create_tables_migrates_existing_database(self, db_client, tmp_path):
+        self.insert_legacy(db_client, "https://www.saramin.co.kr/zf_user/jobs/view?rec_idx=7")
+        self.insert_legacy(db_client, "http://www.saramin.co.kr/zf_user/jobs/view?rec_idx=7&utm_source=x")
+        reopened = DatabaseClient(f"sqlite:///{tmp_path / 'jobs.db'}", f"sqlite:///{tmp_path / 'user.db'}")
+        reopened.create_tables()
+        try:
+            assert [job.external_id for job in reopened.jobs_session.execute(select(JobTable)).scalars()] == ["7"]
+        finally:
+            reopened.close()
@@ -0,0 +1,149 @@
+import pytest
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.models.profile import TechSkill, UserProfile
+from jdcrawler.services.analysis import AnalysisService
+from jdcrawler.services.analysis_worker import AnalysisQueue, AnalysisWorker
+from jdcrawler.services.compaction import compact_description, segment_description
+from jdcrawler.services.scoring import ProfileScorer
+
+COMPANY_HISTORY = "\n".join(
+    f"{year}년 {month}월 시리즈 투자 유치 및 신규 사업부 설립" for year in range(2005, 2024) for month in (3, 9)
+)
+
+# Test set: JobKorea/Saramin-style texts with boilerplate around the requirements.
+# `full_score` is the rule-based score against PROFILE for the full-text baseline,
+# `compacted_score` the score after compaction.
+SAMPLES = [
+    {
+        "name": "jobkorea_backend",
+        "title": "백엔드 개발자 (Python)",
+        "description": f"""
+[회사소개]
+저희는 2005년에 설립된 핀테크 기업입니다.
+{COMPANY_HISTORY}
+■ 주요업무
+- Python/Django 기반 결제 API 개발
+- AWS 인프라 운영
+■ 자격요건
+- 백엔드 개발 경력 3년 이상
+- PostgreSQL 사용 경험
+■ 우대사항
+- Kafka 기반 이벤트 처리 경험
+■ 복리후생
+- 4대보험, 퇴직금, 연차, 경조사비 지원, 자기계발비 지원, 사내 카페, 통근버스
+- Java 교육비 지원
+■ 전형절차
+서류전형 > 1차 면접 > 2차 면접 > 최종합격
+※ 허위사실이 발견될 경우 채용이 취소될 수 있습니다.
+※ 개인정보는 채용 목적 외에 사용되지 않습니다.
+""",
+        # "Java 교육비 지원" in the benefits section no longer counts as a Java match
+        "full_score": 100,
+        "compacted_score": 80,
+    },
+    {
+        "name": "saramin_frontend",
+        "title": "프론트엔드 엔지니어",
+        "description": """
+담당업무
+React, TypeScript 기반 웹 서비스 개발
+지원자격
+JavaScript 실무 경험 2년 이상
+우대 사항
+Next.js, AWS 배포 경험
+근무조건
+근무지: 서울 강남구 / 급여: 회사 내규에 따름
+제출서류
+이력서 양식 자유, 포트폴리오
+""",
+        "full_score": 40,
+        "compacted_score": 40,
+    },
+    {
+        "name": "unstructured",
+        "title": "Data Engineer",
+        "description": "We build data pipelines with Python and Kafka on AWS.\nYou will own our ingestion platform.",
+        "full_score": 60,
+        "compacted_score": 60,
+    },
+]
+
+PROFILE = UserProfile(
+    tech_stack=[
+        TechSkill(name=name, level="Intermediate")
+        for name in ["Python", "Kafka", "AWS", "PostgreSQL", "Java"]
+    ]
+)
+
+
+class TestSegmentation:
+    def test_sections_are_classified(self):
+        kinds = [kind for kind, _ in segment_description(SAMPLES[0]["description"])]
+        assert kinds == ["drop", "keep", "keep", "keep", "drop", "drop"]
+
+    def test_intro_without_header_is_other(self):
+        sections = segment_description("저희는 핀테크 스타트업입니다\n자격요건\nPython")
+        assert sections[0] == ("other", ["저희는 핀테크 스타트업입니다"])
+
+
+class TestCompaction:
+    def test_keeps_requirements_and_drops_boilerplate(self):
+        result = compact_description(SAMPLES[0]["description"])
+        assert "Python/Django 기반 결제 API 개발" in result["text"]
+        assert "Kafka 기반 이벤트 처리 경험" in result["text"]
+        assert "복리후생" not in result["text"]
+        assert "시리즈 투자" not in result["text"]
+        assert "허위사실" not in result["text"]
+        assert result["ratio"] < 0.3
+
+    def test_token_budget(self):
+        result = compact_description(SAMPLES[0]["description"], max_tokens=20)
+        assert result["compacted_tokens"] <= 21
+        assert "주요업무" in result["text"]
+
+    def test_unstructured_text_is_kept(self):
+        result = compact_description(SAMPLES[2]["description"])
+        assert result["text"] == SAMPLES[2]["description"]
+        assert result["ratio"] == 1.0
+
+    @pytest.mark.parametrize("sample", SAMPLES, ids=[s["name"] for s in SAMPLES])
+    def test_rule_score_matches_full_text_baseline(self, sample):
+        scorer = ProfileScorer(PROFILE)
+        full = scorer.score(sample["title"], sample["description"])["score"]
+        compacted = scorer.score(
+            sample["title"], compact_description(sample["description"])["text"]
+        )["score"]
+        assert full == sample["full_score"]
+        assert compacted == sample["compacted_score"]
+
+
+class TestPromptCompaction:
+    async def test_prompt_uses_compacted_description(self, tmp_path, mock_llm_server):
+        db = DatabaseClient(
+            f"sqlite:///{tmp_path / 'jobs.db'}", f"sqlite:///{tmp_path / 'user.db'}"
+        )
+        db.create_tables()
+        job = db.create_job(
+            JobCreate(
+                title=SAMPLES[0]["title"],
+                company="핀테크",
+                url="https://www.jobkorea.co.kr/Recruit/GI_Read/1",
+                site=JobSite.JOBKOREA,
+                description=SAMPLES[0]["description"],
+            )
+        )
+        AnalysisQueue(db).enqueue()
+        service = AnalysisService(
+            api_key="test.key", base_url=mock_llm_server.base_url, max_retries=0
+        )
+        await AnalysisWorker(db, analysis_service=service, requests_per_minute=6000).run_until_empty()
+
+        prompt = mock_llm_server.requests[0]["messages"][1]["content"]
+        assert "결제 API" in prompt
+        assert "복리후생" not in prompt
+        stored = db.get_job(job.id)
+        assert stored.prompt_compression_ratio is not None
+        assert stored.prompt_compression_ratio < 0.3
+        db.close()
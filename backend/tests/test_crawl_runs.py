@@ -0,0 +1,89 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from jdcrawler.main import app
+from jdcrawler.services import crawl_runs
+from jdcrawler.services.crawl_runs import CrawlRunManager
+from tests.conftest import FakeCrawler
+
+
+class SlowCrawler(FakeCrawler):
+    async def crawl(self, keyword: str):
+        await asyncio.sleep(30)
+        return []
+
+
+class BrokenCrawler(FakeCrawler):
+    async def crawl(self, keyword: str):
+        raise RuntimeError("blocked")
+
+
+class PaginatedCrawler(FakeCrawler):
+    async def crawl(self, keyword: str):
+        # Two more result pages before the one FakeCrawler serves
+        self.pages_fetched += 2
+        return await super().crawl(keyword)
+
+
+class TestCrawlRunManager:
+    async def test_run_reports_progress(self, db_client, fake_crawler):
+        manager = CrawlRunManager()
+        run = manager.submit(db_client, keyword="python", sites=["saramin"], crawlers={"saramin": FakeCrawler})
+        assert run.status == "queued"
+        await manager.wait(run.id)
+
+        assert run.status == "completed"
+        assert run.counts == {"pages_fetched": 2, "postings_found": 1, "enriched": 1, "saved": 1, "errors": 0}
+        assert run.finished_at is not None
+        assert len(db_client.get_jobs()) == 1
+
+    async def test_every_list_page_is_counted(self, db_client, fake_crawler):
+        manager = CrawlRunManager()
+        run = manager.submit(db_client, keyword="python", sites=["saramin"], crawlers={"saramin": PaginatedCrawler})
+        await manager.wait(run.id)
+        assert run.counts["pages_fetched"] == 4
+
+    async def test_site_errors_are_recorded(self, db_client, fake_crawler):
+        manager = CrawlRunManager()
+        run = manager.submit(
+            db_client,
+            keyword="python",
+            crawlers={"saramin": BrokenCrawler, "wanted": FakeCrawler},
+        )
+        await manager.wait(run.id)
+        assert run.status == "completed"
+        assert run.counts["errors"] == 1
+        assert "blocked" in run.errors[0]
+        assert run.counts["saved"] == 1
+
+    async def test_cancel(self, db_client, fake_crawler):
+        manager = CrawlRunManager()
+        run = manager.submit(db_client, keyword="python", sites=["saramin"], crawlers={"saramin": SlowCrawler})
+        await asyncio.sleep(0.05)
+        assert run.status == "running"
+        assert manager.cancel(run.id)
+        await manager.wait(run.id)
+        assert run.status == "cancelled"
+        assert not manager.cancel(run.id)
+
+
+class TestCrawlRunsAPI:
+    async def test_poll_stream_and_cancel_finished_run(self, db_client, fake_crawler):
+        run = crawl_runs.runs.submit(db_client, keyword="python", sites=["saramin"], crawlers={"saramin": FakeCrawler})
+        await crawl_runs.runs.wait(run.id)
+        app.state.db = db_client
+        client = TestClient(app)
+
+        data = client.get(f"/api/crawl/runs/{run.id}").json()
+        assert (data["status"], data["saved"]) == ("completed", 1)
+        assert run.id in [r["id"] for r in client.get("/api/crawl/runs").json()]
+        assert client.get("/api/crawl/runs/unknown").status_code == 404
+
+        with client.stream("GET", f"/api/crawl/runs/{run.id}/events") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+        assert body.startswith("event: end\ndata: {")
+        assert '"status": "completed"' in body
+
+        assert client.post(f"/api/crawl/runs/{run.id}/cancel").status_code == 409
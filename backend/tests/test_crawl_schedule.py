@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from jdcrawler.db.schema import CrawlScopeTable, KeywordTable
+from jdcrawler.main import app
+from jdcrawler.services.crawl_schedule import CrawlSchedule
+from tests.conftest import crawler_service
+
+NOW = datetime(2026, 3, 2, 9, 7)
+
+
+def schedule(db, **overrides) -> CrawlSchedule:
+    options = {
+        "min_interval": timedelta(hours=1),
+        "max_interval": timedelta(hours=24),
+        "base_interval": timedelta(hours=4),
+        "target_new_postings": 4,
+        "alpha": 0.5,
+        "tick": timedelta(minutes=15),
+        "slot_capacity": 3,
+        **overrides,
+    }
+    return CrawlSchedule(db, **options)
+
+
+class TestNextInterval:
+    def test_scales_towards_target_yield(self, db_client):
+        s = schedule(db_client)
+        assert s.next_interval(timedelta(hours=4), 8)[0] == timedelta(hours=2)
+        assert s.next_interval(timedelta(hours=4), 4)[0] == timedelta(hours=4)
+        interval, reason = s.next_interval(timedelta(hours=4), 0)
+        assert interval == timedelta(hours=8)
+        assert reason == "avg 0.0 new postings/run below target 4: every 4h -> 8h"
+
+    def test_change_per_run_and_bounds(self, db_client):
+        s = schedule(db_client)
+        # At most halved per run, however hot the keyword is
+        assert s.next_interval(timedelta(hours=4), 100)[0] == timedelta(hours=2)
+        interval, reason = s.next_interval(timedelta(hours=1.5), 100)
+        assert interval == timedelta(hours=1)
+        assert reason.endswith("(min)")
+        interval, reason = s.next_interval(timedelta(hours=20), 0)
+        assert interval == timedelta(hours=24)
+        assert reason.endswith("(max)")
+
+
+class TestRecord:
+    def test_ewma_and_next_run(self, db_client):
+        s = schedule(db_client)
+        scope = s.record("python", "saramin", 8, now=NOW)
+        assert (scope.new_postings, scope.yield_ewma, scope.interval_minutes) == (8, 8.0, 120)
+        assert abs(scope.next_run_at - (NOW + timedelta(hours=2))) <= timedelta(minutes=15)
+        assert scope.next_run_at.minute % 15 == 0
+        assert scope.schedule_reason.startswith("8 new last run, avg 8.0 new postings/run above target 4")
+
+        scope = s.record("python", "saramin", 0, now=NOW + timedelta(hours=2))
+        assert (scope.yield_ewma, scope.interval_minutes) == (4.0, 120)
+
+    def test_slots_are_spread(self, db_client):
+        s = schedule(db_client)
+        booked = [s.record(f"kw{i}", "saramin", 4, now=NOW).next_run_at for i in range(5)]
+        # Five scopes wanting 13:07 get one tick each within +-24 minutes
+        assert sorted(booked) == [datetime(2026, 3, 2, 12, 30) + timedelta(minutes=15 * i) for i in range(5)]
+        assert s.record("kw5", "saramin", 4, now=NOW).next_run_at == datetime(2026, 3, 2, 13, 0)
+
+    def test_failure_retries_after_min_interval(self, db_client):
+        s = schedule(db_client)
+        s.record("python", "saramin", 8, now=NOW)
+        scope = s.record_failure("python", "saramin", now=NOW)
+        assert scope.interval_minutes == 120
+        assert timedelta(minutes=45) <= scope.next_run_at - NOW <= timedelta(minutes=75)
+        assert scope.schedule_reason == "last run failed, retry in 1h"
+
+
+class TestDueUnits:
+    def test_never_crawled_first_then_most_overdue(self, db_client):
+        for keyword in ["python", "java", "go"]:
+            db_client.create_keyword(keyword)
+        inactive = db_client.create_keyword("rust")
+        db_client.user_session.get(KeywordTable, inactive.id).is_active = False
+        db_client.user_session.commit()
+        db_client.jobs_session.add_all(
+            [
+                CrawlScopeTable(keyword="python", site="saramin", next_run_at=NOW - timedelta(minutes=5)),
+                CrawlScopeTable(keyword="python", site="wanted", next_run_at=NOW - timedelta(hours=1)),
+                CrawlScopeTable(keyword="java", site="saramin", next_run_at=NOW + timedelta(hours=1)),
+                CrawlScopeTable(keyword="java", site="wanted", next_run_at=NOW - timedelta(minutes=1)),
+                CrawlScopeTable(keyword="go", site="saramin", next_run_at=NOW + timedelta(hours=3)),
+            ]
+        )
+        db_client.jobs_session.commit()
+
+        s = schedule(db_client, slot_capacity=3)
+        assert s.due_units(["saramin", "wanted"], now=NOW) == [
+            ("go", "wanted"),
+            ("python", "wanted"),
+            ("python", "saramin"),
+        ]
+        assert len(schedule(db_client, slot_capacity=10).due_units(["saramin", "wanted"], now=NOW)) == 4
+
+
+class TestCrawlRecordsYield:
+    async def test_crawl_books_next_run(self, db_client, fake_crawler):
+        service = crawler_service(db_client)
+        service.schedule = schedule(db_client)
+        await service.crawl_keyword("python", headless=True)
+        scope = db_client.jobs_session.get(CrawlScopeTable, ("python", "saramin"))
+        assert (scope.new_postings, scope.interval_minutes) == (1, 480)
+
+        await service.crawl_keyword("python", headless=True)
+        db_client.jobs_session.refresh(scope)
+        assert (scope.new_postings, scope.interval_minutes) == (0, 960)
+
+    async def test_status_exposes_schedule(self, db_client, fake_crawler):
+        db_client.create_keyword("python")
+        await crawler_service(db_client).crawl_keyword("python", headless=True)
+        app.state.db = db_client
+        data = TestClient(app).get("/api/crawl/status").json()
+
+        units = {(unit["keyword"], unit["site"]): unit for unit in data["schedule"]}
+        assert set(units) == {("python", "saramin"), ("python", "jobkorea"), ("python", "wanted")}
+        assert units[("python", "saramin")]["next_run_at"] is not None
+        assert units[("python", "saramin")]["reason"].startswith("1 new last run")
+        assert units[("python", "wanted")]["reason"] == "never crawled, due now"
@@ -113,3 +113,30 @@ class TestKeywordCRUD:
         assert kw1.id == kw2.id
         keywords = db_client.get_keywords()
         assert len(keywords) == 1
+
+
+class TestSchemaMigration:
+    def test_create_tables_adds_missing_columns(self, tmp_path):
+        import sqlite3
+
+        jobs_path = tmp_path / "old_jobs.db"
+        conn = sqlite3.connect(jobs_path)
+        conn.execute(
+            "CREATE TABLE jobs (id INTEGER PRIMARY KEY, title VARCHAR(500) NOT NULL, "
+            "company VARCHAR(200) NOT NULL, url VARCHAR(1000) NOT NULL UNIQUE, site VARCHAR(8) NOT NULL)"
+        )
+        conn.commit()
+        conn.close()
+
+        client = DatabaseClient(f"sqlite:///{jobs_path}", f"sqlite:///{tmp_path / 'user.db'}")
+        client.create_tables()
+        job = client.create_job(
+            JobCreate(
+                title="Migrated",
+                company="Old DB",
+                url="https://saramin.co.kr/job/old",
+                site=JobSite.SARAMIN,
+            )
+        )
+        assert job.ai_status == "pending"
+        client.close()
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobTable
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.services.enrichment import ReEnrichmentService, card_hash, content_hash
+from tests.conftest import URL, FakeCrawler, crawler_service
+
+
+def set_columns(db: DatabaseClient, **values):
+    with db.jobs_engine.begin() as conn:
+        conn.execute(update(JobTable).values(**values))
+    db.jobs_session.expire_all()
+
+
+class TestHashes:
+    def test_content_hash_ignores_formatting(self):
+        assert content_hash("Python  개발\n", None) == content_hash("python 개발", None)
+        assert content_hash("Python 개발", None) != content_hash("Python 개발", "https://img/1.png")
+        assert content_hash(None, None) is None
+
+    def test_card_hash_tracks_card_fields(self):
+        job = JobCreate(title="Backend", company="A", url=URL, site=JobSite.SARAMIN, salary="4,000만원")
+        assert card_hash(job) == card_hash(job.model_copy(update={"description": "changed"}))
+        assert card_hash(job) != card_hash(job.model_copy(update={"salary": "5,000만원"}))
+
+
+class TestCrawlChangeDetection:
+    async def test_unchanged_card_is_not_refetched(self, db_client, fake_crawler):
+        service = crawler_service(db_client)
+        await service.crawl_keyword("python", headless=True)
+        await service.crawl_keyword("python", headless=True)
+        assert fake_crawler.fetched == [URL]
+        job = db_client.jobs_session.query(JobTable).one()
+        assert job.content_hash == content_hash(fake_crawler.pages[URL], None)
+        assert job.etag == '"v1"'
+        assert job.details_fetched_at is not None
+
+    async def test_changed_card_refetches_and_rescores_only_on_new_content(self, db_client, fake_crawler):
+        service = crawler_service(db_client)
+        await service.crawl_keyword("python", headless=True)
+        set_columns(db_client, ai_status="completed", ai_summary="LLM result")
+
+        # Card changed, detail page identical: no re-scoring
+        fake_crawler.listing[0].salary = "5,000만원"
+        await service.crawl_keyword("python", headless=True)
+        job = db_client.jobs_session.query(JobTable).one()
+        assert len(fake_crawler.fetched) == 2
+        assert job.salary == "5,000만원"
+        assert job.salary_min == 50_000_000
+        assert job.ai_summary == "LLM result"
+
+        # Card and detail page changed: re-scored, skills re-extracted
+        fake_crawler.listing[0].salary = "6,000만원"
+        fake_crawler.pages[URL] = "Kotlin 과 Spring 으로 서버를 개발합니다."
+        await service.crawl_keyword("python", headless=True)
+        db_client.jobs_session.expire_all()
+        job = db_client.jobs_session.query(JobTable).one()
+        assert job.description.startswith("Kotlin")
+        assert job.ai_status != "completed"
+        assert {row.skill for row in job.skill_rows} == {"Kotlin", "Python", "Spring"}
+
+
+class TestReEnrichmentService:
+    def test_refresh_interval_grows_with_age(self, db_client):
+        service = ReEnrichmentService(db_client, {"saramin": FakeCrawler}, max_interval=timedelta(days=14))
+        assert service.refresh_interval(timedelta(hours=3)) == timedelta(days=1)
+        assert service.refresh_interval(timedelta(days=10)) == timedelta(days=5)
+        assert service.refresh_interval(timedelta(days=100)) == timedelta(days=14)
+
+    async def test_due_postings_are_revisited(self, db_client, fake_crawler):
+        await crawler_service(db_client).crawl_keyword("python", headless=True)
+        service = ReEnrichmentService(db_client, {"saramin": FakeCrawler})
+        assert service.due_job_ids() == []
+
+        now = datetime.now()
+        set_columns(db_client, created_at=now - timedelta(days=10), details_fetched_at=now - timedelta(days=6))
+        assert len(service.due_job_ids()) == 1
+
+        # 304 Not Modified: only the fetch time moves
+        fake_crawler.not_modified = {URL}
+        assert (await service.run())["not_modified"] == 1
+        assert fake_crawler.fetched == [URL]
+        assert service.due_job_ids() == []
+
+        set_columns(db_client, details_fetched_at=now - timedelta(days=6))
+        fake_crawler.not_modified = set()
+        assert (await service.run())["unchanged"] == 1
+
+        set_columns(db_client, details_fetched_at=now - timedelta(days=6))
+        fake_crawler.pages[URL] = "Go 와 Kubernetes 로 플랫폼을 개발합니다."
+        assert (await service.run())["changed"] == 1
+        db_client.jobs_session.expire_all()
+        job = db_client.jobs_session.query(JobTable).one()
+        assert job.description.startswith("Go")
+        assert job.content_hash == content_hash(fake_crawler.pages[URL], None)
+
+    async def test_rows_stored_before_hashing_keep_their_analysis(self, db_client, fake_crawler):
+        await crawler_service(db_client).crawl_keyword("python", headless=True)
+        set_columns(
+            db_client, content_hash=None, details_fetched_at=None, ai_status="completed", ai_summary="LLM result", ai_score=85
+        )
+
+        assert (await ReEnrichmentService(db_client, {"saramin": FakeCrawler}).run())["unchanged"] == 1
+        job = db_client.jobs_session.query(JobTable).one()
+        assert (job.ai_status, job.ai_summary, job.ai_score) == ("completed", "LLM result", 85)
+        assert job.content_hash == content_hash(fake_crawler.pages[URL], None)
+
+    async def test_jobs_being_analyzed_are_not_reset(self, db_client, fake_crawler):
+        await crawler_service(db_client).crawl_keyword("python", headless=True)
+        set_columns(db_client, details_fetched_at=None, ai_status="analyzing")
+        fake_crawler.pages[URL] = "Go 와 Kubernetes 로 플랫폼을 개발합니다."
+        service = ReEnrichmentService(db_client, {"saramin": FakeCrawler})
+
+        assert (await service.run())["unchanged"] == 1
+        job = db_client.jobs_session.query(JobTable).one()
+        assert (job.ai_status, job.description.startswith("Django")) == ("analyzing", True)
+        # Still due, so the change is picked up once the analysis is done
+        assert service.due_job_ids() == [job.id]
+
+    async def test_closed_postings_are_not_revisited(self, db_client, fake_crawler):
+        await crawler_service(db_client).crawl_keyword("python", headless=True)
+        set_columns(db_client, details_fetched_at=datetime(2020, 1, 1), is_closed=True)
+        assert ReEnrichmentService(db_client, {"saramin": FakeCrawler}).due_job_ids() == []
+
+
+class TestCrawlRunCache:
+    async def test_overlapping_keywords_fetch_each_posting_once(self, db_client, fake_crawler):
+        for keyword in ["python", "백엔드", "서버 개발자"]:
+            db_client.create_keyword(keyword)
+        await crawler_service(db_client).crawl_all_active_keywords(headless=True)
+
+        assert fake_crawler.fetched == [URL]
+        job = db_client.get_jobs()[0]
+        assert job.keywords == ["python", "백엔드", "서버 개발자"]
+        assert job.seen_count == 3
+        assert [j.id for j in db_client.get_jobs(keyword="백엔드")] == [job.id]
+        assert db_client.get_jobs(keyword="java") == []
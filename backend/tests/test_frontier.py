@@ -0,0 +1,185 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from jdcrawler.db.schema import FrontierRunTable, FrontierUnitTable, FrontierUrlTable
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.services.crawl_runs import CrawlRunManager
+from jdcrawler.services.crawler import CrawlerService
+from jdcrawler.services.frontier import CrawlFrontier
+from jdcrawler.services.orchestrator import CrawlUnit
+from tests.conftest import URL, FakeCrawler
+
+OTHER_URL = "https://www.saramin.co.kr/zf_user/jobs/relay/view?rec_idx=2"
+
+
+class HangingCrawler(FakeCrawler):
+    """Hangs on 'java', like a browser that stopped responding before a crash."""
+
+    async def crawl(self, keyword: str):
+        if keyword == "java":
+            await asyncio.sleep(30)
+        return await super().crawl(keyword)
+
+
+class FlakyCrawler(FakeCrawler):
+    failing: set[str] = set()
+
+    async def extract_details(self, url: str) -> dict:
+        if url in self.failing:
+            raise RuntimeError("timeout")
+        return await super().extract_details(url)
+
+
+class SwallowingCrawler(FakeCrawler):
+    """Returns no description for pages it cannot load, as the site crawlers do."""
+
+    async def extract_details(self, url: str) -> dict:
+        if url not in self.pages:
+            self.pages_fetched += 1
+            return {"description": None, "description_image_url": None}
+        return await super().extract_details(url)
+
+
+def service_with(db, crawler) -> CrawlerService:
+    service = CrawlerService(db)
+    service.crawlers = {"saramin": crawler}
+    return service
+
+
+def frontier_row(db, run_id: str) -> FrontierRunTable:
+    db.jobs_session.expire_all()
+    return db.jobs_session.get(FrontierRunTable, run_id)
+
+
+def make_stale(db, run_id: str) -> None:
+    """Age the frontier by an hour, as if its process died back then."""
+    an_hour_ago = datetime.now() - timedelta(hours=1)
+    db.jobs_session.execute(
+        update(FrontierRunTable)
+        .where(FrontierRunTable.id == run_id)
+        .values(created_at=an_hour_ago, updated_at=an_hour_ago)
+    )
+    db.jobs_session.commit()
+
+
+class TestResume:
+    async def test_interrupted_crawl_resumes_where_it_stopped(self, db_client, fake_crawler):
+        for keyword in ["python", "java"]:
+            db_client.create_keyword(keyword)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(service_with(db_client, HangingCrawler).crawl_all_active_keywords(), 0.5)
+        db_client.jobs_session.rollback()
+
+        run = db_client.jobs_session.execute(select(FrontierRunTable)).scalar_one()
+        assert run.status == "running"
+        units = {
+            unit.keyword: unit.state
+            for unit in db_client.jobs_session.execute(select(FrontierUnitTable)).scalars()
+        }
+        assert units == {"python": "done", "java": "in_flight"}
+        # Touched moments ago, as if its process were still running
+        assert CrawlFrontier.resumable(db_client) is None
+
+        make_stale(db_client, run.id)
+        summary = await service_with(db_client, FakeCrawler).resume_crawl()
+
+        assert [(unit["keyword"], unit["status"]) for unit in summary["units"]] == [("java", "completed")]
+        # The posting saved for python is not enriched again for java
+        assert fake_crawler.fetched == [URL]
+        assert sorted(db_client.get_jobs()[0].keywords) == ["java", "python"]
+        assert frontier_row(db_client, run.id).status == "completed"
+        assert await service_with(db_client, FakeCrawler).resume_crawl() is None
+
+    async def test_cancelled_runs_are_not_resumed(self, db_client, fake_crawler):
+        manager = CrawlRunManager()
+        run = manager.submit(db_client, keyword="java", sites=["saramin"], crawlers={"saramin": HangingCrawler})
+        await asyncio.sleep(0.1)
+        manager.cancel(run.id)
+        await manager.wait(run.id)
+        assert frontier_row(db_client, run.frontier_id).status == "cancelled"
+
+    def test_old_frontiers_are_abandoned(self, db_client):
+        frontier = CrawlFrontier.start(db_client, [("python", "saramin")])
+        make_stale(db_client, frontier.id)
+        assert CrawlFrontier.resumable(db_client).id == frontier.id
+        assert CrawlFrontier.resumable(db_client, max_age=timedelta(minutes=1)) is None
+        assert frontier_row(db_client, frontier.id).status == "abandoned"
+
+
+class TestDetailPages:
+    async def test_failed_detail_page_does_not_fail_the_unit(self, db_client, fake_crawler):
+        fake_crawler.listing.append(
+            JobCreate(title="Java 백엔드", company="B사", url=OTHER_URL, site=JobSite.SARAMIN)
+        )
+        fake_crawler.pages[OTHER_URL] = "Spring 으로 개발합니다."
+        FlakyCrawler.failing = {OTHER_URL}
+        crawled = await service_with(db_client, FlakyCrawler).crawl_keyword("python")
+
+        assert crawled == 2
+        assert [job.url for job in db_client.get_jobs()] == [URL]
+        states = {
+            row.external_id: (row.state, row.attempts, row.job_id, row.error)
+            for row in db_client.jobs_session.execute(select(FrontierUrlTable)).scalars()
+        }
+        job_id = db_client.get_jobs()[0].id
+        assert states == {"1": ("done", 0, job_id, None), "2": ("failed", 1, None, "timeout")}
+        unit = db_client.jobs_session.execute(select(FrontierUnitTable)).scalar_one()
+        assert (unit.state, unit.error) == ("incomplete", "1 detail pages failed")
+        assert frontier_row(db_client, unit.run_id).status == "running"
+
+    async def test_empty_detail_pages_are_retried_then_saved_from_the_card(self, db_client, fake_crawler):
+        fake_crawler.listing.append(
+            JobCreate(title="Java 백엔드", company="B사", url=OTHER_URL, site=JobSite.SARAMIN)
+        )
+        service = service_with(db_client, SwallowingCrawler)
+        frontier = CrawlFrontier.start(db_client, [("python", "saramin")], max_attempts=2)
+        await service.crawl_units([CrawlUnit("python", "saramin")], frontier=frontier)
+
+        assert [job.url for job in db_client.get_jobs()] == [URL]
+        assert frontier.pending_units() == [("python", "saramin")]
+        assert frontier_row(db_client, frontier.id).status == "running"
+
+        # Last attempt: the posting is kept with what its list card had
+        resumed = CrawlFrontier.load(db_client, frontier.id, max_attempts=2)
+        await service.crawl_units([CrawlUnit(*unit) for unit in resumed.pending_units()], frontier=resumed)
+
+        jobs = {job.url: job for job in db_client.get_jobs()}
+        assert (jobs[OTHER_URL].title, jobs[OTHER_URL].description) == ("Java 백엔드", None)
+        assert fake_crawler.fetched == [URL]
+        assert resumed.pending_units() == []
+        assert frontier_row(db_client, frontier.id).status == "completed"
+
+    async def test_exhausted_detail_pages_are_saved_without_details(self, db_client, fake_crawler):
+        frontier = CrawlFrontier.start(db_client, [("python", "saramin")], max_attempts=2)
+        frontier.queue_postings("saramin", [("1", URL)])
+        for _ in range(2):
+            frontier.posting_failed("saramin", "1", "timeout")
+            frontier.flush()
+
+        await service_with(db_client, FakeCrawler).crawl_units([CrawlUnit("python", "saramin")], frontier=frontier)
+
+        assert fake_crawler.fetched == []
+        job = db_client.get_jobs()[0]
+        assert (job.url, job.description) == (URL, None)
+        assert frontier_row(db_client, frontier.id).status == "completed"
+
+    def test_results_are_checkpointed_in_batches(self, db_client):
+        frontier = CrawlFrontier.start(db_client, [("python", "saramin")], batch_size=2)
+        frontier.queue_postings("saramin", [(str(i), f"https://example.com/{i}") for i in range(3)])
+
+        def states():
+            db_client.jobs_session.expire_all()
+            rows = db_client.jobs_session.execute(select(FrontierUrlTable).order_by(FrontierUrlTable.external_id))
+            return [row.state for row in rows.scalars()]
+
+        frontier.posting_done("saramin", "0", 10)
+        assert states() == ["queued", "queued", "queued"]
+        frontier.posting_failed("saramin", "1", "timeout")
+        assert states() == ["done", "failed", "queued"]
+        frontier.posting_done("saramin", "2", 12)
+        frontier.finish_unit("python", "saramin", "done")
+        assert states() == ["done", "failed", "done"]
+        assert frontier.done_postings() == {("saramin", "0"): 10, ("saramin", "2"): 12}
@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.services.crawler import CrawlerService
+from jdcrawler.services.leases import CrawlLeases, LeaseUnavailable
+from tests.conftest import FakeCrawler
+
+
+@pytest.fixture
+def other_process(tmp_path, db_client):
+    """A second client on the same database files, as another process would open."""
+    client = DatabaseClient(f"sqlite:///{tmp_path / 'jobs.db'}", f"sqlite:///{tmp_path / 'user.db'}")
+    yield client
+    client.close()
+
+
+class SlowCrawler(FakeCrawler):
+    async def crawl(self, keyword: str):
+        await asyncio.sleep(0.05)
+        return await super().crawl(keyword)
+
+
+class TestLeaseTable:
+    def test_only_one_owner_until_expiry(self, db_client, other_process):
+        now = datetime.now()
+        assert db_client.acquire_lease("python", "saramin", "a", now + timedelta(minutes=2), since=now)
+        assert not other_process.acquire_lease("python", "saramin", "b", now + timedelta(minutes=2), since=now)
+        assert other_process.acquire_lease("python", "wanted", "b", now + timedelta(minutes=2), since=now)
+        # Re-entrant for the holder
+        assert db_client.acquire_lease("python", "saramin", "a", now + timedelta(minutes=2), since=now)
+
+        assert db_client.renew_lease("python", "saramin", "a", now - timedelta(seconds=1))
+        # Expired: taken over, and the old holder's heartbeat fails
+        assert other_process.acquire_lease("python", "saramin", "b", now + timedelta(minutes=2), since=now)
+        assert not db_client.renew_lease("python", "saramin", "a", now + timedelta(minutes=2))
+        assert [(lease["site"], lease["owner"]) for lease in db_client.get_active_leases()] == [
+            ("wanted", "b"),
+            ("saramin", "b"),
+        ]
+
+    def test_completed_units_are_not_crawled_again_by_the_same_run(self, db_client, other_process):
+        started = datetime.now()
+        assert db_client.acquire_lease("python", "saramin", "a", started + timedelta(minutes=2), since=started)
+        db_client.release_lease("python", "saramin", "a", completed=True)
+        assert not other_process.acquire_lease("python", "saramin", "b", datetime.now() + timedelta(minutes=2), since=started)
+        assert other_process.acquire_lease(
+            "python", "saramin", "b", datetime.now() + timedelta(minutes=2), since=datetime.now()
+        )
+
+    def test_failed_units_are_released_for_others(self, db_client, other_process):
+        started = datetime.now()
+        db_client.acquire_lease("python", "saramin", "a", started + timedelta(minutes=2), since=started)
+        db_client.release_lease("python", "saramin", "a", completed=False)
+        assert other_process.acquire_lease("python", "saramin", "b", datetime.now() + timedelta(minutes=2), since=started)
+
+
+class TestCrawlLeases:
+    async def test_hold_heartbeats_and_releases(self, db_client, other_process):
+        leases = CrawlLeases(db_client, ttl=timedelta(seconds=0.3))
+        async with leases.hold("python", "saramin", since=datetime.now()):
+            first = db_client.get_active_leases()[0]["expires_at"]
+            await asyncio.sleep(0.25)
+            # Renewed past the original expiry, so still not claimable
+            assert db_client.get_active_leases()[0]["expires_at"] > first
+            with pytest.raises(LeaseUnavailable):
+                async with CrawlLeases(other_process).hold("python", "saramin", since=datetime.now()):
+                    pass
+        assert db_client.get_active_leases() == []
+
+    async def test_overlapping_runs_split_units(self, db_client, other_process, fake_crawler):
+        for keyword in ["python", "java", "go"]:
+            db_client.create_keyword(keyword)
+        services = [CrawlerService(db_client), CrawlerService(other_process)]
+        for service in services:
+            service.crawlers = {"saramin": SlowCrawler}
+
+        summaries = await asyncio.gather(*(service.crawl_all_active_keywords(headless=True) for service in services))
+
+        statuses = [
+            {unit["keyword"]: unit["status"] for unit in summary["units"]} for summary in summaries
+        ]
+        for keyword in ["python", "java", "go"]:
+            assert sorted(status[keyword] for status in statuses) == ["completed", "skipped"]
+        assert all(summary["failed"] == 0 for summary in summaries)
+
+    async def test_units_write_through_sessions_of_their_own(self, db_client, fake_crawler, monkeypatch):
+        for keyword in ["python", "java"]:
+            db_client.create_keyword(keyword)
+        service = CrawlerService(db_client)
+        service.crawlers = {"saramin": SlowCrawler}
+        sessions = []
+        crawl_unit = service.crawl_unit
+
+        async def recording_crawl_unit(*args):
+            db = args[-1]
+            sessions.append(db.jobs_session)
+            return await crawl_unit(*args)
+
+        monkeypatch.setattr(service, "crawl_unit", recording_crawl_unit)
+        await service.crawl_all_active_keywords(headless=True)
+
+        assert len(sessions) == 2
+        assert sessions[0] is not sessions[1]
+        assert db_client.jobs_session not in sessions
+        assert len(db_client.get_jobs()) == 1
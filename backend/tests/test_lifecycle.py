@@ -0,0 +1,162 @@
+from datetime import date, datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobLshBandTable, JobSkillTable, JobTable
+from jdcrawler.main import app
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.services.lifecycle import LifecycleService
+from tests.test_minhash import CROSS_LISTED, POSTING
+
+
+def create(db: DatabaseClient, i: int, **fields):
+    return db.create_job(
+        JobCreate(
+            title=f"Job {i}",
+            company=f"Company {i}",
+            url=f"https://saramin.co.kr/job/{i}",
+            site=JobSite.SARAMIN,
+            **fields,
+        )
+    )
+
+
+def set_columns(db: DatabaseClient, job_id: int, **values):
+    with db.jobs_engine.begin() as conn:
+        conn.execute(update(JobTable).where(JobTable.id == job_id).values(**values))
+    db.jobs_session.expire_all()
+
+
+class TestLifecycleSweep:
+    def test_archives_expired_and_vanished_postings(self, db_client):
+        expired = create(db_client, 1, skills=["Python"])
+        vanished = create(db_client, 2)
+        bookmarked = create(db_client, 3)
+        fresh = create(db_client, 4)
+        newest = create(db_client, 5)
+        long_ago = date.today() - timedelta(days=90)
+        set_columns(db_client, expired.id, deadline_date=long_ago)
+        set_columns(db_client, vanished.id, last_seen_at=datetime.now() - timedelta(days=100))
+        set_columns(db_client, bookmarked.id, deadline_date=long_ago, is_bookmarked=True)
+        set_columns(db_client, newest.id, deadline_date=long_ago)
+
+        counts = LifecycleService(db_client, expired_after_days=30, unseen_after_days=60).sweep()
+
+        assert counts == {"expired": 1, "vanished": 1, "capacity": 0}
+        assert {j.id for j in db_client.get_jobs()} == {bookmarked.id, fresh.id, newest.id}
+        archived = {j.id: j for j in db_client.get_archived_jobs()}
+        assert archived[expired.id].archive_reason == "expired"
+        assert archived[expired.id].title == "Job 1"
+        assert archived[vanished.id].archive_reason == "vanished"
+        assert db_client.jobs_session.execute(select(JobSkillTable)).first() is None
+
+    def test_capacity_keeps_hot_table_bounded(self, db_client):
+        for i in range(1, 8):
+            job = create(db_client, i)
+            set_columns(db_client, job.id, last_seen_at=datetime.now() - timedelta(hours=10 - i))
+        service = LifecycleService(db_client, max_hot_jobs=4, batch_size=2)
+        assert service.sweep()["capacity"] == 3
+        assert {j.title for j in db_client.get_jobs()} == {"Job 4", "Job 5", "Job 6", "Job 7"}
+        assert service.counts() == {"hot": 4, "archived": 3}
+
+    def test_hot_table_is_capped_by_default(self, db_client, monkeypatch):
+        monkeypatch.delenv("JOBS_HOT_MAX_ROWS", raising=False)
+        assert LifecycleService(db_client).max_hot_jobs > 0
+
+    def test_cluster_gets_new_first_job(self, db_client):
+        first = create(db_client, 1, description=POSTING)
+        second = create(db_client, 2, description=CROSS_LISTED)
+        create(db_client, 3)
+        assert second.cluster_id == first.id
+        set_columns(db_client, first.id, deadline_date=date(2000, 1, 1))
+
+        LifecycleService(db_client).sweep()
+        assert db_client.get_job(second.id).cluster_id == second.id
+        assert [j.id for j in db_client.get_jobs(collapse_duplicates=True) if j.id == second.id]
+        remaining_bands = db_client.jobs_session.execute(select(JobLshBandTable.job_id).distinct()).scalars().all()
+        assert remaining_bands == [second.id]
+
+    def test_rearchiving_a_url_replaces_the_old_copy(self, db_client):
+        create(db_client, 1)
+        create(db_client, 2)
+        set_columns(db_client, 1, deadline_date=date(2000, 1, 1))
+        LifecycleService(db_client).sweep()
+        # The posting shows up again as a new row and expires again
+        again = create(db_client, 1)
+        create(db_client, 3)
+        set_columns(db_client, again.id, deadline_date=date(2000, 1, 1))
+        LifecycleService(db_client).sweep()
+        assert [j.id for j in db_client.get_archived_jobs()] == [again.id]
+
+
+class TestLiveness:
+    def crawl(self, db: DatabaseClient, keyword: str, site: str, job_ids: list[int]) -> int:
+        run = db.begin_crawl_run(keyword, site)
+        db.mark_seen(keyword, site, run, job_ids, datetime.now())
+        return db.finish_crawl_run(keyword, site, run)
+
+    def test_seen_count_and_last_seen(self, db_client):
+        job = create(db_client, 1)
+        set_columns(db_client, job.id, last_seen_at=datetime(2020, 1, 1))
+        self.crawl(db_client, "python", "saramin", [job.id])
+        self.crawl(db_client, "python", "saramin", [job.id])
+        job = db_client.get_job(job.id)
+        assert job.seen_count == 3
+        assert job.last_seen_at > datetime(2020, 1, 1)
+
+    def test_closes_after_consecutive_missed_runs(self, db_client):
+        gone, listed = create(db_client, 1), create(db_client, 2)
+        self.crawl(db_client, "python", "saramin", [gone.id, listed.id])
+        closed = [self.crawl(db_client, "python", "saramin", [listed.id]) for _ in range(3)]
+        assert closed == [0, 0, 1]
+        assert db_client.get_job(gone.id).is_closed
+        assert not db_client.get_job(listed.id).is_closed
+        assert [j.id for j in db_client.get_jobs(include_closed=False)] == [listed.id]
+
+        # Listed again: reopened
+        self.crawl(db_client, "python", "saramin", [gone.id])
+        assert not db_client.get_job(gone.id).is_closed
+
+    def test_other_keywords_keep_posting_open(self, db_client):
+        job, other = create(db_client, 1), create(db_client, 2)
+        self.crawl(db_client, "python", "saramin", [job.id])
+        for _ in range(3):
+            self.crawl(db_client, "python", "saramin", [other.id])
+            self.crawl(db_client, "backend", "saramin", [job.id])
+        assert not db_client.get_job(job.id).is_closed
+
+    def test_jobs_created_during_page_count_once(self, db_client):
+        started = datetime.now()
+        job = create(db_client, 1)
+        run = db_client.begin_crawl_run("python", "saramin")
+        db_client.mark_seen("python", "saramin", run, [job.id], started)
+        assert db_client.get_job(job.id).seen_count == 1
+
+
+class TestLifecycleAPI:
+    def test_archived_endpoints(self, db_client):
+        create(db_client, 1)
+        create(db_client, 2)
+        set_columns(db_client, 1, deadline_date=date(2000, 1, 1))
+        app.state.db = db_client
+        client = TestClient(app)
+
+        assert client.post("/api/jobs/lifecycle/sweep").json()["expired"] == 1
+        status = client.get("/api/jobs/lifecycle").json()
+        assert (status["hot"], status["archived"]) == (1, 1)
+        assert status["last_sweep"]["expired"] == 1
+        assert client.get("/api/jobs/archived").json()[0]["archive_reason"] == "expired"
+        assert client.get("/api/jobs/archived/1").json()["title"] == "Job 1"
+        assert client.get("/api/jobs/archived/2").status_code == 404
+        assert client.get("/api/jobs/1").status_code == 404
+
+    def test_exclude_closed(self, db_client):
+        create(db_client, 1)
+        create(db_client, 2)
+        set_columns(db_client, 1, is_closed=True)
+        app.state.db = db_client
+        client = TestClient(app)
+        assert len(client.get("/api/jobs").json()) == 2
+        assert [j["id"] for j in client.get("/api/jobs?include_closed=false").json()] == [2]
@@ -0,0 +1,75 @@
+from jdcrawler.models.profile import TechSkill, UserProfile
+from jdcrawler.services.scoring import ProfileScorer
+from jdcrawler.utils.matcher import KeywordMatcher
+
+
+class TestKeywordMatcher:
+    def test_finds_all_terms_in_one_pass(self):
+        matcher = KeywordMatcher(["python", "django", "fastapi"])
+        hits = matcher.scan("Python 백엔드 (Django, FastAPI) - python 우대")
+        assert hits["python"] == [0, 31]
+        assert "django" in hits
+        assert "fastapi" in hits
+
+    def test_counts(self):
+        matcher = KeywordMatcher(["java", "spring"])
+        assert matcher.count("Java/Spring, Java 17") == {"java": 2, "spring": 1}
+
+    def test_overlapping_terms(self):
+        matcher = KeywordMatcher(["react", "react native", "native"])
+        hits = matcher.scan("React Native 개발자")
+        assert set(hits) == {"react", "react native", "native"}
+
+    def test_short_terms_respect_word_boundaries(self):
+        matcher = KeywordMatcher(["C", "Go", "C++"])
+        assert matcher.scan("Google Cloud 경험자") == {}
+        assert set(matcher.scan("C++ 개발자")) == {"c++"}
+        assert set(matcher.scan("C/C++, Go 사용")) == {"c", "c++", "go"}
+
+    def test_boundaries_for_terms_of_any_length(self):
+        matcher = KeywordMatcher(["Rust", "Scala", "자바"], boundary_max_len=None)
+        assert matcher.scan("trust, scalable") == {}
+        assert set(matcher.scan("Rust/Scala, 자바를")) == {"rust", "scala", "자바"}
+        assert set(KeywordMatcher(["Rust"]).scan("trust")) == {"rust"}
+
+    def test_korean_terms_match_as_substrings(self):
+        matcher = KeywordMatcher(["자바"])
+        assert matcher.count("자바를 활용한 서버 개발") == {"자바": 1}
+
+    def test_empty_terms_are_ignored(self):
+        matcher = KeywordMatcher(["", "  "])
+        assert matcher.terms == []
+        assert matcher.scan("anything") == {}
+
+
+class TestProfileScorer:
+    def _profile(self, **kwargs):
+        defaults = {
+            "tech_stack": [
+                TechSkill(name="Python", level="Advanced"),
+                TechSkill(name="Go", level="Beginner"),
+            ],
+            "interest_keywords": ["AI"],
+            "exclude_keywords": ["SI"],
+        }
+        defaults.update(kwargs)
+        return UserProfile(**defaults)
+
+    def test_score_by_matched_skills(self):
+        scorer = ProfileScorer(self._profile())
+        result = scorer.score("Python Developer", "Google 클라우드 기반 AI 서비스")
+        assert result["score"] == 50
+        assert result["status"] == "pending"
+        assert result["matched_skills"] == ["Python"]
+        assert result["matched_interests"] == ["AI"]
+
+    def test_exclude_keyword_filters(self):
+        scorer = ProfileScorer(self._profile())
+        result = scorer.score("SI 프로젝트 개발자", "Python")
+        assert result["status"] == "filtered"
+        assert result["score"] == 0
+        assert result["summary"] == "제외 키워드 'SI' 포함됨"
+
+    def test_empty_tech_stack(self):
+        scorer = ProfileScorer(self._profile(tech_stack=[]))
+        assert scorer.score("Python Developer", "desc")["score"] == 0
@@ -0,0 +1,156 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
+
+from jdcrawler.db.schema import JobLshBandTable, JobTable
+from jdcrawler.main import app
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.services.analysis_worker import AnalysisQueue
+from jdcrawler.services.backfill import backfill_clusters
+from jdcrawler.utils.minhash import MinHasher, shingles
+
+POSTING = """
+[주요업무]
+- 대규모 트래픽을 처리하는 커머스 주문/결제 API 설계 및 개발
+- Kafka 기반 이벤트 파이프라인 운영과 장애 대응
+- 레거시 모놀리스를 마이크로서비스로 전환하는 프로젝트 참여
+[자격요건]
+- Java, Spring Boot 기반 백엔드 개발 경력 3년 이상
+- MySQL 쿼리 튜닝 및 트랜잭션에 대한 이해
+- AWS 환경에서 서비스를 운영해 본 경험
+[우대사항]
+- Kubernetes, ArgoCD를 이용한 배포 자동화 경험
+- 대용량 데이터 처리 및 캐시 설계 경험
+"""
+# The same posting as another site renders it: different bullets and spacing,
+# one extra line
+CROSS_LISTED = """
+■ 주요 업무
+• 대규모 트래픽을 처리하는 커머스 주문/결제 API 설계 및 개발
+• Kafka 기반 이벤트 파이프라인 운영과 장애 대응
+• 레거시 모놀리스를 마이크로서비스로 전환하는 프로젝트 참여
+■ 자격 요건
+• Java, Spring Boot 기반 백엔드 개발 경력 3년 이상
+• MySQL 쿼리 튜닝 및 트랜잭션에 대한 이해
+• AWS 환경에서 서비스를 운영해 본 경험
+■ 우대 사항
+• Kubernetes, ArgoCD를 이용한 배포 자동화 경험
+• 대용량 데이터 처리 및 캐시 설계 경험
+• 스타트업 근무 경험
+"""
+UNRELATED = """
+[담당업무]
+- iOS 앱 신규 기능 개발 및 유지보수
+- SwiftUI 기반 디자인 시스템 구축
+[자격요건]
+- Swift 개발 경력 2년 이상
+- 앱스토어 배포 경험
+"""
+
+
+def make_job(url: str, title: str, company: str, description: str, site=JobSite.SARAMIN) -> JobCreate:
+    return JobCreate(title=title, company=company, url=url, site=site, description=description)
+
+
+class TestMinHasher:
+    def test_shingles_ignore_formatting(self):
+        assert shingles("Spring  Boot!") == shingles("spring-boot")
+
+    def test_similar_documents_share_bands(self):
+        hasher = MinHasher()
+        a, b = hasher.signature(POSTING), hasher.signature(CROSS_LISTED)
+        assert hasher.similarity(a, b) >= 0.7
+        assert set(enumerate(hasher.bands(a))) & set(enumerate(hasher.bands(b)))
+
+    def test_unrelated_documents_do_not_share_bands(self):
+        hasher = MinHasher()
+        a, b = hasher.signature(POSTING), hasher.signature(UNRELATED)
+        assert hasher.similarity(a, b) < 0.2
+        assert not set(enumerate(hasher.bands(a))) & set(enumerate(hasher.bands(b)))
+
+    def test_signature_roundtrip_and_empty_text(self):
+        hasher = MinHasher()
+        signature = hasher.signature(POSTING)
+        assert (hasher.from_bytes(hasher.to_bytes(signature)) == signature).all()
+        assert hasher.signature("  ...  ") is None
+        assert hasher.signature("Kubernetes 운영 경험") is None
+
+    def test_num_perm_must_divide_into_bands(self):
+        with pytest.raises(ValueError):
+            MinHasher(num_perm=100, num_bands=16)
+
+
+class TestNearDuplicateClustering:
+    def test_cross_listed_posting_joins_cluster(self, db_client):
+        first = db_client.create_job(
+            make_job("https://saramin.co.kr/job/1", "주문결제 백엔드 개발자", "커머스랩", POSTING)
+        )
+        # Rewritten title on another site slips past the title/company check
+        second = db_client.create_job(
+            make_job(
+                "https://wanted.co.kr/wd/2",
+                "[커머스] Java 서버 엔지니어 (3년 이상)",
+                "(주)커머스랩",
+                CROSS_LISTED,
+                site=JobSite.WANTED,
+            )
+        )
+        other = db_client.create_job(
+            make_job("https://saramin.co.kr/job/3", "iOS 개발자", "모바일컴퍼니", UNRELATED)
+        )
+
+        assert second.id != first.id
+        assert second.cluster_id == first.id
+        assert db_client.get_job(first.id).cluster_id == first.id
+        assert other.cluster_id is None
+        assert [j.id for j in db_client.get_cluster_jobs(second.id)] == [first.id, second.id]
+
+        collapsed = db_client.get_jobs(collapse_duplicates=True)
+        assert {j.id for j in collapsed} == {first.id, other.id}
+        assert len(db_client.get_jobs()) == 3
+
+    def test_collapse_picks_the_first_matching_member(self, db_client):
+        first = db_client.create_job(make_job("https://saramin.co.kr/job/1", "백엔드", "A사", POSTING))
+        second = db_client.create_job(
+            make_job("https://wanted.co.kr/wd/2", "서버 엔지니어", "B사", CROSS_LISTED, site=JobSite.WANTED)
+        )
+
+        assert [j.id for j in db_client.get_jobs(site="wanted", collapse_duplicates=True)] == [second.id]
+        db_client.toggle_hidden(first.id)
+        assert [j.id for j in db_client.get_jobs(collapse_duplicates=True)] == [second.id]
+
+    def test_backfill_clusters_existing_rows(self, db_client):
+        jobs = [
+            db_client.create_job(make_job(f"https://saramin.co.kr/job/{i}", title, "A사", description))
+            for i, (title, description) in enumerate([("백엔드", POSTING), ("iOS", UNRELATED), ("서버", CROSS_LISTED)])
+        ]
+        # As stored before clustering existed
+        db_client.jobs_session.execute(update(JobTable).values(minhash=None, cluster_id=None))
+        db_client.jobs_session.execute(delete(JobLshBandTable))
+        db_client.jobs_session.commit()
+
+        assert backfill_clusters(db_client, chunk_size=2) == 3
+        db_client.jobs_session.expire_all()
+        assert [db_client.get_job(job.id).cluster_id for job in jobs] == [jobs[0].id, None, jobs[0].id]
+        assert backfill_clusters(db_client) == 0
+
+    def test_only_cluster_representatives_are_queued(self, db_client):
+        first = db_client.create_job(make_job("https://saramin.co.kr/job/1", "백엔드", "A사", POSTING))
+        db_client.create_job(make_job("https://wanted.co.kr/wd/2", "서버 엔지니어", "B사", CROSS_LISTED))
+        queue = AnalysisQueue(db_client)
+        assert queue.enqueue() == 1
+        assert queue.claim().id == first.id
+
+        queue.complete(first.id, {"score": 80, "summary": "적합"})
+        db_client.jobs_session.expire_all()
+        assert {(j.ai_status, j.ai_score) for j in db_client.get_jobs()} == {("completed", 80)}
+
+    def test_duplicates_endpoint_and_collapsed_listing(self, db_client):
+        first = db_client.create_job(make_job("https://saramin.co.kr/job/1", "백엔드", "A사", POSTING))
+        db_client.create_job(make_job("https://wanted.co.kr/wd/2", "서버 엔지니어", "B사", CROSS_LISTED))
+        app.state.db = db_client
+        client = TestClient(app)
+
+        assert len(client.get(f"/api/jobs/{first.id}/duplicates").json()) == 2
+        assert len(client.get("/api/jobs?collapse=true").json()) == 1
+        assert client.get("/api/jobs/999/duplicates").status_code == 404
@@ -0,0 +1,158 @@
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobTable
+from jdcrawler.main import app
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.services.backfill import backfill_structured_fields
+from jdcrawler.utils.normalize import parse_deadline, parse_experience, parse_salary
+
+
+def create(db: DatabaseClient, i: int, experience=None, salary=None, deadline=None):
+    return db.create_job(
+        JobCreate(
+            title=f"Job {i}",
+            company=f"Company {i}",
+            url=f"https://saramin.co.kr/job/{i}",
+            site=JobSite.SARAMIN,
+            experience=experience,
+            salary=salary,
+            deadline=deadline,
+        )
+    )
+
+
+class TestParsers:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("신입", (0, 0)),
+            ("경력무관", (0, None)),
+            ("신입·경력", (0, None)),
+            ("경력 3~5년", (3, 5)),
+            ("경력 1-3년", (1, 3)),
+            ("경력3년↑", (3, None)),
+            ("경력 7년 이상", (7, None)),
+            ("경력 5년 이하", (0, 5)),
+            ("신입·경력 3년↑", (0, None)),
+            ("5년~", (5, None)),
+            ("~5년", (0, 5)),
+            ("N/A", (None, None)),
+            (None, (None, None)),
+        ],
+    )
+    def test_experience(self, text, expected):
+        assert parse_experience(text) == expected
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("3,000~4,000만원", (30_000_000, 40_000_000)),
+            ("연봉 5,000만원 이상", (50_000_000, None)),
+            ("4000만원↑", (40_000_000, None)),
+            ("~5000만원", (None, 50_000_000)),
+            ("최대 8000", (None, 80_000_000)),
+            ("최소 3,500만원", (35_000_000, None)),
+            ("4000~", (40_000_000, None)),
+            ("시급 10,000원", (None, None)),
+            ("일급 15만원", (None, None)),
+            ("월급 300만원", (36_000_000, 36_000_000)),
+            ("1억 2천만원", (120_000_000, 120_000_000)),
+            ("연봉 35,000,000원", (35_000_000, 35_000_000)),
+            ("회사내규에 따름", (None, None)),
+            ("면접 후 결정", (None, None)),
+        ],
+    )
+    def test_salary(self, text, expected):
+        assert parse_salary(text) == expected
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("~02.28(금)", date(2026, 2, 28)),
+            ("~12.31(수)", date(2025, 12, 31)),
+            ("~ 2026.03.01", date(2026, 3, 1)),
+            ("2026-01-15", date(2026, 1, 15)),
+            ("오늘마감", date(2025, 12, 20)),
+            ("내일마감", date(2025, 12, 21)),
+            ("D-7", date(2025, 12, 27)),
+            ("상시채용", None),
+            ("채용시 마감", None),
+            ("~02.30", None),
+        ],
+    )
+    def test_deadline(self, text, expected):
+        assert parse_deadline(text, datetime(2025, 12, 20, 9, 0)) == expected
+
+
+class TestStructuredColumns:
+    def test_create_job_fills_columns(self, db_client):
+        job = create(db_client, 1, "경력 3~5년", "3,000~4,000만원", "~ 2026.03.01")
+        assert (job.experience_min_years, job.experience_max_years) == (3, 5)
+        assert (job.salary_min, job.salary_max) == (30_000_000, 40_000_000)
+        assert job.deadline_date == date(2026, 3, 1)
+
+    def test_range_filters(self, db_client):
+        create(db_client, 1, "신입", "2,800만원")
+        create(db_client, 2, "경력 3~5년", "4,000~5,000만원")
+        create(db_client, 3, "경력 7년 이상", "연봉 8,000만원 이상")
+        create(db_client, 4, "경력무관", "회사내규에 따름")
+
+        def ids(**filters):
+            return sorted(j.id for j in db_client.get_jobs(**filters))
+
+        assert ids(experience_years=4) == [2, 4]
+        assert ids(experience_years=0) == [1, 4]
+        assert ids(salary_min=45_000_000) == [2, 3]
+        assert ids(salary_max=30_000_000) == [1]
+        assert ids(salary_min=30_000_000, salary_max=60_000_000) == [2]
+
+    def test_deadline_filter_and_sort(self, db_client):
+        create(db_client, 1, deadline="~ 2026.03.01")
+        create(db_client, 2, deadline="~ 2026.01.10")
+        create(db_client, 3, deadline="상시채용")
+        create(db_client, 4, deadline="~ 2026.02.01")
+
+        by_deadline = db_client.get_jobs(sort="deadline", order="asc")
+        assert [j.id for j in by_deadline] == [2, 4, 1, 3]
+        within = db_client.get_jobs(deadline_from=date(2026, 1, 15), deadline_to=date(2026, 2, 28))
+        assert [j.id for j in within] == [4]
+
+    def test_salary_sort_puts_unknown_last(self, db_client):
+        create(db_client, 1, salary="3,000만원")
+        create(db_client, 2, salary="면접 후 결정")
+        create(db_client, 3, salary="5,000만원")
+        assert [j.id for j in db_client.get_jobs(sort="salary")] == [3, 1, 2]
+
+    def test_backfill(self, db_client):
+        job = create(db_client, 1, "경력 2년 이상", "3,500만원", "~01.31(토)")
+        with db_client.jobs_engine.begin() as conn:
+            conn.execute(
+                update(JobTable)
+                .values(experience_min_years=None, salary_min=None, deadline_date=None, created_at=datetime(2025, 12, 20))
+            )
+        assert backfill_structured_fields(db_client) == 1
+        db_client.jobs_session.expire_all()
+        job = db_client.get_job(job.id)
+        assert job.experience_min_years == 2
+        assert job.salary_min == 35_000_000
+        assert job.deadline_date == date(2026, 1, 31)
+
+
+class TestJobsAPIFilters:
+    def test_query_parameters(self, db_client):
+        create(db_client, 1, "경력 3~5년", "4,000~5,000만원", "~ 2026.03.01")
+        create(db_client, 2, "신입", "3,000만원", "~ 2026.01.10")
+        app.state.db = db_client
+        client = TestClient(app)
+
+        data = client.get("/api/jobs", params={"experience_years": 4, "salary_min": 40_000_000}).json()
+        assert [job["id"] for job in data] == [1]
+        assert data[0]["deadline_date"] == "2026-03-01"
+        data = client.get("/api/jobs", params={"sort": "deadline", "order": "asc"}).json()
+        assert [job["id"] for job in data] == [2, 1]
+        assert client.get("/api/jobs", params={"sort": "title"}).status_code == 422
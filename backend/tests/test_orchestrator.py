@@ -0,0 +1,103 @@
+import asyncio
+
+from jdcrawler.services.crawler import CrawlerService
+from jdcrawler.services.orchestrator import CrawlOrchestrator, CrawlUnit
+from tests.conftest import FakeCrawler
+
+
+class ConcurrencyProbe:
+    """Work function that records how many units ran at once, overall and per site."""
+
+    def __init__(self, delay: float = 0.02, fail: set[tuple[str, str]] = frozenset()):
+        self.delay = delay
+        self.fail = fail
+        self.running: dict[str, int] = {}
+        self.peak = 0
+        self.peak_per_site: dict[str, int] = {}
+
+    async def __call__(self, unit: CrawlUnit) -> int:
+        self.running[unit.site] = self.running.get(unit.site, 0) + 1
+        self.peak = max(self.peak, sum(self.running.values()))
+        self.peak_per_site[unit.site] = max(self.peak_per_site.get(unit.site, 0), self.running[unit.site])
+        try:
+            await asyncio.sleep(self.delay)
+            if (unit.keyword, unit.site) in self.fail:
+                raise RuntimeError("blocked")
+            return 1
+        finally:
+            self.running[unit.site] -= 1
+
+
+def units(keywords: list[str], sites: list[str]) -> list[CrawlUnit]:
+    return [CrawlUnit(keyword, site) for keyword in keywords for site in sites]
+
+
+class TestCrawlOrchestrator:
+    async def test_respects_global_and_per_site_limits(self):
+        probe = ConcurrencyProbe()
+        orchestrator = CrawlOrchestrator(max_concurrency=2, site_concurrency=1, site_limits={"wanted": 2})
+        summary = await orchestrator.run(units(["a", "b", "c", "d"], ["saramin", "jobkorea", "wanted"]), probe)
+
+        assert probe.peak == 2
+        assert probe.peak_per_site == {"saramin": 1, "jobkorea": 1, "wanted": 2}
+        assert summary["crawled"] == 12
+        assert summary["failed"] == 0
+
+    async def test_sites_run_in_parallel(self):
+        probe = ConcurrencyProbe(delay=0.05)
+        orchestrator = CrawlOrchestrator(max_concurrency=3, site_concurrency=1)
+        summary = await orchestrator.run(units(["a", "b"], ["saramin", "jobkorea", "wanted"]), probe)
+
+        assert probe.peak == 3
+        # Two units per site back to back, sites side by side
+        assert summary["elapsed_seconds"] < summary["unit_seconds"] / 2
+
+    async def test_failures_are_isolated_and_summarized(self):
+        probe = ConcurrencyProbe(fail={("b", "saramin")})
+        summary = await CrawlOrchestrator(max_concurrency=4).run(units(["a", "b"], ["saramin", "wanted"]), probe)
+
+        assert summary["crawled"] == 3
+        assert summary["failed"] == 1
+        failed = [unit for unit in summary["units"] if unit["status"] == "failed"]
+        assert failed == [
+            {**failed[0], "keyword": "b", "site": "saramin", "crawled": 0, "error": "blocked"}
+        ]
+        assert all(unit["duration_seconds"] is not None for unit in summary["units"])
+        assert set(summary["site_seconds"]) == {"saramin", "wanted"}
+        assert summary["critical_site"] in ("saramin", "wanted")
+        assert summary["slowest_unit"]["duration_seconds"] == max(
+            unit["duration_seconds"] for unit in summary["units"]
+        )
+
+    def test_interleave_round_robins_sites(self):
+        ordered = CrawlOrchestrator.interleave(units(["a", "b"], ["saramin", "wanted"]))
+        assert [(unit.keyword, unit.site) for unit in ordered] == [
+            ("a", "saramin"),
+            ("a", "wanted"),
+            ("b", "saramin"),
+            ("b", "wanted"),
+        ]
+
+
+class BrokenCrawler(FakeCrawler):
+    async def crawl(self, keyword: str):
+        raise RuntimeError("blocked")
+
+
+class TestCrawlAllActiveKeywords:
+    async def test_one_failing_site_does_not_stop_the_run(self, db_client, fake_crawler):
+        for keyword in ["python", "백엔드"]:
+            db_client.create_keyword(keyword)
+        service = CrawlerService(db_client)
+        service.crawlers = {"saramin": FakeCrawler, "jobkorea": BrokenCrawler}
+
+        summary = await service.crawl_all_active_keywords(headless=True)
+
+        assert [(unit["keyword"], unit["site"], unit["status"]) for unit in summary["units"]] == [
+            ("python", "saramin", "completed"),
+            ("python", "jobkorea", "failed"),
+            ("백엔드", "saramin", "completed"),
+            ("백엔드", "jobkorea", "failed"),
+        ]
+        assert summary["crawled"] == 2
+        assert db_client.get_jobs()[0].keywords == ["python", "백엔드"]
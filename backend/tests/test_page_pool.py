@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from jdcrawler.crawlers.page_pool import PagePool
+
+
+class FakePage:
+    def __init__(self):
+        self.urls: list[str] = []
+        self.closed = False
+
+    async def goto(self, url: str, **kwargs):
+        self.urls.append(url)
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages: list[FakePage] = []
+
+    async def new_page(self) -> FakePage:
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+
+class TestPagePool:
+    async def test_tabs_are_reset_and_reused(self):
+        context = FakeContext()
+        pool = PagePool(context)
+        async with pool.page() as page:
+            await page.goto("https://example.com/1")
+        async with pool.page() as again:
+            assert again is page
+        assert page.urls == ["https://example.com/1", "about:blank", "about:blank"]
+        assert pool.stats() == {"created": 1, "reused": 1, "retired": 0, "idle": 1}
+
+    async def test_tabs_are_retired_after_max_uses(self):
+        context = FakeContext()
+        pool = PagePool(context, max_uses=2)
+        for _ in range(3):
+            async with pool.page():
+                pass
+        first, second = context.pages
+        assert first.closed and not second.closed
+        assert pool.stats()["retired"] == 1
+
+    async def test_failed_fetches_retire_the_tab(self):
+        context = FakeContext()
+        pool = PagePool(context)
+        with pytest.raises(RuntimeError):
+            async with pool.page():
+                raise RuntimeError("navigation failed")
+        assert context.pages[0].closed
+        async with pool.page() as page:
+            assert page is context.pages[1]
+
+    async def test_size_bounds_open_tabs(self):
+        context = FakeContext()
+        pool = PagePool(context, size=2)
+
+        async def fetch():
+            async with pool.page():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(fetch() for _ in range(6)))
+        assert len(context.pages) == 2
+        await pool.close()
+        assert all(page.closed for page in context.pages)
@@ -0,0 +1,79 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from jdcrawler.main import app
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.utils.regions import SIGUNGU, gazetteer
+
+
+@pytest.fixture
+def db_client(db_client):
+    for i, location in enumerate(
+        ["서울 강남구", "경기 성남시 분당구", "경기 수원시 영통구", "부산광역시 해운대구", "전국"], start=1
+    ):
+        db_client.create_job(
+            JobCreate(
+                title=f"Job {i}",
+                company=f"Company {i}",
+                url=f"https://saramin.co.kr/job/{i}",
+                site=JobSite.SARAMIN,
+                location=location,
+            )
+        )
+    return db_client
+
+
+class TestRegionGazetteer:
+    @pytest.mark.parametrize(
+        "text, code",
+        [
+            ("서울 강남구", "11680"),
+            ("서울특별시 강남", "11680"),
+            ("경기 성남시 분당구", "41130"),
+            ("경기 남양주시", "41360"),
+            # 광주시 (경기) vs 광주광역시
+            ("경기 광주시", "41610"),
+            ("광주 광산구", "29200"),
+            # Names shared by several 시/도 are resolved within the 시/도
+            ("인천 서구", "28260"),
+            ("강원 고성군", "51820"),
+            ("경남 고성군", "48820"),
+            ("서울특별시 중구 외 2곳", "11140"),
+            ("경기", "41"),
+            ("강남구", "11680"),
+            ("중구", None),
+            ("전국", None),
+            ("41130", "41130"),
+        ],
+    )
+    def test_resolve(self, text, code):
+        assert gazetteer.resolve(text) == code
+
+    def test_codes_are_hierarchical(self):
+        for sido_code, districts in SIGUNGU.items():
+            assert all(code.startswith(sido_code) and len(code) == 5 for code, _ in districts)
+
+    def test_label_and_contains_region(self):
+        assert gazetteer.label("41130") == "경기도 성남시"
+        assert gazetteer.label("11") == "서울특별시"
+        assert gazetteer.contains_region("전국")
+        assert not gazetteer.contains_region("경력 3년")
+
+
+class TestRegionFilter:
+    def test_region_code_stored_at_ingest(self, db_client):
+        assert [j.region_code for j in db_client.get_jobs(sort="created_at", order="asc")] == [
+            "11680", "41130", "41110", "26350", None,
+        ]
+
+    def test_prefix_filter(self, db_client):
+        assert {j.title for j in db_client.get_jobs(region_code="41")} == {"Job 2", "Job 3"}
+        assert [j.title for j in db_client.get_jobs(region_code="41130")] == ["Job 2"]
+
+    def test_api_accepts_names_and_codes(self, db_client):
+        app.state.db = db_client
+        client = TestClient(app)
+        assert len(client.get("/api/jobs", params={"region": "경기"}).json()) == 2
+        assert [j["title"] for j in client.get("/api/jobs", params={"region": "성남"}).json()] == ["Job 2"]
+        assert len(client.get("/api/jobs", params={"region": "26"}).json()) == 1
+        assert client.get("/api/jobs", params={"region": "아틀란티스"}).status_code == 400
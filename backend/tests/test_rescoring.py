@@ -0,0 +1,128 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from jdcrawler.db.schema import JobTable
+from jdcrawler.main import app
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.models.profile import TechSkill, UserProfileUpdate
+from jdcrawler.services import rescoring
+from jdcrawler.services.rescoring import RescoringService
+
+
+@pytest.fixture
+def db_client(db_client):
+    for i, (title, description) in enumerate(
+        [
+            ("Python Backend", "Django, PostgreSQL"),
+            ("Java Server", "Spring, Kafka"),
+            ("Go Engineer", "Kubernetes, Python"),
+            ("SI 개발자", "Python"),
+            ("No description", None),
+        ]
+    ):
+        db_client.create_job(
+            JobCreate(
+                title=title,
+                company=f"Company {i}",
+                url=f"https://saramin.co.kr/job/{i}",
+                site=JobSite.SARAMIN,
+                description=description,
+                ai_score=0,
+            )
+        )
+    return db_client
+
+
+def _update_profile(db_client, skills, exclude=None):
+    return db_client.update_profile(
+        UserProfileUpdate(
+            tech_stack=[TechSkill(name=s, level="Intermediate") for s in skills],
+            experience_years=3,
+            interest_keywords=[],
+            exclude_keywords=exclude or [],
+        )
+    )
+
+
+class TestRescoringService:
+    def test_profile_update_bumps_version(self, db_client):
+        before = db_client.get_profile().version
+        after = _update_profile(db_client, ["Python"]).version
+        assert after == before + 1
+
+    def test_rescore_all_stale_jobs(self, db_client):
+        _update_profile(db_client, ["Python", "Kafka"], exclude=["SI"])
+        service = RescoringService(db_client, chunk_size=2)
+        assert service.count_stale() == 4
+
+        service.run()
+
+        scores = {j.title: (j.ai_score, j.ai_status) for j in db_client.get_jobs()}
+        assert scores["Python Backend"] == (50, "pending")
+        assert scores["Java Server"] == (50, "pending")
+        assert scores["Go Engineer"] == (50, "pending")
+        assert scores["SI 개발자"] == (0, "filtered")
+        assert scores["No description"] == (0, "pending")
+        assert service.count_stale() == 0
+        assert rescoring.progress.status == "completed"
+        assert rescoring.progress.processed == 4
+
+    def test_completed_llm_results_are_kept(self, db_client):
+        job = db_client.get_jobs(search="Java")[0]
+        row = db_client.jobs_session.get(JobTable, job.id)
+        row.ai_status = "completed"
+        row.ai_score = 91
+        db_client.jobs_session.commit()
+
+        _update_profile(db_client, ["Python"])
+        RescoringService(db_client).run()
+
+        db_client.jobs_session.expire_all()
+        assert db_client.get_job(job.id).ai_score == 91
+
+    def test_rows_held_by_the_analysis_queue_are_kept(self, db_client):
+        jobs = {job.title: job for job in db_client.get_jobs()}
+        analyzing, queued = jobs["Python Backend"], jobs["Go Engineer"]
+        for job, status in ((analyzing, "analyzing"), (queued, "pending")):
+            row = db_client.jobs_session.get(JobTable, job.id)
+            row.ai_status = status
+            row.ai_score = 77
+            row.analysis_queued_at = datetime.now() if status == "pending" else None
+        db_client.jobs_session.commit()
+
+        _update_profile(db_client, ["Kafka"], exclude=["Python"])
+        RescoringService(db_client).run()
+
+        db_client.jobs_session.expire_all()
+        assert db_client.get_job(analyzing.id).ai_status == "analyzing"
+        assert (db_client.get_job(queued.id).ai_status, db_client.get_job(queued.id).ai_score) == ("pending", 77)
+
+    def test_rerun_only_touches_rows_from_older_versions(self, db_client):
+        _update_profile(db_client, ["Python"])
+        service = RescoringService(db_client)
+        service.run()
+        service.run()
+        assert rescoring.progress.processed == 0
+
+
+class TestRescoreAPI:
+    def test_profile_update_triggers_rescore(self, db_client):
+        app.state.db = db_client
+        client = TestClient(app)
+        response = client.post(
+            "/api/profile",
+            json={
+                "tech_stack": [{"name": "Kafka", "level": "Beginner"}],
+                "experience_years": 1,
+                "interest_keywords": [],
+                "exclude_keywords": [],
+            },
+        )
+        assert response.status_code == 200
+
+        status = client.get("/api/profile/rescore").json()
+        assert status["status"] == "completed"
+        assert status["remaining"] == 0
+        assert status["profile_version"] == response.json()["version"]
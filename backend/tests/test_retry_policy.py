@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from jdcrawler.crawlers.base import BlockedError, ServerError, classify_error
+from jdcrawler.services import retry_policy
+from jdcrawler.services.orchestrator import CrawlUnit
+from jdcrawler.utils.retry import CircuitBreaker, CircuitOpen, RetryBudget, RetryPolicy
+from tests.conftest import crawler_service
+
+
+@pytest.fixture(autouse=True)
+def fresh_policies():
+    retry_policy.policies.clear()
+    yield
+    retry_policy.policies.clear()
+
+
+class Flaky:
+    """Raises the given exceptions in turn, then returns "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def policy(**options) -> RetryPolicy:
+    return RetryPolicy(**{"delay": 0, **options})
+
+
+class TestCircuitBreaker:
+    async def test_opens_after_consecutive_failures_and_probes_once(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpen):
+            breaker.before_request()
+
+        await asyncio.sleep(0.06)
+        breaker.before_request()
+        assert breaker.state == "half_open"
+        # Only one probe at a time
+        assert not breaker.allow()
+        breaker.record_failure()
+        assert (breaker.state, breaker.trips) == ("open", 2)
+
+        await asyncio.sleep(0.06)
+        assert breaker.allow()
+        breaker.record_success()
+        assert (breaker.state, breaker.failures) == ("closed", 0)
+
+    async def test_cancelled_probe_lets_the_next_request_probe(self):
+        retries = policy(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+        with pytest.raises(ServerError):
+            await retries.call(Flaky(ServerError("HTTP 503")), classify_error)
+        await asyncio.sleep(0.06)
+
+        probe = asyncio.create_task(retries.call(lambda: asyncio.sleep(10), classify_error))
+        await asyncio.sleep(0.01)
+        assert retries.status()["state"] == "half_open"
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert await retries.call(Flaky(), classify_error) == "ok"
+        assert retries.status()["state"] == "closed"
+
+    def test_successes_reset_the_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+
+class TestRetryPolicy:
+    async def test_transient_failures_are_retried(self):
+        fetch = Flaky(PlaywrightTimeoutError("Timeout 20000ms exceeded"), ServerError("HTTP 503"))
+        assert await policy().call(fetch, classify_error) == "ok"
+        assert fetch.calls == 3
+
+    async def test_deterministic_failures_are_not_retried(self):
+        fetch = Flaky(ValueError("no results container"))
+        retries = policy()
+        with pytest.raises(ValueError):
+            await retries.call(fetch, classify_error)
+        assert fetch.calls == 1
+        assert retries.breaker.failures == 0
+
+    async def test_block_pages_open_the_circuit(self):
+        retries = policy()
+        with pytest.raises(BlockedError):
+            await retries.call(Flaky(BlockedError("captcha")), classify_error)
+        with pytest.raises(CircuitOpen):
+            await retries.call(Flaky(), classify_error)
+        assert retries.status()["failures"] == {"blocked": 1}
+
+    async def test_breaker_stops_retries_of_a_down_site(self):
+        retries = policy(breaker=CircuitBreaker(failure_threshold=2), max_attempts=5)
+        fetch = Flaky(*[PlaywrightError("net::ERR_CONNECTION_REFUSED")] * 5)
+        with pytest.raises(PlaywrightError):
+            await retries.call(fetch, classify_error)
+        assert fetch.calls == 2
+        assert retries.status()["state"] == "open"
+
+    async def test_retry_budget_caps_retries_across_calls(self):
+        retries = policy(budget=RetryBudget(ratio=0.0, min_retries=1), breaker=CircuitBreaker(failure_threshold=10))
+        first = Flaky(ServerError("HTTP 503"))
+        assert await retries.call(first, classify_error) == "ok"
+        second = Flaky(ServerError("HTTP 503"))
+        with pytest.raises(ServerError):
+            await retries.call(second, classify_error)
+        assert (first.calls, second.calls) == (2, 1)
+        assert retries.status()["budget"] == {"requests": 3, "retries": 1, "remaining": 0}
+
+    def test_classify_error(self):
+        assert classify_error(PlaywrightTimeoutError("Timeout")) == "timeout"
+        assert classify_error(PlaywrightError("net::ERR_NAME_NOT_RESOLVED")) == "network"
+        assert classify_error(PlaywrightError("Target page has been closed")) == "permanent"
+        assert classify_error(ServerError("HTTP 429")) == "server"
+        assert classify_error(BlockedError("captcha")) == "blocked"
+        assert classify_error(KeyError("title")) == "permanent"
+
+
+class TestCrawlIntegration:
+    async def test_open_circuit_fails_units_fast(self, db_client, fake_crawler):
+        retry_policy.get_retry_policy("saramin").breaker.trip()
+        summary = await crawler_service(db_client).crawl_units([CrawlUnit("python", "saramin")])
+
+        assert summary["failed"] == 1
+        assert "circuit open" in summary["units"][0]["error"]
+        assert fake_crawler.fetched == []
+        status = retry_policy.status()["saramin"]
+        assert (status["state"], status["trips"]) == ("open", 1)
+        assert status["retry_in_seconds"] > 0
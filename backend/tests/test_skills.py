@@ -0,0 +1,127 @@
+from fastapi.testclient import TestClient
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobSkillTable, JobTable
+from jdcrawler.main import app
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.services.backfill import backfill_skills
+from jdcrawler.services.skills import SkillExtractor, skill_extractor
+
+
+def create(db: DatabaseClient, i: int, title: str, description: str):
+    return db.create_job(
+        JobCreate(
+            title=title,
+            company=f"Company {i}",
+            url=f"https://saramin.co.kr/job/{i}",
+            site=JobSite.SARAMIN,
+            description=description,
+            skills=skill_extractor.extract(title, description),
+        )
+    )
+
+
+class TestSkillExtractor:
+    def test_synonyms_map_to_canonical_names(self):
+        skills = skill_extractor.extract("자바 백엔드 개발자", "스프링부트, 카프카, k8s 운영 경험")
+        assert skills == ["Java", "Kafka", "Kubernetes", "Spring"]
+
+    def test_longest_match_wins(self):
+        assert skill_extractor.extract("JavaScript 개발자", "리액트 네이티브 경험") == [
+            "JavaScript",
+            "React Native",
+        ]
+
+    def test_short_names_need_word_boundaries(self):
+        assert skill_extractor.extract("Google 광고 플랫폼", "MySQL 운영") == ["MySQL"]
+        assert skill_extractor.extract("Go 서버 개발", None) == ["Go"]
+
+    def test_long_names_need_word_boundaries(self):
+        text = "scalable systems, trust and opportunity in our community; expression, swiftly"
+        assert skill_extractor.extract("Java 개발자", text) == ["Java"]
+        assert skill_extractor.extract("Scala, Rust 개발자", "Unity 와 Express.js, Swift 경험") == [
+            "Express",
+            "Rust",
+            "Scala",
+            "Swift",
+            "Unity",
+        ]
+
+    def test_canonicalize(self):
+        assert skill_extractor.canonicalize(" 리액트 ") == "React"
+        assert skill_extractor.canonicalize("COBOL") is None
+
+    def test_custom_dictionary(self):
+        extractor = SkillExtractor({"Elixir": ["엘릭서"]})
+        assert extractor.extract("엘릭서 개발자", "Python") == ["Elixir"]
+
+
+class TestJobSkills:
+    def test_filter_requires_all_skills(self, db_client):
+        create(db_client, 1, "Kotlin 서버 개발자", "Spring, Kafka 기반 MSA")
+        create(db_client, 2, "Kotlin 안드로이드 개발자", "Jetpack Compose")
+        create(db_client, 3, "데이터 엔지니어", "Kafka, Spark")
+
+        assert db_client.get_job(1).skills == ["Kafka", "Kotlin", "Spring"]
+        assert [j.id for j in db_client.get_jobs(skills=["Kotlin", "Kafka"])] == [1]
+        assert {j.id for j in db_client.get_jobs(skills=["Kafka"])} == {1, 3}
+        assert db_client.get_jobs(skills=["Rust"]) == []
+
+    def test_set_job_skills_replaces_rows(self, db_client):
+        job = create(db_client, 1, "Python 개발자", "Django")
+        row = db_client.jobs_session.get(JobTable, job.id)
+        db_client.set_job_skills(row, ["Django", "FastAPI"])
+        db_client.jobs_session.commit()
+        assert db_client.get_job(job.id).skills == ["Django", "FastAPI"]
+
+    def test_skill_counts_skip_hidden_jobs(self, db_client):
+        create(db_client, 1, "Python 개발자", "AWS")
+        create(db_client, 2, "Python 데이터 엔지니어", "Airflow")
+        hidden = create(db_client, 3, "Python 인턴", "AWS")
+        db_client.toggle_hidden(hidden.id)
+        assert db_client.get_skill_counts() == {"Python": 2, "AWS": 1, "Airflow": 1}
+        assert db_client.get_skill_counts(limit=1) == {"Python": 2}
+
+    def test_backfill_extracts_for_existing_rows(self, db_client):
+        db_client.create_job(
+            JobCreate(
+                title="Java 개발자",
+                company="Legacy",
+                url="https://saramin.co.kr/job/old",
+                site=JobSite.SARAMIN,
+                description="Oracle, JPA",
+            )
+        )
+        assert db_client.jobs_session.query(JobSkillTable).count() == 0
+        assert backfill_skills(db_client, chunk_size=1) == 1
+        db_client.jobs_session.expire_all()
+        assert db_client.get_jobs()[0].skills == ["JPA", "Java", "Oracle"]
+
+    def test_backfill_drops_skills_matched_inside_words(self, db_client):
+        job = create(db_client, 1, "Java 개발자", "scalable 한 서비스와 trust")
+        row = db_client.jobs_session.get(JobTable, job.id)
+        # Stored by the extractor before it required word boundaries
+        db_client.set_job_skills(row, ["Java", "Rust", "Scala"])
+        db_client.jobs_session.commit()
+
+        backfill_skills(db_client)
+        db_client.jobs_session.expire_all()
+        assert db_client.get_job(job.id).skills == ["Java"]
+
+
+class TestSkillsAPI:
+    def test_skills_query_accepts_synonyms(self, db_client):
+        create(db_client, 1, "Kotlin 서버 개발자", "Spring, Kafka")
+        create(db_client, 2, "자바 개발자", "Spring")
+        app.state.db = db_client
+        client = TestClient(app)
+        data = client.get("/api/jobs", params={"skills": "코틀린,kafka"}).json()
+        assert [job["id"] for job in data] == [1]
+        assert client.get("/api/jobs", params={"skills": "spring"}).json()[0]["skills"]
+
+    def test_tech_stacks(self, db_client):
+        create(db_client, 1, "Kotlin 서버 개발자", "Spring")
+        create(db_client, 2, "자바 개발자", "Spring")
+        app.state.db = db_client
+        client = TestClient(app)
+        assert client.get("/api/analysis/tech-stacks").json() == {"Spring": 2, "Java": 1, "Kotlin": 1}
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from jdcrawler.crawlers.saramin import SaraminCrawler
+from jdcrawler.services import throttle
+from jdcrawler.utils.rate_limiter import AdaptiveRateLimiter
+from tests.conftest import crawler_service
+
+
+@pytest.fixture(autouse=True)
+def fresh_throttles():
+    throttle.throttles.clear()
+    yield
+    throttle.throttles.clear()
+
+
+def limiter(**options) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(**{"initial_rate": 6, "min_rate": 1, "max_rate": 10, "jitter": 0, **options})
+
+
+class TestAdaptiveRateLimiter:
+    def test_healthy_responses_raise_the_rate_additively(self):
+        rate = limiter(increase=0.5)
+        for _ in range(4):
+            rate.record("ok", latency=0.5)
+        assert rate.rate == 8
+        for _ in range(10):
+            rate.record("ok", latency=0.5)
+        assert rate.rate == 10
+
+    def test_trouble_backs_off_multiplicatively_once_per_cooldown(self):
+        rate = limiter(decrease=0.5, cooldown=60)
+        rate.record("timeout")
+        assert rate.rate == 3
+        # Other requests in flight during the same incident
+        rate.record("timeout")
+        rate.record("throttled")
+        assert (rate.rate, rate.backoffs) == (3, 1)
+
+        rate = limiter(decrease=0.5, cooldown=0)
+        for _ in range(5):
+            rate.record("error")
+        assert rate.rate == 1
+
+    def test_slow_responses_count_as_trouble(self):
+        rate = limiter(slow_seconds=5)
+        rate.record("ok", latency=8)
+        assert rate.rate == 3
+        assert rate.metrics()["outcomes"]["slow"] == 1
+
+    def test_block_pages_drop_to_the_minimum_rate(self):
+        rate = limiter(cooldown=60)
+        rate.record("timeout")
+        rate.record("blocked")
+        assert rate.rate == 1
+        assert rate.metrics()["last_signal"] == "blocked"
+
+    def test_metrics(self):
+        rate = limiter()
+        rate.record("ok", latency=1.0)
+        rate.record("timeout")
+        metrics = rate.metrics()
+        assert metrics["rate_per_minute"] == 3.25
+        assert metrics["delay_seconds"] == round(60 / 3.25, 2)
+        assert (metrics["requests"], metrics["timeout_rate"], metrics["error_rate"]) == (2, 0.5, 0.5)
+        assert metrics["latency_seconds"] == 1.0
+
+    async def test_concurrent_callers_share_the_spacing(self):
+        rate = limiter(initial_rate=600, max_rate=600)
+        started = asyncio.get_event_loop().time()
+        await asyncio.gather(*(rate.acquire() for _ in range(3)))
+        # 0.1s apart even though all three asked at once
+        assert asyncio.get_event_loop().time() - started >= 0.2
+
+
+class TestBlockDetection:
+    def test_classify_response(self):
+        crawler = SaraminCrawler()
+        assert crawler.classify_response(200, "<div class='item_recruit'></div>") == "ok"
+        assert crawler.classify_response(429, "") == "throttled"
+        assert crawler.classify_response(403, "") == "blocked"
+        assert crawler.classify_response(200, "<p>비정상적인 접근이 감지되었습니다</p>") == "blocked"
+        assert crawler.classify_response(502, "") == "error"
+
+    def test_block_text_in_a_posting_is_not_a_block(self):
+        crawler = SaraminCrawler()
+        posting = "<html><body><div class='user_content'>" + "백엔드 API 서버를 개발합니다. " * 100
+        posting += "외부 네트워크에서는 사내 시스템 접근이 제한됩니다.</div></body></html>"
+        assert crawler.classify_response(200, posting) == "ok"
+        title = "<html><head><title>Access Denied</title></head><body>" + "x" * 2000 + "</body></html>"
+        assert crawler.classify_response(200, title) == "blocked"
+        assert crawler.classify_response(200, posting + "<script src='/cf-chl-bypass.js'></script>") == "blocked"
+
+    async def test_unexpectedly_empty_listing_backs_off(self, db_client, fake_crawler):
+        service = crawler_service(db_client)
+        await service.crawl_keyword("python")
+        assert throttle.metrics()["saramin"]["last_signal"] is None
+
+        fake_crawler.listing = []
+        await service.crawl_keyword("python")
+        assert throttle.metrics()["saramin"]["last_signal"] == "blocked"
+        assert throttle.get_throttle("saramin").rate == throttle.get_throttle("saramin").min_rate
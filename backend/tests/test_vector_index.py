@@ -0,0 +1,191 @@
+import os
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import JobTable
+from jdcrawler.main import app
+from jdcrawler.models.job import JobCreate, JobSite
+from jdcrawler.models.profile import TechSkill, UserProfileUpdate
+from jdcrawler.services.vector_index import (
+    JobVectorIndex,
+    get_vector_index,
+    index_path,
+    save_vector_index,
+    tokenize,
+)
+
+JOBS = [
+    ("Python 백엔드 개발자", "Django와 PostgreSQL 기반 API 서버 개발", "Alpha"),
+    ("백엔드 엔지니어 (Python)", "Django REST framework, PostgreSQL 운영 경험", "Beta"),
+    ("iOS 개발자", "Swift, UIKit 기반 모바일 앱 개발", "Gamma"),
+    ("데이터 엔지니어", "Spark, Airflow 데이터 파이프라인 구축", "Delta"),
+]
+
+
+@pytest.fixture
+def db_client(db_client):
+    for i, (title, description, company) in enumerate(JOBS):
+        db_client.create_job(
+            JobCreate(
+                title=title,
+                company=company,
+                url=f"https://saramin.co.kr/job/{i}",
+                site=JobSite.SARAMIN,
+                description=description,
+            )
+        )
+    return db_client
+
+
+@pytest.fixture
+def open_process(tmp_path, db_client):
+    """Opens more clients on the same database files, as other processes would."""
+    clients = []
+
+    def open_client() -> DatabaseClient:
+        clients.append(DatabaseClient(f"sqlite:///{tmp_path / 'jobs.db'}", f"sqlite:///{tmp_path / 'user.db'}"))
+        return clients[-1]
+
+    yield open_client
+    for client in clients:
+        client.close()
+
+
+def insert(db: DatabaseClient, index: JobVectorIndex, name: str) -> int:
+    """Store a job and add it to the process's index, as a crawl does."""
+    job = JobCreate(
+        title=f"{name} 개발자", company=name, url=f"https://saramin.co.kr/job/{name}", site=JobSite.SARAMIN
+    )
+    created = db.create_job(job)
+    index.add(created.id, job.title, job.description)
+    return created.id
+
+
+class TestTokenize:
+    def test_hangul_bigrams_and_latin_words(self):
+        assert tokenize("자바를 Spring") == ["자바", "바를", "spring"]
+
+
+class TestJobVectorIndex:
+    def test_similar_ranks_related_postings_first(self):
+        index = JobVectorIndex(dim=256, num_buckets=1 << 12)
+        index.add_many([(i, title, description) for i, (title, description, _) in enumerate(JOBS, 1)])
+        results = index.similar(1, k=3)
+        assert results[0][0] == 2
+        assert all(job_id != 1 for job_id, _ in results)
+
+    def test_vectors_are_normalized(self):
+        index = JobVectorIndex(dim=64, num_buckets=1 << 10)
+        index.add(1, "Python", "Django")
+        assert np.isclose(np.linalg.norm(index.scores(index._matrix[0])[0]), 1.0, atol=1e-5)
+
+    def test_incremental_growth_and_remove(self):
+        index = JobVectorIndex(dim=32, num_buckets=1 << 10)
+        for i in range(1, 2050):
+            index.add(i, f"title {i}", "python")
+        assert len(index) == 2049
+        index.remove([1, 500])
+        assert len(index) == 2047
+        assert index.similar(1) == []
+        assert 2049 in {job_id for job_id, _ in index.similar(2, k=3000)}
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        index = JobVectorIndex(dim=32, num_buckets=1 << 10)
+        index.add(7, "Kotlin 서버", "Spring Boot")
+        path = str(tmp_path / "index.npz")
+        index.save(path)
+        loaded = JobVectorIndex.load(path)
+        assert len(loaded) == 1
+        assert loaded.max_id == 7
+        np.testing.assert_allclose(loaded.scores(index._matrix[0]), index.scores(index._matrix[0]))
+
+
+class TestVectorIndexRegistry:
+    def test_syncs_from_db_and_persists(self, db_client):
+        index = get_vector_index(db_client)
+        assert len(index) == len(JOBS)
+        save_vector_index(db_client)
+        assert os.path.exists(index_path(db_client))
+
+        db_client.create_job(
+            JobCreate(
+                title="Kotlin 서버 개발자",
+                company="Epsilon",
+                url="https://saramin.co.kr/job/new",
+                site=JobSite.SARAMIN,
+            )
+        )
+        assert len(get_vector_index(db_client)) == len(JOBS) + 1
+
+
+    def test_interleaved_processes_never_drop_jobs(self, db_client, open_process):
+        a, b = open_process(), open_process()
+        index_a, index_b = get_vector_index(a), get_vector_index(b)
+        first = insert(a, index_a, "Kotlin")
+        second = insert(b, index_b, "Rust")
+        third = insert(a, index_a, "Scala")
+        save_vector_index(b)
+        # A saves last: the file holds A's index, which never saw B's job
+        save_vector_index(a)
+        assert second not in index_a._rows
+
+        index = get_vector_index(open_process())
+        assert {first, second, third} <= set(index._rows)
+        assert len(index) == len(JOBS) + 3
+
+    def test_changed_descriptions_are_reembedded_by_other_processes(self, db_client, open_process):
+        a, b = open_process(), open_process()
+        before = get_vector_index(a)._matrix[0].copy()
+        get_vector_index(b)
+        with b.jobs_engine.begin() as conn:
+            conn.execute(
+                update(JobTable)
+                .where(JobTable.id == 1)
+                .values(description="Swift, UIKit 기반 모바일 앱 개발", content_hash="changed")
+            )
+
+        index = get_vector_index(a)
+        assert not np.allclose(index._matrix[index._rows[1]], before)
+        assert index.similar(1, k=1)[0][0] == 3
+
+    def test_archived_jobs_are_dropped(self, db_client, open_process):
+        a = open_process()
+        assert 4 in get_vector_index(a)._rows
+        with db_client.jobs_engine.begin() as conn:
+            conn.execute(JobTable.__table__.delete().where(JobTable.id == 4))
+        assert 4 not in get_vector_index(a)._rows
+
+
+class TestSimilarJobsAPI:
+    def test_similar_endpoint(self, db_client):
+        app.state.db = db_client
+        client = TestClient(app)
+        response = client.get("/api/jobs/1/similar?k=2")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 2
+        assert data[0]["job"]["id"] == 2
+        assert data[0]["similarity"] >= data[1]["similarity"]
+
+    def test_similar_not_found(self, db_client):
+        app.state.db = db_client
+        client = TestClient(app)
+        assert client.get("/api/jobs/999/similar").status_code == 404
+
+    def test_semantic_matches_against_profile(self, db_client):
+        db_client.update_profile(
+            UserProfileUpdate(
+                tech_stack=[TechSkill(name="Swift", level="Advanced")],
+                experience_years=2,
+                interest_keywords=["모바일 앱"],
+                exclude_keywords=[],
+            )
+        )
+        app.state.db = db_client
+        client = TestClient(app)
+        data = client.get("/api/analysis/semantic-matches?limit=1").json()
+        assert data[0]["job"]["title"] == "iOS 개발자"
@@ -0,0 +1,289 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from jdcrawler.db.client import DatabaseClient
+from jdcrawler.db.schema import FrontierRunTable
+from jdcrawler.services.crawl_runs import CrawlRunManager
+from jdcrawler.services.crawl_worker import CrawlWorker
+from jdcrawler.services.frontier import CrawlFrontier
+from jdcrawler.services.work_queue import RedisWorkQueue, SQLiteWorkQueue, WorkQueue
+from tests.conftest import URL, FakeCrawler
+
+
+class FakeRedis:
+    """The handful of Redis commands RedisWorkQueue uses, in memory."""
+
+    def __init__(self):
+        self.data = {}
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def decr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) - 1
+        return self.data[key]
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        fields = self.data.setdefault(key, {})
+        fields.update({k: str(v) for k, v in (mapping or {field: value}).items()})
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hincrby(self, key, field, n):
+        fields = self.data.setdefault(key, {})
+        fields[field] = str(int(fields.get(field, 0)) + n)
+
+    def sadd(self, key, member):
+        self.data.setdefault(key, set()).add(member)
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def rpush(self, key, value):
+        self.data.setdefault(key, []).append(value)
+
+    def lpush(self, key, value):
+        self.data.setdefault(key, []).insert(0, value)
+
+    def rpop(self, key):
+        items = self.data.get(key)
+        return items.pop() if items else None
+
+    def lrange(self, key, start, end):
+        return list(self.data.get(key, []))
+
+    def lrem(self, key, count, value):
+        self.data[key] = [item for item in self.data.get(key, []) if item != value]
+
+    def llen(self, key):
+        return len(self.data.get(key, []))
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key, member):
+        return self.data.get(key, {}).pop(member, None) is not None
+
+    def zrangebyscore(self, key, low, high):
+        return [member for member, score in self.data.get(key, {}).items() if score <= high]
+
+    def zcard(self, key):
+        return len(self.data.get(key, {}))
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def make_queue(request, db_client):
+    client = FakeRedis()
+
+    def make(**options):
+        if request.param == "redis":
+            return RedisWorkQueue(client=client, **options)
+        return SQLiteWorkQueue(db_client, **options)
+
+    return make
+
+
+@pytest.fixture
+def other_process(tmp_path, db_client):
+    client = DatabaseClient(f"sqlite:///{tmp_path / 'jobs.db'}", f"sqlite:///{tmp_path / 'user.db'}")
+    yield client
+    client.close()
+
+
+def units(*pairs):
+    return [{"keyword": keyword, "site": site} for keyword, site in pairs]
+
+
+class TestWorkQueue:
+    def test_claims_respect_the_site_limit(self, make_queue):
+        queue = make_queue(site_concurrency=1)
+        queue.put("run", "unit", units(("python", "saramin"), ("java", "saramin"), ("python", "wanted")))
+
+        first, second = queue.claim("a"), queue.claim("b")
+        assert {first.payload["site"], second.payload["site"]} == {"saramin", "wanted"}
+        # The other saramin task waits until the first one is finished
+        assert queue.claim("c") is None
+        saramin, worker = (first, "a") if first.payload["site"] == "saramin" else (second, "b")
+        assert queue.complete(saramin.id, worker, {"crawled": 1})
+        assert queue.claim("c").payload == {"keyword": "java", "site": "saramin"}
+
+        states = {task.payload["keyword"] + "/" + task.payload["site"]: task.state for task in queue.tasks("run")}
+        assert states == {"python/saramin": "done", "java/saramin": "claimed", "python/wanted": "claimed"}
+        assert [task.result for task in queue.tasks("run") if task.finished] == [{"crawled": 1}]
+
+    def test_expired_claims_go_to_another_worker(self, make_queue):
+        queue = make_queue(visibility=timedelta(milliseconds=10))
+        queue.put("run", "unit", units(("python", "saramin")))
+        task = queue.claim("a")
+        assert queue.extend(task.id, "a")
+        time.sleep(0.02)
+
+        retried = queue.claim("b")
+        assert (retried.id, retried.attempts) == (task.id, 2)
+        assert not queue.extend(task.id, "a")
+        # The first worker's late result does not finish the other's claim
+        assert not queue.complete(task.id, "a", {"crawled": 1})
+        assert not queue.fail(task.id, "a", "browser crashed")
+        assert queue.complete(task.id, "b", {"crawled": 1})
+        assert [task.state for task in queue.tasks("run")] == ["done"]
+
+    def test_failed_tasks_are_retried_up_to_max_attempts(self, make_queue):
+        queue = make_queue(max_attempts=2)
+        queue.put("run", "unit", units(("python", "saramin")))
+        queue.fail(queue.claim("a").id, "a", "browser crashed")
+        task = queue.claim("a")
+        assert task.attempts == 2
+        queue.fail(task.id, "a", "browser crashed")
+
+        assert queue.claim("a") is None
+        [task] = queue.tasks("run")
+        assert (task.state, task.error) == ("failed", "browser crashed")
+
+    def test_tasks_that_keep_losing_their_claim_fail(self, make_queue):
+        queue = make_queue(visibility=timedelta(milliseconds=10), max_attempts=2)
+        queue.put("run", "unit", units(("python", "saramin")))
+        for worker in ("a", "b"):
+            assert queue.claim(worker) is not None
+            time.sleep(0.02)
+
+        assert queue.claim("c") is None
+        [task] = queue.tasks("run")
+        assert (task.state, task.attempts, task.error) == ("failed", 2, queue.ABANDONED)
+        assert queue.stats()["claimed"] == 0
+
+    def test_cancel_drops_queued_tasks(self, make_queue):
+        queue = make_queue()
+        queue.put("run", "unit", units(("python", "saramin"), ("java", "saramin")))
+        queue.claim("a")
+        assert queue.cancel("run") == 1
+        assert sorted(task.state for task in queue.tasks("run")) == ["cancelled", "claimed"]
+        assert queue.stats()["queued"] == 0
+
+    def test_expired_claims_are_requeued_once(self, monkeypatch):
+        client = FakeRedis()
+        queue = RedisWorkQueue(client=client, visibility=timedelta(milliseconds=10))
+        queue.put("run", "unit", units(("python", "saramin")))
+        task = queue.claim("a")
+        time.sleep(0.02)
+
+        # Two workers recovering at once both read the expired claim
+        expired = client.zrangebyscore
+        monkeypatch.setattr(client, "zrangebyscore", lambda *args: expired(*args) * 2)
+        assert queue.stats() == {"queued": 1, "claimed": 0}
+        assert queue.claim("b").id == task.id
+        assert queue.claim("c") is None
+
+    def test_queues_implement_every_operation(self):
+        with pytest.raises(TypeError):
+            WorkQueue()
+
+    def test_site_limit_holds_across_processes(self, db_client, other_process):
+        SQLiteWorkQueue(db_client).put("run", "unit", units(("python", "saramin"), ("java", "saramin")))
+        assert SQLiteWorkQueue(db_client, site_concurrency=1).claim("a") is not None
+        assert SQLiteWorkQueue(other_process, site_concurrency=1).claim("b") is None
+
+
+class SlowCrawler(FakeCrawler):
+    # Crawls in flight on the subclass's site, and on both sites together
+    in_flight = 0
+    max_in_flight = 0
+    running = 0
+    max_running = 0
+
+    async def crawl(self, keyword: str):
+        site = type(self)
+        site.in_flight += 1
+        site.max_in_flight = max(site.max_in_flight, site.in_flight)
+        SlowCrawler.running += 1
+        SlowCrawler.max_running = max(SlowCrawler.max_running, SlowCrawler.running)
+        await asyncio.sleep(0.2)
+        site.in_flight -= 1
+        SlowCrawler.running -= 1
+        return await super().crawl(keyword)
+
+
+class SlowSaramin(SlowCrawler):
+    pass
+
+
+class SlowWanted(SlowCrawler):
+    pass
+
+
+class TestCrawlWorker:
+    async def test_worker_runs_unit_and_detail_tasks(self, db_client, fake_crawler):
+        queue = SQLiteWorkQueue(db_client)
+        frontier = CrawlFrontier.start(db_client, [("python", "saramin")])
+        queue.put("run", "unit", [{"keyword": "python", "site": "saramin", "frontier_id": frontier.id}])
+        worker = CrawlWorker(db_client, queue, crawlers={"saramin": FakeCrawler}, poll_interval=0.01)
+
+        assert await worker.run(drain=True) == 1
+        [task] = queue.tasks("run")
+        assert task.state == "done"
+        assert task.result["counts"]["saved"] == 1
+        assert task.result["summary"]["units"][0]["status"] == "completed"
+        assert [job.url for job in db_client.get_jobs()] == [URL]
+
+        job_id = db_client.get_jobs()[0].id
+        queue.put("refresh", "details", [{"site": "saramin", "job_ids": [job_id]}])
+        await worker.run(drain=True)
+        [task] = queue.tasks("refresh")
+        assert task.result["counts"]["checked"] == 1
+        assert fake_crawler.fetched == [URL, URL]
+
+    async def test_throughput_scales_with_workers_within_site_limits(self, db_client, other_process, fake_crawler):
+        fake_crawler.listing = []
+        crawlers = {"saramin": SlowSaramin, "wanted": SlowWanted}
+
+        async def crawl_with(clients) -> int:
+            SlowCrawler.max_running = 0
+            queue = SQLiteWorkQueue(db_client, site_concurrency=1)
+            run_id = f"run-{len(clients)}"
+            queue.put(run_id, "unit", units(*[(f"k{i}", site) for i in range(2) for site in crawlers]))
+            workers = [
+                CrawlWorker(client, SQLiteWorkQueue(client, site_concurrency=1), crawlers, poll_interval=0.01)
+                for client in clients
+            ]
+            await asyncio.gather(*(worker.run(drain=True) for worker in workers))
+            assert all(task.state == "done" for task in queue.tasks(run_id))
+            return SlowCrawler.max_running
+
+        # Most crawls running at once: one per worker, up to one per site
+        assert await crawl_with([db_client]) == 1
+        assert await crawl_with([db_client, other_process]) == 2
+        # Never more than one crawl per site, however many workers
+        assert SlowSaramin.max_in_flight == SlowWanted.max_in_flight == 1
+
+
+class TestQueueExecution:
+    async def test_runs_are_dispatched_to_workers(self, db_client, other_process, fake_crawler):
+        manager = CrawlRunManager(execution="queue", poll_interval=0.02)
+        run = manager.submit(db_client, keyword="python", sites=["saramin"], crawlers={"saramin": FakeCrawler})
+        worker = CrawlWorker(other_process, crawlers={"saramin": FakeCrawler}, poll_interval=0.01)
+        worker_task = asyncio.create_task(worker.run())
+        await manager.wait(run.id)
+        worker_task.cancel()
+
+        assert run.status == "completed"
+        assert run.counts["saved"] == 1
+        assert (run.summary["crawled"], run.summary["failed"]) == (1, 0)
+        db_client.jobs_session.expire_all()
+        assert db_client.jobs_session.get(FrontierRunTable, run.frontier_id).status == "completed"
+
+    async def test_cancel_drops_queued_units(self, db_client, fake_crawler):
+        manager = CrawlRunManager(execution="queue", poll_interval=0.02)
+        run = manager.submit(db_client, keyword="python", sites=["saramin"], crawlers={"saramin": FakeCrawler})
+        await asyncio.sleep(0.1)
+        manager.cancel(run.id)
+        await manager.wait(run.id)
+
+        assert run.status == "cancelled"
+        assert [task.state for task in SQLiteWorkQueue(db_client).tasks(run.id)] == ["cancelled"]